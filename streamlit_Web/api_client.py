@@ -0,0 +1,286 @@
+# ==============================================================================
+# api_client.py - 외부 API 공용 HTTP 클라이언트
+# ==============================================================================
+# 공공데이터포털(data.go.kr)과 카카오 API 호출에 공통으로 사용하는
+# HTTP 클라이언트입니다. 요청마다 PowerShell 프로세스를 띄우고 임시 파일을
+# 쓰던 방식을 대체합니다.
+#
+# [주요 기능]
+# - **연결 풀 (Keep-Alive):** `requests.Session` + `HTTPAdapter`로 TCP/TLS 연결을
+#   재사용합니다.
+# - **gzip 압축:** `Accept-Encoding: gzip` 헤더로 응답 크기를 줄입니다.
+# - **동시 요청 제한:** `map()`/`imap()`은 `max_workers` 개수만큼만 동시에 요청을 보냅니다.
+# - **호스트별 속도 제한:** 호스트마다 초당 요청 수(`rate_limit`)를 넘지 않도록
+#   요청 간격을 조절합니다.
+# - **재시도:** 연결 오류, 타임아웃, HTTP 429/5xx 응답은 지수 백오프로 다시 요청합니다.
+#   (`retry()`로 공공데이터포털의 일시적인 결과 코드(`ApiResultError`)도 재시도할 수 있습니다.)
+# - **통계:** 요청 수, 수신 바이트, 누적 요청 시간, 재시도 횟수를 집계합니다.
+# - **기록/재생:** `archive`(`response_archive.ResponseArchive`)를 넘기면 응답을
+#   디스크에 기록하거나(record), 네트워크 없이 기록된 응답으로 재생(replay)합니다.
+#
+# [설정]
+# `config.ini`의 [HTTP] 섹션(선택)에서 값을 읽으며, 없으면 기본값을 사용합니다.
+#   pool_size = 16      ; 호스트별 유지할 연결 수
+#   max_workers = 8     ; 동시에 처리할 요청 수 (1이면 순차 실행)
+#   rate_limit = 20     ; 호스트별 초당 최대 요청 수 (0이면 제한 없음)
+#   timeout = 30        ; 요청 타임아웃(초)
+#   retries = 3         ; 재시도 횟수 (0이면 재시도하지 않음)
+#   backoff = 0.5       ; 첫 재시도 대기 시간(초), 재시도마다 두 배 (최대 30초)
+#
+# API 주소는 [API] 섹션의 `base_url`, `kakao_base_url`(선택)로 바꿀 수 있습니다.
+# (예: `benchmarks/mock_api_server.py`로 띄운 로컬 모의 서버를 가리킬 때)
+# ==============================================================================
+
+import configparser
+import os
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+
+DEFAULT_API_BASE_URL = 'https://apis.data.go.kr/1543061/abandonmentPublicService_v2'
+DEFAULT_KAKAO_BASE_URL = 'https://dapi.kakao.com'
+
+DEFAULT_HTTP_CONFIG = {
+    'pool_size': 16,
+    'max_workers': 8,
+    'rate_limit': 20.0,
+    'timeout': 30.0,
+    'retries': 3,
+    'backoff': 0.5,
+}
+MAX_BACKOFF = 30.0
+
+# 공공데이터포털 결과 코드 중 잠시 후 다시 요청하면 성공할 수 있는 코드
+# (01: 어플리케이션 에러, 02: DB 에러, 04: HTTP 에러, 05: 서비스 연결 실패, 22: 요청 제한 횟수 초과)
+TRANSIENT_RESULT_CODES = {'01', '02', '04', '05', '22'}
+NO_DATA_RESULT_CODE = '03'
+
+
+class ApiResultError(requests.exceptions.RequestException):
+    """HTTP 요청은 성공했지만 API가 정상(00)이 아닌 결과 코드를 돌려준 경우입니다."""
+
+    def __init__(self, result_code: str, result_msg: str, label: str = ''):
+        self.result_code = result_code
+        self.result_msg = result_msg
+        super().__init__(f"API 오류 (코드: {result_code}, 메시지: {result_msg}){f' - {label}' if label else ''}")
+
+    @property
+    def transient(self) -> bool:
+        return self.result_code in TRANSIENT_RESULT_CODES
+
+
+def is_retryable(error: Exception) -> bool:
+    """다시 요청하면 성공할 수 있는 오류인지 판단합니다."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    if isinstance(error, ApiResultError):
+        return error.transient
+    return False
+
+
+def get_http_config() -> dict:
+    """`config.ini`의 [HTTP] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    http_config = dict(DEFAULT_HTTP_CONFIG)
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'HTTP' in config:
+        section = config['HTTP']
+        http_config['pool_size'] = section.getint('pool_size', http_config['pool_size'])
+        http_config['max_workers'] = section.getint('max_workers', http_config['max_workers'])
+        http_config['rate_limit'] = section.getfloat('rate_limit', http_config['rate_limit'])
+        http_config['timeout'] = section.getfloat('timeout', http_config['timeout'])
+        http_config['retries'] = section.getint('retries', http_config['retries'])
+        http_config['backoff'] = section.getfloat('backoff', http_config['backoff'])
+    return http_config
+
+
+def get_api_endpoints() -> dict:
+    """`config.ini` [API] 섹션의 base_url / kakao_base_url로 엔드포인트 주소를 만들어 반환합니다."""
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    section = config['API'] if 'API' in config else {}
+    base_url = (section.get('base_url') or DEFAULT_API_BASE_URL).rstrip('/')
+    kakao_base_url = (section.get('kakao_base_url') or DEFAULT_KAKAO_BASE_URL).rstrip('/')
+    return {
+        'sido': f"{base_url}/sido_v2",
+        'sigungu': f"{base_url}/sigungu_v2",
+        'shelter': f"{base_url}/shelter_v2",
+        'kind': f"{base_url}/kind_v2",
+        'animal': f"{base_url}/abandonmentPublic_v2",
+        'kakao_address': f"{kakao_base_url}/v2/local/search/address.json",
+    }
+
+
+class RateLimiter:
+    """호스트별로 요청 간격을 `1 / rate` 초 이상으로 유지하는 속도 제한기입니다."""
+
+    def __init__(self, rate_per_sec: float):
+        self.rate_per_sec = rate_per_sec
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def acquire(self, host: str):
+        if not self.rate_per_sec or self.rate_per_sec <= 0:
+            return
+        interval = 1.0 / self.rate_per_sec
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ApiClient:
+    """연결 풀과 동시 요청 제한, 호스트별 속도 제한을 갖춘 HTTP 클라이언트입니다."""
+
+    def __init__(self, pool_size=16, max_workers=8, rate_limit=20.0, timeout=30.0, retries=3, backoff=0.5, archive=None):
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = timeout
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+        self.archive = archive
+        self.rate_limiter = RateLimiter(rate_limit)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=max(pool_size, self.max_workers))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'requests': 0, 'bytes': 0, 'request_seconds': 0.0, 'retries': 0}
+
+    @classmethod
+    def from_config(cls, **overrides):
+        """`config.ini` 설정으로 클라이언트를 만듭니다. 인자로 넘긴 값이 우선합니다."""
+        http_config = get_http_config()
+        http_config.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**http_config)
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None) -> requests.Response:
+        """GET 요청을 보내고, HTTP 오류가 있으면 예외를 발생시킵니다."""
+        if self.archive is not None and self.archive.replaying:
+            started = time.perf_counter()
+            response = self.archive.load(url, params)
+            elapsed = time.perf_counter() - started
+        else:
+            started = time.perf_counter()
+            response = self.retry(self._get_once, url, params, headers)
+            elapsed = time.perf_counter() - started
+            if self.archive is not None:
+                self.archive.save(url, params, response)
+        with self._stats_lock:
+            self._stats['requests'] += 1
+            self._stats['bytes'] += len(response.content)
+            self._stats['request_seconds'] += elapsed
+        return response
+
+    def _get_once(self, url, params, headers) -> requests.Response:
+        self.rate_limiter.acquire(urlparse(url).netloc)
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def retry(self, func, *args, retryable=is_retryable, **kwargs):
+        """
+        `func`를 실행하고, `retryable(오류)`가 참인 오류면 지수 백오프로 최대 `retries`번 다시 실행합니다.
+        대기 시간은 `backoff * 2^n`초(최대 30초)에 무작위 값을 곱해 요청이 한꺼번에 몰리지 않게 합니다.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.retries or not retryable(e):
+                    raise
+                delay = min(self.backoff * 2 ** attempt, MAX_BACKOFF) * random.uniform(0.5, 1.0)
+                with self._stats_lock:
+                    self._stats['retries'] += 1
+                print(f"[재시도] {e} → {delay:.1f}초 후 다시 요청합니다. ({attempt + 1}/{self.retries})")
+                time.sleep(delay)
+
+    def get_xml(self, url: str, params: dict | None = None) -> ET.Element | None:
+        """GET 요청 결과를 XML로 파싱해 반환합니다. 빈 응답이면 None을 반환합니다."""
+        content = self.get(url, params=params).content
+        if not content:
+            return None
+        return ET.fromstring(content)
+
+    def map(self, func, iterable) -> list:
+        """`func`를 최대 `max_workers`개씩 동시에 실행하고, 입력 순서대로 결과를 반환합니다."""
+        items = list(iterable)
+        if self.max_workers == 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
+
+    def imap(self, func, iterable):
+        """
+        `map()`과 같지만 결과를 입력 순서대로 하나씩 돌려줍니다.
+        아직 소비되지 않은 결과가 `max_workers * 2`개를 넘지 않도록 작업을 나눠 제출합니다.
+        """
+        items = iter(iterable)
+        if self.max_workers == 1:
+            for item in items:
+                yield func(item)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque(executor.submit(func, item) for item in islice(items, self.max_workers * 2))
+            while pending:
+                result = pending.popleft().result()
+                for item in islice(items, 1):
+                    pending.append(executor.submit(func, item))
+                yield result
+
+    def stats(self) -> dict:
+        """누적 요청 통계를 반환합니다. 아카이브를 쓰는 경우 기록/재생 건수도 함께 반환합니다."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        if self.archive is not None:
+            stats.update(self.archive.stats())
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+# --- 공용 클라이언트 ---
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> ApiClient:
+    """프로세스 전체에서 공유하는 기본 클라이언트를 반환합니다."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = ApiClient.from_config()
+        return _default_client
+
+
+def set_client(client: ApiClient):
+    """기본 클라이언트를 교체합니다. (예: 명령줄 옵션으로 설정을 덮어쓸 때)"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is not None and _default_client is not client:
+            _default_client.close()
+        _default_client = client
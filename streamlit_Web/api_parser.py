@@ -0,0 +1,108 @@
+# ==============================================================================
+# api_parser.py - 공공데이터포털 응답 페이지 파서
+# ==============================================================================
+# 응답 한 페이지(XML 또는 `_type=json`)를 읽어, 항목(`item`)들을
+# 필드별 값 리스트(열 지향 배치)로 변환합니다.
+#
+# - **XML:** `ET.iterparse`로 `<item>` 단위로 읽고, 읽은 요소는 바로 비워
+#   페이지 전체의 요소 트리를 메모리에 만들지 않습니다.
+# - **JSON:** `orjson`이 설치되어 있으면 사용하고, 없으면 표준 `json`을 씁니다.
+#   (`_type=json`을 요청해도 인증 오류 등은 XML로 오므로, 내용을 보고 형식을 판단합니다.)
+#
+# 항목마다 딕셔너리를 만들지 않으므로, 배치를 곧바로 `pd.DataFrame(batch.columns)`로
+# 바꿔 변환 단계에 넘길 수 있습니다.
+# ==============================================================================
+
+import io
+import json
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_HEADER_TAGS = {'resultCode', 'resultMsg', 'totalCount', 'returnReasonCode', 'returnAuthMsg'}
+
+
+@dataclass
+class PageBatch:
+    """응답 한 페이지의 헤더 정보와 열 지향 항목 데이터입니다."""
+    result_code: str
+    result_msg: str
+    total_count: int
+    num_items: int = 0
+    columns: dict = field(default_factory=dict)  # 필드 이름 -> 값 리스트
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
+
+    def to_records(self) -> list:
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+
+def _append_row(columns: dict, row_count: int, fields):
+    """(필드, 값) 목록을 열 리스트에 추가합니다. 새 필드는 이전 행을 None으로 채웁니다."""
+    for name, value in fields:
+        column = columns.get(name)
+        if column is None:
+            column = columns[name] = [None] * row_count
+        column.append(value)
+    for column in columns.values():
+        if len(column) <= row_count:
+            column.append(None)
+
+
+def _parse_xml(content: bytes) -> PageBatch:
+    columns = {}
+    header = {}
+    row_count = 0
+    for _, elem in ET.iterparse(io.BytesIO(content), events=('end',)):
+        if elem.tag == 'item':
+            _append_row(columns, row_count, ((child.tag, child.text) for child in elem))
+            row_count += 1
+            elem.clear()
+        elif elem.tag in _HEADER_TAGS:
+            header[elem.tag] = elem.text
+    return PageBatch(
+        result_code=header.get('resultCode') or 'N/A',
+        result_msg=header.get('resultMsg') or header.get('returnAuthMsg') or 'N/A',
+        total_count=int(header.get('totalCount') or 0),
+        num_items=row_count,
+        columns=columns,
+    )
+
+
+def _parse_json(content: bytes) -> PageBatch:
+    data = _json_loads(content)
+    response = data.get('response', data)
+    header = response.get('header') or {}
+    body = response.get('body') or {}
+    items = body.get('items') or {}
+    item_list = items.get('item', []) if isinstance(items, dict) else []
+    if isinstance(item_list, dict):  # 항목이 하나면 리스트가 아닌 객체로 옵니다.
+        item_list = [item_list]
+
+    columns = {}
+    for row_count, item in enumerate(item_list):
+        # XML 경로와 같은 결과가 되도록 값은 문자열로 맞춥니다.
+        _append_row(columns, row_count, ((k, v if v is None or isinstance(v, str) else str(v)) for k, v in item.items()))
+    return PageBatch(
+        result_code=str(header.get('resultCode', 'N/A')),
+        result_msg=str(header.get('resultMsg', 'N/A')),
+        total_count=int(body.get('totalCount') or 0),
+        num_items=len(item_list),
+        columns=columns,
+    )
+
+
+def parse_page(content: bytes) -> PageBatch:
+    """응답 본문을 형식(XML/JSON)에 맞게 파싱합니다."""
+    if content.lstrip()[:1] in (b'{', b'['):
+        return _parse_json(content)
+    return _parse_xml(content)
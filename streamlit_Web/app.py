@@ -1,14 +1,17 @@
 import streamlit as st
 from datetime import datetime, timedelta
-from data_manager import init_db, get_sido_list, get_filtered_data
+from contextlib import nullcontext
+from data_manager import init_db, get_sido_list, get_filtered_data, get_region_codes, get_data_status, is_first_load
 from ui_components import (
     render_header, 
     render_sidebar, 
-    render_kpi_cards, 
+    render_kpi_cards,
+    render_data_status, 
     render_tabs, 
     inject_custom_css,
     render_footer
 )
+from cache_warmer import start_cache_warmer
 from tabs import map_view, analysis_dashboard_view, detail_view, favorites_view, prediction_view, web_scraping_view
 
 # --- 1. 탭 설정 ---
@@ -58,6 +61,7 @@ def main():
     inject_custom_css()
     init_db()
     init_session_state()
+    start_cache_warmer()
 
     # --- UI 렌더링 ---
     render_header()
@@ -65,20 +69,23 @@ def main():
     render_sidebar(sido_list)
 
     # --- 데이터 로딩 및 필터링 ---
-    with st.spinner("🐾 데이터를 열심히 불러오고 있어요... 잠시만 기다려주세요!"):
+    # 새 데이터는 백그라운드에서 준비하고 그동안 이전 데이터를 보여 주므로, 아직 보여 줄 데이터가 없을 때만 기다립니다.
+    with st.spinner("🐾 데이터를 열심히 불러오고 있어요... 잠시만 기다려주세요!") if is_first_load() else nullcontext():
         # 상세 뷰에서는 필터를 무시하여 항상 선택된 보호소를 찾을 수 있도록 함
         data_sido, data_sigungu = st.session_state.sido_filter, st.session_state.sigungu_filter
         if st.session_state.active_tab_label == "📋 보호소 상세 현황":
             data_sido, data_sigungu = "전체", "전체"
+        sido_code, sigungu_code = get_region_codes(data_sido, data_sigungu)
         
         data = get_filtered_data(
             st.session_state.start_date, 
             st.session_state.end_date, 
-            data_sido, 
-            data_sigungu, 
+            sido_code, 
+            sigungu_code, 
             st.session_state.species_filter
         )
         final_animals, filtered_shelters, shelter_count, animal_count, long_term_count, adopted_count = data
+    render_data_status(get_data_status())
 
     # --- 메인 콘텐츠 ---
     if final_animals.empty:
@@ -90,7 +97,9 @@ def main():
         
         # 선택된 탭에 따라 적절한 인자를 전달하여 show 함수 호출
         if active_tab["label"] == "📍 지도 & 분석":
-            active_tab["show_func"](filtered_shelters, final_animals)
+            map_key = map_view.map_cache_key(st.session_state.start_date, st.session_state.end_date,
+                                             sido_code, sigungu_code, st.session_state.species_filter)
+            active_tab["show_func"](filtered_shelters, final_animals, map_key)
         elif active_tab["label"] == "📊 분석 대시보드":
             active_tab["show_func"](final_animals, filtered_shelters)
         elif active_tab["label"] == "📋 보호소 상세 현황":
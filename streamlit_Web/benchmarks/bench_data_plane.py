@@ -0,0 +1,112 @@
+# ==============================================================================
+# benchmarks/bench_data_plane.py - 프로세스/세션별 테이블 메모리 비교 (pickle 복사 vs Arrow 파일 매핑)
+# ==============================================================================
+# Streamlit 서버 프로세스 여러 개가 각각 세션 여러 개에 `animals` 테이블을 내주는 상황을
+# 흉내 내어, 프로세스마다 늘어난 메모리를 비교합니다.
+#
+# - **복사:** `st.cache_data`처럼 캐시에 pickle로 저장해 두고 세션마다 풀어 새 데이터프레임을 만듭니다.
+# - **매핑:** `data_plane.DataPlane`이 게시한 Arrow 파일을 세션마다 메모리 매핑합니다.
+#
+# 프로세스의 고유 메모리(Private)는 다른 프로세스와 나눠 쓰지 못하는 메모리이고,
+# 공유 메모리(Shared)는 같은 파일의 페이지 캐시처럼 모든 프로세스가 함께 쓰는 메모리입니다.
+# (Linux의 `/proc/self/smaps_rollup` 기준)
+#
+# [실행 방법]
+#   cd streamlit_Web
+#   python benchmarks/bench_data_plane.py --rows 300000 --workers 4 --sessions 3
+# ==============================================================================
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_plane import DataPlane  # noqa: E402
+from schema import apply_frame_dtypes  # noqa: E402
+from synthetic_data import make_animals  # noqa: E402
+
+
+def memory_mb() -> dict:
+    """현재 프로세스의 고유(Private)/공유(Shared) 메모리(MB)."""
+    usage = {'private': 0.0, 'shared': 0.0}
+    with open('/proc/self/smaps_rollup', encoding='utf-8') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if name.startswith('Private_'):
+                usage['private'] += int(value.split()[0]) / 1024
+            elif name.startswith('Shared_'):
+                usage['shared'] += int(value.split()[0]) / 1024
+    return usage
+
+
+def worker(mode: str, source: str, sessions: int, queue):
+    before = memory_mb()
+    started = time.perf_counter()
+    frames = []
+    if mode == 'copy':
+        with open(source, 'rb') as f:
+            payload = f.read()
+        for _ in range(sessions):
+            frames.append(pickle.loads(payload))
+        del payload
+    else:
+        plane = DataPlane(source)
+        for _ in range(sessions):
+            frames.append(plane.open('animals', 1))
+    # 세션이 데이터를 한 번씩 훑는 것처럼 모든 컬럼을 읽습니다.
+    for frame in frames:
+        for col in frame.columns:
+            frame[col].iloc[::1000].tolist()
+    elapsed = time.perf_counter() - started
+    after = memory_mb()
+    queue.put((after['private'] - before['private'], after['shared'] - before['shared'], elapsed))
+
+
+def run(mode: str, source: str, workers: int, sessions: int) -> list:
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(mode, source, sessions, queue)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프로세스/세션별 테이블 메모리 비교")
+    parser.add_argument('--rows', type=int, default=300000, help="동물 수")
+    parser.add_argument('--shelters', type=int, default=3000, help="보호소 수")
+    parser.add_argument('--workers', type=int, default=4, help="서버 프로세스 수")
+    parser.add_argument('--sessions', type=int, default=3, help="프로세스당 세션 수")
+    args = parser.parse_args()
+
+    animals = apply_frame_dtypes(make_animals(args.rows, shelters=args.shelters, days=365), 'animals')
+    with tempfile.TemporaryDirectory() as workdir:
+        pickle_path = os.path.join(workdir, 'animals.pkl')
+        with open(pickle_path, 'wb') as f:
+            pickle.dump(animals, f, protocol=pickle.HIGHEST_PROTOCOL)
+        plane = DataPlane(os.path.join(workdir, 'data_plane'))
+        plane.publish('animals', 1, animals)
+        mapped = plane.open('animals', 1)
+        print(f"매핑 결과 일치: {mapped.equals(animals)}, 타입 일치: {(mapped.dtypes == animals.dtypes).all()}\n")
+
+        print(f"동물 {len(animals):,}건, 프로세스 {args.workers}개 × 세션 {args.sessions}개")
+        print(f"{'방식':<6} {'프로세스당 고유(MB)':>18} {'프로세스당 공유(MB)':>18} {'전체 고유(MB)':>14} {'세션 준비(초)':>13}")
+        for mode, source in (('copy', pickle_path), ('mmap', plane.path)):
+            results = run(mode, source, args.workers, args.sessions)
+            private = [result[0] for result in results]
+            shared = [result[1] for result in results]
+            elapsed = max(result[2] for result in results)
+            print(f"{mode:<6} {sum(private) / len(private):>18.1f} {sum(shared) / len(shared):>18.1f} "
+                  f"{sum(private):>14.1f} {elapsed:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# ==============================================================================
+# benchmarks/bench_filter_engine.py - 필터 성능 비교 (pandas vs 메모리 색인 엔진)
+# ==============================================================================
+# `filter_query.filter_frames`(필터마다 전체 데이터프레임에 마스크 연산)와
+# `filter_engine.FilterEngine`(한 번 만든 색인의 교집합)의 필터 지연 시간을 비교하고,
+# 두 결과(동물 목록, 보호소 목록, KPI 4종)가 같은지 확인합니다.
+#
+# - **색인(초):** 데이터 버전마다 한 번 드는 엔진 생성 시간
+# - **선택(ms):** 조건에 맞는 행 번호와 KPI 계산까지 (`FilterEngine.select`)
+# - **엔진(ms):** 결과 데이터프레임 생성까지 포함 (`FilterEngine.filter`)
+#
+# [실행 방법]
+#   cd streamlit_Web
+#   python benchmarks/bench_filter_engine.py --rows 100000 1000000
+# ==============================================================================
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_filter_query import SCENARIOS, same_result  # noqa: E402
+from filter_engine import FilterEngine  # noqa: E402
+from filter_query import filter_frames  # noqa: E402
+from schema import apply_frame_dtypes  # noqa: E402
+from synthetic_data import make_animals, make_shelters  # noqa: E402
+
+
+def timed_ms(func, *args, repeat=5):
+    """`repeat`번 실행한 시간의 중앙값(ms)과 마지막 결과를 반환합니다."""
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        times.append((time.perf_counter() - started) * 1000)
+    return sorted(times)[len(times) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="필터 성능 비교 (pandas vs 메모리 색인 엔진)")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000], help="동물 수 목록")
+    parser.add_argument('--shelters', type=int, default=3000, help="보호소 수")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        raw_animals = make_animals(rows, shelters=args.shelters, days=365)
+        shelters = apply_frame_dtypes(make_shelters(raw_animals), 'shelters')
+        animals = apply_frame_dtypes(raw_animals, 'animals')
+        engine = FilterEngine(animals, shelters)
+
+        print(f"\n동물 {rows:,}건 / 보호소 {len(shelters):,}곳 (색인 {engine.build_seconds:.2f}초)")
+        print(f"{'필터':<24} {'결과 행':>9} {'pandas(ms)':>11} {'선택(ms)':>9} {'엔진(ms)':>9} {'배율':>7}  결과 일치")
+        for name, *filter_args in SCENARIOS:
+            pandas_ms, expected = timed_ms(filter_frames, animals, shelters, *filter_args, repeat=args.repeat)
+            select_ms, _ = timed_ms(engine.select, *filter_args, repeat=args.repeat)
+            engine_ms, actual = timed_ms(engine.filter, *filter_args, repeat=args.repeat)
+            print(f"{name:<24} {expected[3]:>9,} {pandas_ms:>11.1f} {select_ms:>9.2f} {engine_ms:>9.2f} "
+                  f"{pandas_ms / engine_ms:>6.0f}x  {same_result(expected, actual)}")
+
+
+if __name__ == '__main__':
+    main()
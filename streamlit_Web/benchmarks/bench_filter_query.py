@@ -0,0 +1,128 @@
+# ==============================================================================
+# benchmarks/bench_filter_query.py - 필터 조회 성능 비교 (pandas vs SQL push-down)
+# ==============================================================================
+# 합성 `animals`/`shelters` 테이블을 DB에 적재한 뒤, 같은 필터 조합에 대해
+# 다음 두 방식의 시간을 비교하고 결과(동물 목록, 보호소 목록, KPI 4종)가 같은지 확인합니다.
+#
+# - **pandas:** `load_data`처럼 두 테이블 전체를 `SELECT *`로 읽고 `filter_frames`로 필터링.
+#   앱에서는 전체 테이블이 `st.cache_data`에 캐시되지만, 캐시에서 꺼낼 때마다 복사본을
+#   만들므로(pickle) 필터 조합마다 드는 비용을 "캐시 복사 + 필터"로도 함께 표시합니다.
+# - **SQL:** `filter_query.query_filtered_data` (조건에 맞는 행/컬럼만 조회 + SQL 집계 KPI)
+#
+# 기본값은 임시 SQLite 파일이며, `--db-url`로 MySQL 등 다른 DB를 지정할 수 있습니다.
+# (지정한 DB의 `animals`/`shelters` 테이블을 덮어쓰므로 벤치마크 전용 DB를 사용하세요.)
+#
+# [실행 방법]
+#   cd streamlit_Web
+#   python benchmarks/bench_filter_query.py --rows 100000 1000000
+# ==============================================================================
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from filter_query import filter_frames, query_filtered_data  # noqa: E402
+from schema import TABLE_INDEXES, apply_frame_dtypes, column_types, conform_frame  # noqa: E402
+from synthetic_data import make_animals, make_shelters  # noqa: E402
+
+TODAY = date.today()
+SEOUL, GYEONGGI = 6100000, 6180000           # 합성 시/도 코드 (`synthetic_data.make_region_table`)
+GYEONGGI_DISTRICT_03 = GYEONGGI + 1000 + 3   # 경기도 구03
+# (이름, 시작일, 종료일, 시/도 코드, 시/군/구 코드, 축종)
+SCENARIOS = [
+    ('기본 (최근 30일, 전체)', TODAY - timedelta(days=30), TODAY, None, None, []),
+    ('최근 7일, 고양이, 서울', TODAY - timedelta(days=7), TODAY, SEOUL, None, ['고양이']),
+    ('최근 90일, 개, 경기도 구03', TODAY - timedelta(days=90), TODAY, GYEONGGI, GYEONGGI_DISTRICT_03, ['개']),
+    ('전체 기간, 개+고양이', TODAY - timedelta(days=365), TODAY, None, None, ['개', '고양이']),
+]
+
+
+def load_tables(engine, animals: pd.DataFrame, shelters: pd.DataFrame):
+    """두 테이블을 스키마 타입으로 적재하고 `TABLE_INDEXES`의 인덱스를 만듭니다. (DB 종류와 무관한 DDL 사용)"""
+    with engine.begin() as conn:
+        for table, df in [('animals', animals), ('shelters', shelters)]:
+            df = conform_frame(df, table)
+            df.to_sql(table, conn, if_exists='replace', index=False, chunksize=20000,
+                      dtype=column_types(table, df.columns))
+            for kind, name, columns in TABLE_INDEXES[table]:
+                index_name = f"pk_{table}" if kind == 'PRIMARY' else name
+                unique = 'UNIQUE ' if kind in ('PRIMARY', 'UNIQUE') else ''
+                conn.execute(text(f"CREATE {unique}INDEX {index_name} ON {table} ({', '.join(columns)})"))
+
+
+def read_full_tables(engine):
+    """변경 전 `load_data`와 같이 두 테이블 전체를 읽습니다."""
+    with engine.connect() as conn:
+        animals = apply_frame_dtypes(pd.read_sql("SELECT * FROM animals", conn), 'animals')
+        shelters = pd.read_sql("SELECT * FROM shelters", conn)
+    return animals, apply_frame_dtypes(shelters, 'shelters')
+
+
+def timed(func, *args, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def same_result(expected: tuple, actual: tuple) -> str:
+    if expected[2:] != actual[2:]:
+        return f'아니오 (KPI {expected[2:]} != {actual[2:]})'
+    for i, key in [(0, 'desertion_no'), (1, 'shelter_name')]:
+        left = sorted(expected[i][key].astype(str)) if not expected[i].empty else []
+        right = sorted(actual[i][key].astype(str)) if not actual[i].empty else []
+        if left != right:
+            return f'아니오 ({key} 목록 다름)'
+    return '예'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="필터 조회 성능 비교 (pandas vs SQL)")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000], help="동물 수 목록")
+    parser.add_argument('--shelters', type=int, default=3000, help="보호소 수")
+    parser.add_argument('--db-url', help="SQLAlchemy DB URL (기본값: 임시 SQLite 파일)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        animals = make_animals(rows, shelters=args.shelters, days=365)
+        shelters = make_shelters(animals)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            engine = create_engine(args.db_url or f"sqlite:///{os.path.join(tmp_dir, 'bench.sqlite3')}")
+            started = time.perf_counter()
+            load_tables(engine, animals, shelters)
+            print(f"\n동물 {rows:,}건 / 보호소 {len(shelters):,}곳 (적재 {time.perf_counter() - started:.1f}초, {engine.dialect.name})")
+
+            load_time, (full_animals, full_shelters) = timed(read_full_tables, engine, repeat=1)
+            cached = pickle.dumps((full_animals, full_shelters))
+            print(f"전체 테이블 읽기 (pandas 방식의 첫 조회): {load_time:.2f}초")
+            print(f"{'필터':<24} {'결과 행':>9} {'pandas(초)':>11} {'+캐시 복사':>11} {'SQL(초)':>9} {'배율':>7}  결과 일치")
+
+            for name, start, end, sido, sigungu, species in SCENARIOS:
+                filter_args = (start, end, sido, sigungu, species)
+                pandas_time, expected = timed(filter_frames, full_animals, full_shelters, *filter_args, repeat=args.repeat)
+                copy_time, _ = timed(pickle.loads, cached, repeat=args.repeat)
+
+                def sql_path():
+                    with engine.connect() as conn:
+                        return query_filtered_data(conn, *filter_args)
+
+                sql_time, actual = timed(sql_path, repeat=args.repeat)
+                print(f"{name:<24} {expected[3]:>9,} {pandas_time:>11.3f} {pandas_time + copy_time:>11.3f} "
+                      f"{sql_time:>9.3f} {(pandas_time + copy_time) / sql_time:>6.1f}x  {same_result(expected, actual)}")
+            engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# ==============================================================================
+# benchmarks/bench_frame_memory.py - 데이터프레임 메모리 사용량 비교
+# ==============================================================================
+# `load_data`가 DB에서 읽은 그대로의 데이터프레임(문자열 = 파이썬 객체)과
+# `schema.apply_frame_dtypes`를 적용한 데이터프레임의 메모리 사용량을
+# 컬럼별로 비교합니다.
+#
+# [실행 방법]
+#   cd streamlit_Web
+#   python benchmarks/bench_frame_memory.py --rows 200000
+# ==============================================================================
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schema import apply_frame_dtypes, frame_memory_mb  # noqa: E402
+from synthetic_data import make_animals  # noqa: E402
+
+
+def as_read_sql(animals):
+    """`pd.read_sql`이 반환하는 형태처럼 공고일(DATE)을 파이썬 date 객체로 바꿉니다."""
+    animals = animals.copy()
+    animals['notice_date'] = animals['notice_date'].dt.date
+    return animals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터프레임 메모리 사용량 비교")
+    parser.add_argument('--rows', type=int, default=200000, help="동물 수")
+    parser.add_argument('--shelters', type=int, default=1000, help="보호소 수")
+    args = parser.parse_args()
+
+    before = as_read_sql(make_animals(args.rows, shelters=args.shelters))
+    started = time.perf_counter()
+    after = apply_frame_dtypes(before, 'animals')
+    elapsed = time.perf_counter() - started
+
+    before_usage = before.memory_usage(deep=True, index=False) / 1024 / 1024
+    after_usage = after.memory_usage(deep=True, index=False) / 1024 / 1024
+    print(f"{'컬럼':<15} {'변경 전 타입':<14} {'변경 후 타입':<24} {'전(MB)':>9} {'후(MB)':>9}")
+    for col in before.columns:
+        print(f"{col:<15} {str(before[col].dtype):<14} {str(after[col].dtype):<24} "
+              f"{before_usage[col]:>9.1f} {after_usage[col]:>9.1f}")
+
+    total_before, total_after = frame_memory_mb(before), frame_memory_mb(after)
+    print(f"\n동물 {len(before):,}건: {total_before:.1f}MB → {total_after:.1f}MB "
+          f"({total_before / total_after:.1f}배 감소, 타입 변환 {elapsed:.2f}초)")
+
+
+if __name__ == '__main__':
+    main()
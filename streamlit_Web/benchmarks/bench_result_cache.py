@@ -0,0 +1,95 @@
+# ==============================================================================
+# benchmarks/bench_result_cache.py - 필터 결과 캐시 메모리 비교 (제한 없음 vs 메모리 예산 LRU)
+# ==============================================================================
+# 사용자가 날짜 선택기를 움직이는 상황을 흉내 내어, 시작일만 하루씩 바뀌는 필터 조합을
+# 차례로 조회합니다. 같은 결과를 다음 두 캐시에 넣고 보관 중인 결과 크기를 비교합니다.
+#
+# - **제한 없음:** 조합마다 항목이 계속 쌓이는 기존 `st.cache_data`와 같은 방식 (dict)
+# - **LRU:** `result_cache.ResultCache(max_mb)`
+#
+# 마지막에 최근 조합 몇 개를 다시 조회하여 LRU 캐시의 적중률도 확인합니다.
+#
+# 이어서 시/도 → 시/군/구 → 축종 → 기간 순서로 조건을 좁혀 가며, 전체 테이블을 거르는 시간(pandas)과
+# 캐시된 더 넓은 결과를 다시 거르는 시간(`FilterKey.covers` + `filter_frames`)을 비교합니다.
+#
+# [실행 방법]
+#   cd streamlit_Web
+#   python benchmarks/bench_result_cache.py --rows 200000 --steps 120 --max-mb 64
+# ==============================================================================
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_filter_query import GYEONGGI, GYEONGGI_DISTRICT_03, same_result  # noqa: E402
+from filter_engine import FilterEngine  # noqa: E402
+from filter_query import FilterKey, filter_frames  # noqa: E402
+from result_cache import ResultCache, result_nbytes  # noqa: E402
+from schema import apply_frame_dtypes  # noqa: E402
+from synthetic_data import make_animals, make_shelters  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="필터 결과 캐시 메모리 비교")
+    parser.add_argument('--rows', type=int, default=200000, help="동물 수")
+    parser.add_argument('--shelters', type=int, default=3000, help="보호소 수")
+    parser.add_argument('--steps', type=int, default=120, help="조회할 필터 조합 수 (시작일을 하루씩 당김)")
+    parser.add_argument('--max-mb', type=float, default=64, help="LRU 캐시 메모리 예산(MB)")
+    args = parser.parse_args()
+
+    raw_animals = make_animals(args.rows, shelters=args.shelters, days=365)
+    animals = apply_frame_dtypes(raw_animals, 'animals')
+    shelters = apply_frame_dtypes(make_shelters(raw_animals), 'shelters')
+    engine = FilterEngine(animals, shelters)
+
+    unbounded, lru = {}, ResultCache(args.max_mb)
+    today = date.today()
+    keys = [(today - timedelta(days=30 + step), today, None, None, ()) for step in range(args.steps)]
+    print(f"{'조회 수':>7} {'제한 없음(MB)':>14} {'LRU(MB)':>9} {'LRU 항목':>9} {'제거':>6}")
+    for i, key in enumerate(keys, 1):
+        result = engine.filter(*key[:4], list(key[4]))
+        unbounded[key] = result
+        lru.put(key, result)
+        if i % max(args.steps // 6, 1) == 0 or i == len(keys):
+            stats = lru.stats()
+            unbounded_mb = sum(result_nbytes(value) for value in unbounded.values()) / 1024 / 1024
+            print(f"{i:>7} {unbounded_mb:>14.1f} {stats['bytes'] / 1024 / 1024:>9.1f} {stats['entries']:>9} "
+                  f"{stats['evictions']:>6}")
+
+    # 최근 조합으로 되돌아가는 경우 (날짜 선택기를 다시 당겨 오는 경우)
+    for key in reversed(keys[-10:]):
+        if lru.get(key) is None:
+            lru.put(key, engine.filter(*key[:4], list(key[4])))
+    stats = lru.stats()
+    print(f"\n최근 10개 조합 재조회: 적중 {stats['hits']}건, 실패 {stats['misses']}건 (예산 {args.max_mb:.0f}MB)")
+
+    # 조건을 좁혀 가는 조회
+    cache = ResultCache(args.max_mb)
+    steps = [
+        ('최근 90일, 전체', today - timedelta(days=90), today, None, None, []),
+        ('+ 경기도', today - timedelta(days=90), today, GYEONGGI, None, []),
+        ('+ 구03', today - timedelta(days=90), today, GYEONGGI, GYEONGGI_DISTRICT_03, []),
+        ('+ 개', today - timedelta(days=90), today, GYEONGGI, GYEONGGI_DISTRICT_03, ['개']),
+        ('+ 최근 30일', today - timedelta(days=30), today, GYEONGGI, GYEONGGI_DISTRICT_03, ['개']),
+    ]
+    print(f"\n{'조건 좁히기':<16} {'결과 행':>8} {'전체 테이블(ms)':>15} {'캐시 재사용(ms)':>15}  결과 일치")
+    for name, *filter_args in steps:
+        started = time.perf_counter()
+        expected = filter_frames(animals, shelters, *filter_args)
+        full_ms = (time.perf_counter() - started) * 1000
+        key = FilterKey(*filter_args[:4], tuple(sorted(filter_args[4])), 0, 'pandas')
+        started = time.perf_counter()
+        actual = cache.get_or_compute(key, compute=lambda: filter_frames(animals, shelters, *filter_args),
+                                      derive=lambda cached: filter_frames(cached[0], cached[1], *filter_args))
+        cached_ms = (time.perf_counter() - started) * 1000
+        print(f"{name:<16} {expected[3]:>8,} {full_ms:>15.1f} {cached_ms:>15.1f}  {same_result(expected, actual)}")
+    stats = cache.stats()
+    print(f"포함 결과 재사용 {stats['subsumed']}건, 새로 계산 {stats['misses']}건")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# ==============================================================================
+# benchmarks/bench_shelter_aggregation.py - 보호소 집계 성능 비교
+# ==============================================================================
+# 기존 `groupby(...).agg` + 람다 방식과 `shelter_aggregation.aggregate_shelters`
+# (벡터 연산)의 실행 시간을 비교하고, 두 결과가 같은지 확인합니다.
+#
+# [실행 방법]
+#   cd streamlit_Web
+#   python benchmarks/bench_shelter_aggregation.py --base-rows 50000 --scales 1 10
+# ==============================================================================
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shelter_aggregation import aggregate_shelters  # noqa: E402
+from synthetic_data import make_animals  # noqa: E402
+
+
+def aggregate_shelters_lambda(animals_df: pd.DataFrame, now: pd.Timestamp) -> pd.DataFrame:
+    """변경 전 `preprocess_data`의 보호소 집계 (비교 기준)"""
+    agg_dict = {
+        'care_addr_animal': ('care_addr', 'first'),
+        'region': ('care_addr', lambda x: x.iloc[0].split()[0] if x.notna().any() else '정보 없음'),
+        'count': ('desertion_no', 'count'),
+        'long_term': ('notice_date', lambda x: (x < now - pd.Timedelta(days=30)).sum()),
+        'adopted': ('process_state', lambda x: (x == '종료(입양)').sum()),
+        'species': ('species', lambda x: x.value_counts().index[0] if not x.empty else '정보 없음'),
+        'kind_name': ('kind_name', lambda x: x.value_counts().index[0] if not x.empty else '정보 없음')
+    }
+    if 'image_url' in animals_df.columns:
+        agg_dict['image_url'] = ('image_url', 'first')
+    return animals_df.groupby('shelter_name').agg(**agg_dict).reset_index()
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보호소 집계 성능 비교")
+    parser.add_argument('--base-rows', type=int, default=50000, help="1배 기준 동물 수")
+    parser.add_argument('--shelters', type=int, default=1000, help="1배 기준 보호소 수")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10], help="데이터 배수 목록")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    now = pd.Timestamp.now()
+    print(f"{'배수':>4} {'동물 수':>10} {'보호소 수':>8} {'람다(초)':>10} {'벡터(초)':>10} {'속도 향상':>8}  결과 일치")
+    for scale in args.scales:
+        animals = make_animals(args.base_rows * scale, shelters=args.shelters * scale, seed=scale)
+        lambda_time, expected = timed(aggregate_shelters_lambda, animals, now, repeat=args.repeat)
+        vector_time, actual = timed(aggregate_shelters, animals, now, repeat=args.repeat)
+        try:
+            pd.testing.assert_frame_equal(expected, actual, check_dtype=False)
+            identical = '예'
+        except AssertionError as e:
+            identical = f'아니오 ({str(e).splitlines()[0]})'
+        print(f"{scale:>4}x {len(animals):>10,} {expected.shape[0]:>8,} {lambda_time:>10.3f} {vector_time:>10.3f} "
+              f"{lambda_time / vector_time:>7.1f}x  {identical}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# ==============================================================================
+# benchmarks/bench_table_reader.py - 테이블 전체 읽기 비교 (한 번에 읽기 vs 나눠 읽기)
+# ==============================================================================
+# 가상 동물 데이터를 SQLite 파일에 적재한 뒤, `table_reader`의 두 방식으로 `animals`
+# 테이블 전체를 읽어 걸린 시간, 초당 행 수, 최대 메모리 증가량(RSS)을 비교합니다.
+#
+# - **whole:** `pd.read_sql` (기존 `load_data`)
+# - **chunked:** 커서에서 `--chunk-rows`행씩 꺼내 Arrow 컬럼으로 바꿔 합치기
+#
+# 최대 메모리는 프로세스 단위로만 측정되므로 방식마다 새 프로세스에서 읽습니다.
+# 두 결과에 `apply_frame_dtypes`를 적용하면 같은 데이터프레임인지도 확인합니다.
+# (MySQL 대신 SQLite를 쓰므로 드라이버가 행을 버퍼링하는 비용은 실제보다 작게 나옵니다.)
+#
+# [실행 방법]
+#   cd streamlit_Web
+#   python benchmarks/bench_table_reader.py --rows 300000 --chunk-rows 20000
+# ==============================================================================
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+from schema import apply_frame_dtypes, column_types, conform_frame, frame_memory_mb  # noqa: E402
+from synthetic_data import make_animals  # noqa: E402
+from table_reader import peak_rss_mb, read_table_chunked, read_table_whole, reset_peak_rss, rss_mb  # noqa: E402
+
+
+def worker(db_url: str, mode: str, chunk_rows: int, queue):
+    engine = create_engine(db_url)
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+        reset_peak_rss()
+        baseline = rss_mb()
+        started = time.perf_counter()
+        if mode == 'chunked':
+            data = read_table_chunked(conn, 'animals', chunk_rows)
+        else:
+            data = read_table_whole(conn, 'animals')
+        elapsed = time.perf_counter() - started
+        peak_mb = peak_rss_mb() - baseline
+    data = apply_frame_dtypes(data, 'animals')
+    queue.put((len(data), elapsed, peak_mb, frame_memory_mb(data)))
+
+
+def run(db_url: str, mode: str, chunk_rows: int):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=worker, args=(db_url, mode, chunk_rows, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="테이블 전체 읽기 비교")
+    parser.add_argument('--rows', type=int, default=300000, help="동물 수")
+    parser.add_argument('--shelters', type=int, default=3000, help="보호소 수")
+    parser.add_argument('--chunk-rows', type=int, default=20000, help="나눠 읽을 때 한 번에 꺼낼 행 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_url = f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}"
+        engine = create_engine(db_url)
+        animals = conform_frame(make_animals(args.rows, shelters=args.shelters, days=365), 'animals')
+        with engine.begin() as conn:
+            animals.to_sql('animals', conn, index=False, dtype=column_types('animals', animals.columns))
+        del animals
+
+        with engine.connect() as conn:
+            whole = apply_frame_dtypes(read_table_whole(conn, 'animals'), 'animals')
+            chunked = apply_frame_dtypes(read_table_chunked(conn, 'animals', args.chunk_rows), 'animals')
+        try:
+            pd.testing.assert_frame_equal(whole, chunked)
+            print("결과 일치: True\n")
+        except AssertionError as e:
+            print(f"결과 일치: False ({e})\n")
+        del whole, chunked
+
+        print(f"{'방식':<8} {'행 수':>9} {'시간(초)':>9} {'행/초':>10} {'최대 메모리 증가(MB)':>20} {'결과(MB)':>9}")
+        for mode in ('whole', 'chunked'):
+            rows, elapsed, peak_mb, frame_mb = run(db_url, mode, args.chunk_rows)
+            print(f"{mode:<8} {rows:>9,} {elapsed:>9.2f} {rows / elapsed:>10,.0f} {peak_mb:>20.0f} {frame_mb:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
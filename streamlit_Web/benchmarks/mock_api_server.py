@@ -0,0 +1,523 @@
+# ==============================================================================
+# benchmarks/mock_api_server.py - 공공데이터포털/카카오 API 로컬 모의 서버
+# ==============================================================================
+# abandonmentPublicService_v2(`sido_v2`, `sigungu_v2`, `shelter_v2`, `kind_v2`,
+# `abandonmentPublic_v2`)와 카카오 주소 검색 API를 흉내 내는 로컬 서버입니다.
+# 네트워크 없이 수집 동시성, 재시도 경로, ETL 처리량을 측정할 때 사용합니다.
+#
+# [합성 데이터]
+# - 동물 수/보호소 수/기간을 지정할 수 있으며(예: 동물 100만 건, 보호소 5천 곳),
+#   동물 항목은 요청된 페이지의 것만 그때그때 만듭니다. (`--seed`가 같으면 항상 같은 데이터)
+# - 실제 API처럼 `totalCount`, `pageNo`, `numOfRows`로 페이지를 나누고,
+#   `_type=json`이면 JSON, 아니면 XML로 응답합니다. 페이지를 나누는 것은 `abandonmentPublic_v2`와
+#   시/도 단위 `shelter_v2`(`org_cd` 없음)뿐이며, 시/도·시/군/구·품종 목록과 시/군/구 단위
+#   보호소 목록은 수집 코드가 `numOfRows`를 보내지 않으므로 항상 전체를 돌려줍니다.
+# - 보호소 일부는 좌표가 없거나 0이며, 카카오 API는 일부 주소에 대해 빈 결과를 줍니다.
+#
+# [장애 주입]
+# - `--latency-ms`, `--jitter-ms`: 응답 지연
+# - `--error-rate`: 이 비율만큼 HTTP 500 또는 `resultCode=22`(요청 한도 초과) 응답
+#
+# [실행 방법]
+#   cd streamlit_Web
+#   python benchmarks/mock_api_server.py serve --port 8089 --animals 1000000 --shelters 5000
+#   ; config.ini [API]에 아래 주소를 지정하면 update_data.py / 앱이 모의 서버를 사용합니다.
+#   ;   base_url = http://127.0.0.1:8089/1543061/abandonmentPublicService_v2
+#   ;   kakao_base_url = http://127.0.0.1:8089
+#
+#   ; 부하 생성: 동시 요청 수별로 유기동물 페이지 전체를 받아 처리량을 비교합니다.
+#   python benchmarks/mock_api_server.py loadgen --url http://127.0.0.1:8089 --workers 1 4 8 16
+#
+#   ; 보호소 수집 전략 확인: 서버를 띄워 `sigungu`와 `sido_paged` 전략이 같은 보호소(careRegNo)를
+#   ; 빠짐없이 돌려주는지 비교합니다. (다르면 종료 코드 1)
+#   python benchmarks/mock_api_server.py check-shelters --shelters 300
+#
+# `GET /__stats`는 서버가 받은 요청 수와 주입한 오류 수를 JSON으로 돌려줍니다.
+# ==============================================================================
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import KINDS, PROCESS_STATES  # noqa: E402
+
+SERVICE_PATH = '/1543061/abandonmentPublicService_v2'
+KAKAO_PATH = '/v2/local/search/address.json'
+
+SIDO = [
+    ('6110000', '서울특별시'), ('6260000', '부산광역시'), ('6270000', '대구광역시'), ('6280000', '인천광역시'),
+    ('6290000', '광주광역시'), ('5690000', '세종특별자치시'), ('6300000', '대전광역시'), ('6310000', '울산광역시'),
+    ('6410000', '경기도'), ('6530000', '강원특별자치도'), ('6430000', '충청북도'), ('6440000', '충청남도'),
+    ('6540000', '전북특별자치도'), ('6460000', '전라남도'), ('6470000', '경상북도'), ('6480000', '경상남도'),
+    ('6500000', '제주특별자치도'),
+]
+SIGUNGU_NAMES = ['중구', '동구', '서구', '남구', '북구', '강남구', '강서구', '수성구', '달서구', '연수구',
+                 '유성구', '수원시', '성남시', '고양시', '용인시', '청주시', '천안시', '전주시', '포항시', '창원시',
+                 '김해시', '제주시', '서귀포시', '춘천시', '원주시']
+SIGUNGU_PER_SIDO = {'세종특별자치시': 0, '제주특별자치도': 2, '서울특별시': 25, '경기도': 25}
+UPKINDS = [('417000', '개'), ('422400', '고양이'), ('429900', '기타')]
+COLORS = ['흰색', '검정', '갈색', '치즈', '삼색', '고등어']
+
+
+class MockDataset:
+    """모의 서버가 돌려줄 합성 데이터입니다. 동물은 숫자 배열로만 들고 있다가 페이지 단위로 항목을 만듭니다."""
+
+    def __init__(self, animals=100000, shelters=1000, days=180, seed=0, today=None, geocode_miss_rate=0.05):
+        self.today = today or date.today()
+        self.geocode_miss_rate = geocode_miss_rate
+        rng = np.random.default_rng(seed)
+
+        # 시/도 → 시/군/구 (세종처럼 시/군/구가 없는 시/도는 시/도 코드로 보호소를 조회)
+        self.sigungu = {}
+        regions = []
+        for sido_idx, (sido_code, sido_name) in enumerate(SIDO):
+            count = SIGUNGU_PER_SIDO.get(sido_name, 10)
+            items = [(f"{3000000 + sido_idx * 100000 + j * 1000}", SIGUNGU_NAMES[j]) for j in range(count)]
+            self.sigungu[sido_code] = items
+            regions.extend((sido_code, sido_name, code, name) for code, name in items)
+            if not items:
+                regions.append((sido_code, sido_name, sido_code, ''))
+
+        # 보호소: 지역에 고르게 배치, 좌표는 80% 정상 / 10% 0 / 10% 없음
+        self.shelters = []
+        self.shelters_by_org = {}
+        for i in range(shelters):
+            sido_code, sido_name, org_code, sigungu_name = regions[i % len(regions)]
+            address = ' '.join(part for part in (sido_name, sigungu_name, f'동물보호로 {i + 1}') if part)
+            coord_kind = rng.random()
+            if coord_kind < 0.8:
+                lat, lon = f"{rng.uniform(33.2, 38.5):.6f}", f"{rng.uniform(126.1, 129.5):.6f}"
+            elif coord_kind < 0.9:
+                lat, lon = '0', '0'
+            else:
+                lat, lon = None, None
+            shelter = {
+                'careNm': f"{sigungu_name or sido_name} 동물보호센터 {i + 1:05d}",
+                'careRegNo': f"{sido_code[:3]}{i + 1:08d}",
+                'orgNm': f"{sido_name} {sigungu_name}".strip(),
+                'careAddr': address,
+                'careTel': f"0{2 + i % 60}-{100 + i % 900}-{i % 10000:04d}",
+                'dataStdDt': (self.today - timedelta(days=1)).strftime('%Y%m%d'),
+                'lat': lat,
+                'lon': lon,
+            }
+            self.shelters.append(shelter)
+            self.shelters_by_org.setdefault((sido_code, org_code), []).append(shelter)
+
+        # 종류: 축종별 품종 코드
+        self.kinds = {
+            upkind_code: [(f"{upkind_code[:3]}{k + 1:03d}", name) for k, name in enumerate(KINDS[upkind_name])]
+            for upkind_code, upkind_name in UPKINDS
+        }
+
+        # 동물: 공고일 내림차순(실제 API 정렬)으로 정렬한 숫자 배열
+        weights = 1.0 / np.arange(1, shelters + 1) ** 0.8
+        offsets = np.sort(rng.integers(0, days, animals))
+        self.notice_offset = offsets.astype(np.int32)
+        self.upkind_idx = rng.choice(len(UPKINDS), size=animals, p=[0.7, 0.25, 0.05]).astype(np.int8)
+        self.shelter_idx = rng.choice(shelters, size=animals, p=weights / weights.sum()).astype(np.int32)
+        self.kind_draw = rng.integers(0, 1 << 30, animals).astype(np.int32)
+        self.state_idx = rng.choice(len(PROCESS_STATES), size=animals, p=[0.45, 0.25, 0.1, 0.1, 0.05, 0.05]).astype(np.int8)
+        self._query_cache = {}
+        self._query_lock = threading.Lock()
+
+        # 항목 생성 비용을 줄이기 위해 날짜/보호소별 문자열을 미리 만들어 둡니다.
+        self._dates = []
+        for offset in range(days + 1):
+            notice = self.today - timedelta(days=offset)
+            self._dates.append({
+                'happenDt': (notice - timedelta(days=1)).strftime('%Y%m%d'),
+                'noticeSdt': notice.strftime('%Y%m%d'),
+                'noticeEdt': (notice + timedelta(days=10)).strftime('%Y%m%d'),
+                'year': str(notice.year),
+                'updDate': notice.strftime('%Y-%m-%d'),
+            })
+        for shelter in self.shelters:
+            shelter['_happenPlace'] = f"{shelter['careAddr'].rsplit(' ', 1)[0]} 인근"
+
+    def sido_items(self):
+        return [{'orgCd': code, 'orgdownNm': name} for code, name in SIDO]
+
+    def sigungu_items(self, upr_cd):
+        return [{'uprCd': upr_cd, 'orgCd': code, 'orgdownNm': name} for code, name in self.sigungu.get(upr_cd, [])]
+
+    def shelter_items(self, upr_cd, org_cd):
+        if org_cd:
+            items = self.shelters_by_org.get((upr_cd, org_cd), [])
+        else:
+            items = [item for (sido_code, _), shelters in self.shelters_by_org.items() if sido_code == upr_cd for item in shelters]
+        # '_'로 시작하는 키는 내부용 캐시 값입니다.
+        return [{k: v for k, v in item.items() if not k.startswith('_')} for item in items]
+
+    def kind_items(self, up_kind_cd):
+        return [{'kindCd': code, 'kindNm': name} for code, name in self.kinds.get(up_kind_cd, [])]
+
+    def _date_offset(self, value, default):
+        if not value:
+            return default
+        return (self.today - datetime.strptime(value, '%Y%m%d').date()).days
+
+    def animal_rows(self, upkind, bgnde, endde):
+        """조건에 맞는 동물의 행 번호 배열을 반환합니다. (같은 조건은 캐시)"""
+        key = (upkind, bgnde, endde)
+        with self._query_lock:
+            rows = self._query_cache.get(key)
+        if rows is not None:
+            return rows
+        newest = max(self._date_offset(endde, 0), 0)
+        oldest = self._date_offset(bgnde, int(self.notice_offset[-1]) if len(self.notice_offset) else 0)
+        start, stop = np.searchsorted(self.notice_offset, [newest, oldest + 1])
+        rows = np.arange(start, stop)
+        upkind_codes = [code for code, _ in UPKINDS]
+        if upkind in upkind_codes:
+            rows = rows[self.upkind_idx[start:stop] == upkind_codes.index(upkind)]
+        rows = rows.tolist()
+        with self._query_lock:
+            self._query_cache[key] = rows
+        return rows
+
+    def animal_item(self, row):
+        upkind_code, upkind_name = UPKINDS[self.upkind_idx[row]]
+        kinds = self.kinds[upkind_code]
+        kind_code, kind_name = kinds[self.kind_draw[row] % len(kinds)]
+        shelter = self.shelters[self.shelter_idx[row]]
+        dates = self._dates[self.notice_offset[row]]
+        return {
+            'desertionNo': f"4{row:011d}",
+            'happenDt': dates['happenDt'],
+            'happenPlace': shelter['_happenPlace'],
+            'kindCd': kind_code,
+            'kindNm': kind_name,
+            'kindFullNm': f"[{upkind_name}] {kind_name}",
+            'upKindCd': upkind_code,
+            'upKindNm': upkind_name,
+            'colorCd': COLORS[row % len(COLORS)],
+            'age': f"{self.today.year - row % 15}(년생)",
+            'weight': f"{1 + row % 30}(Kg)",
+            'noticeNo': f"{shelter['orgNm']}-{dates['year']}-{row % 100000:05d}",
+            'noticeSdt': dates['noticeSdt'],
+            'noticeEdt': dates['noticeEdt'],
+            'popfile1': f"http://openapi.animal.go.kr/openapi/service/rest/fileDownloadSrvc/files/shelter/{row}.jpg",
+            'processState': PROCESS_STATES[self.state_idx[row]],
+            'sexCd': 'MFQ'[row % 3],
+            'neuterYn': 'YNU'[row % 3],
+            'specialMark': '온순함',
+            'careRegNo': shelter['careRegNo'],
+            'careNm': shelter['careNm'],
+            'careTel': shelter['careTel'],
+            'careAddr': shelter['careAddr'],
+            'orgNm': shelter['orgNm'],
+            'updTm': f"{dates['updDate']} 09:{row % 60:02d}:00.0",
+        }
+
+    def geocode(self, query):
+        """주소 해시로 정해지는 좌표를 반환합니다. 일부 주소는 좌표 없음(None)입니다."""
+        digest = int(hashlib.sha256(query.encode('utf-8')).hexdigest()[:12], 16)
+        if (digest % 10000) / 10000 < self.geocode_miss_rate:
+            return None
+        return 33.2 + (digest % 5300) / 1000, 126.1 + (digest // 5300 % 3400) / 1000
+
+
+# --- 응답 본문 ---
+
+def _xml_response(items, total_count=None, page_no=1, num_of_rows=None, result_code='00', result_msg='NORMAL SERVICE.'):
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?><response><header><reqNo>1</reqNo>',
+             f'<resultCode>{result_code}</resultCode><resultMsg>{escape(result_msg)}</resultMsg></header><body><items>']
+    for item in items:
+        parts.append('<item>')
+        parts.extend(f'<{k}>{escape(v)}</{k}>' for k, v in item.items() if v is not None)
+        parts.append('</item>')
+    parts.append(f'</items><numOfRows>{num_of_rows or len(items)}</numOfRows><pageNo>{page_no}</pageNo>'
+                 f'<totalCount>{len(items) if total_count is None else total_count}</totalCount></body></response>')
+    return ''.join(parts).encode('utf-8'), 'application/xml;charset=UTF-8'
+
+
+def _json_response(items, total_count=None, page_no=1, num_of_rows=None, result_code='00', result_msg='NORMAL SERVICE.'):
+    body = {
+        'response': {
+            'header': {'reqNo': 1, 'resultCode': result_code, 'resultMsg': result_msg},
+            'body': {
+                # 실제 API처럼 항목이 없으면 빈 문자열을 돌려줍니다.
+                'items': {'item': [{k: v for k, v in item.items() if v is not None} for item in items]} if items else '',
+                'numOfRows': num_of_rows or len(items),
+                'pageNo': page_no,
+                'totalCount': len(items) if total_count is None else total_count,
+            },
+        }
+    }
+    return json.dumps(body, ensure_ascii=False).encode('utf-8'), 'application/json;charset=UTF-8'
+
+
+AUTH_ERROR_BODY = ('<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>'
+                   '<returnAuthMsg>SERVICE_KEY_IS_NOT_REGISTERED_ERROR</returnAuthMsg>'
+                   '<returnReasonCode>30</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>').encode('utf-8')
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-Alive 연결 재사용
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+        if parsed.path == '/__stats':
+            self._send(200, json.dumps(server.stats_snapshot()).encode('utf-8'), 'application/json')
+            return
+
+        server.count('requests')
+        delay = server.latency + (server.rng_uniform(0, server.jitter) if server.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        if parsed.path == KAKAO_PATH:
+            self._kakao(params)
+            return
+        if not parsed.path.startswith(SERVICE_PATH + '/'):
+            self._send(404, b'Not Found', 'text/plain')
+            return
+        if not params.get('serviceKey'):
+            self._send(200, AUTH_ERROR_BODY, 'text/xml;charset=UTF-8')
+            return
+
+        if server.error_rate and server.rng_uniform(0, 1) < server.error_rate:
+            server.count('errors')
+            if server.rng_uniform(0, 1) < 0.5:
+                self._send(500, b'Internal Server Error', 'text/plain')
+            else:
+                self._send(200, *_xml_response([], 0, result_code='22',
+                                               result_msg='LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR'))
+            return
+
+        render = _json_response if params.get('_type') == 'json' else _xml_response
+        operation = parsed.path[len(SERVICE_PATH) + 1:]
+        dataset = server.dataset
+        page_no = max(int(params.get('pageNo') or 1), 1)
+        num_of_rows = max(int(params.get('numOfRows') or 10), 1)
+
+        if operation == 'abandonmentPublic_v2':
+            rows = dataset.animal_rows(params.get('upkind', ''), params.get('bgnde'), params.get('endde'))
+            page_rows = rows[(page_no - 1) * num_of_rows:page_no * num_of_rows]
+            items = [dataset.animal_item(row) for row in page_rows]
+            server.count('items', len(items))
+            self._send(200, *render(items, len(rows), page_no, num_of_rows))
+            return
+
+        if operation == 'sido_v2':
+            items = dataset.sido_items()
+        elif operation == 'sigungu_v2':
+            items = dataset.sigungu_items(params.get('upr_cd', ''))
+        elif operation == 'shelter_v2':
+            items = dataset.shelter_items(params.get('upr_cd', ''), params.get('org_cd', ''))
+        elif operation == 'kind_v2':
+            items = dataset.kind_items(params.get('up_kind_cd', ''))
+        else:
+            self._send(404, b'Not Found', 'text/plain')
+            return
+
+        if not items:
+            # 실제 API는 결과가 없으면 resultCode=03(NODATA_ERROR)을 돌려줍니다.
+            self._send(200, *render([], 0, page_no, num_of_rows, result_code='03', result_msg='NODATA_ERROR'))
+            return
+        if operation == 'shelter_v2' and not params.get('org_cd'):
+            page_items = items[(page_no - 1) * num_of_rows:page_no * num_of_rows]
+        else:
+            # 목록 조회는 페이지를 나누지 않습니다. (수집 코드가 numOfRows 없이 한 번만 요청)
+            page_no, num_of_rows, page_items = 1, len(items), items
+        server.count('items', len(page_items))
+        self._send(200, *render(page_items, len(items), page_no, num_of_rows))
+
+    def _kakao(self, params):
+        if not self.headers.get('Authorization', '').startswith('KakaoAK '):
+            self._send(401, json.dumps({'errorType': 'AccessDeniedError', 'message': 'cannot find appkey'}).encode('utf-8'),
+                       'application/json')
+            return
+        query = params.get('query', '')
+        coords = self.server.dataset.geocode(query)
+        documents = [] if coords is None else [{'address_name': query, 'y': f"{coords[0]:.6f}", 'x': f"{coords[1]:.6f}"}]
+        body = {'documents': documents, 'meta': {'total_count': len(documents), 'pageable_count': len(documents), 'is_end': True}}
+        self._send(200, json.dumps(body, ensure_ascii=False).encode('utf-8'), 'application/json;charset=UTF-8')
+
+
+class MockApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, dataset, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=0, verbose=False):
+        super().__init__(address, MockApiHandler)
+        self.dataset = dataset
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'errors': 0, 'items': 0}
+
+    def rng_uniform(self, low, high):
+        with self._lock:
+            return self._rng.uniform(low, high)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+
+    def stats_snapshot(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+def serve(args):
+    started = time.perf_counter()
+    dataset = MockDataset(args.animals, args.shelters, args.days, args.seed, geocode_miss_rate=args.geocode_miss_rate)
+    server = MockApiServer((args.host, args.port), dataset, args.latency_ms, args.jitter_ms, args.error_rate,
+                           args.seed, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"모의 데이터 생성 완료: 동물 {args.animals:,}건, 보호소 {args.shelters:,}곳 ({time.perf_counter() - started:.1f}초)")
+    print(f"모의 API 서버 실행 중: http://{host}:{port}")
+    print(f"  [API] base_url = http://{host}:{port}{SERVICE_PATH}")
+    print(f"  [API] kakao_base_url = http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def loadgen(args):
+    """동시 요청 수별로 유기동물 페이지 전체를 받아 처리량을 측정합니다."""
+    from api_client import ApiClient
+    from api_parser import parse_page
+
+    endpoint = f"{args.url.rstrip('/')}{SERVICE_PATH}/abandonmentPublic_v2"
+    params = {'serviceKey': 'mock', 'bgnde': args.bgnde, 'endde': args.endde, '_type': args.response_format,
+              'numOfRows': args.num_of_rows}
+
+    print(f"{'동시 요청':>8} {'페이지':>7} {'항목 수':>10} {'소요(초)':>9} {'요청/초':>8} {'항목/초':>10} {'실패':>5}")
+    for workers in args.workers:
+        client = ApiClient(pool_size=workers, max_workers=workers, rate_limit=0, timeout=args.timeout)
+        first = parse_page(client.get(endpoint, params={**params, 'pageNo': 1}).content)
+        total_pages = -(-first.total_count // args.num_of_rows)
+        if args.max_pages:
+            total_pages = min(total_pages, args.max_pages)
+
+        def fetch(page_no):
+            try:
+                return parse_page(client.get(endpoint, params={**params, 'pageNo': page_no}).content).num_items, False
+            except Exception:
+                return 0, True
+
+        started = time.perf_counter()
+        results = client.map(fetch, range(1, total_pages + 1))
+        elapsed = time.perf_counter() - started
+        items = sum(n for n, _ in results)
+        failures = sum(1 for _, failed in results if failed)
+        print(f"{workers:>8} {total_pages:>7,} {items:>10,} {elapsed:>9.2f} {total_pages / elapsed:>8.1f} "
+              f"{items / elapsed:>10,.0f} {failures:>5}")
+        client.close()
+
+
+def check_shelters(args):
+    """모의 서버에서 두 보호소 수집 전략의 결과(careRegNo 집합)와 실패 목록을 비교합니다."""
+    import update_data
+    from api_client import ApiClient
+
+    dataset = MockDataset(animals=0, shelters=args.shelters, seed=args.seed)
+    server = MockApiServer(('127.0.0.1', 0), dataset, seed=args.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}{SERVICE_PATH}"
+    # update_data는 가져올 때 config.ini로 엔드포인트를 정하므로, 모의 서버 주소로 바꿉니다.
+    update_data.SIDO_ENDPOINT = f"{base_url}/sido_v2"
+    update_data.SIGUNGU_ENDPOINT = f"{base_url}/sigungu_v2"
+    update_data.SHELTER_ENDPOINT = f"{base_url}/shelter_v2"
+
+    expected = {shelter['careRegNo'] for shelter in dataset.shelters}
+    results = {}
+    client = ApiClient(max_workers=8, rate_limit=0)
+    try:
+        for strategy in update_data.SHELTER_CRAWL_STRATEGIES:
+            failures = []
+            items = update_data.fetch_shelters('mock', client, strategy=strategy, failures=failures)
+            results[strategy] = ({item['careRegNo'] for item in items}, len(items), failures)
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+    ok = True
+    print(f"\n보호소 {len(expected):,}곳")
+    print(f"{'전략':<12} {'수집':>6} {'고유':>6} {'누락':>6} {'실패':>6}")
+    for strategy, (reg_nos, count, failures) in results.items():
+        missing = expected - reg_nos
+        ok = ok and not missing and reg_nos == expected and not failures
+        print(f"{strategy:<12} {count:>6,} {len(reg_nos):>6,} {len(missing):>6,} {len(failures):>6}")
+    same = len({frozenset(reg_nos) for reg_nos, _, _ in results.values()}) == 1
+    print(f"전략별 결과 일치: {same}")
+    if not (ok and same):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공공데이터포털/카카오 API 로컬 모의 서버")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="모의 서버 실행")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8089)
+    serve_parser.add_argument('--animals', type=int, default=100000, help="합성 동물 수")
+    serve_parser.add_argument('--shelters', type=int, default=1000, help="합성 보호소 수")
+    serve_parser.add_argument('--days', type=int, default=180, help="공고일 분포 기간(오늘 기준 과거 일수)")
+    serve_parser.add_argument('--seed', type=int, default=0)
+    serve_parser.add_argument('--latency-ms', type=float, default=0, help="응답마다 추가할 지연(ms)")
+    serve_parser.add_argument('--jitter-ms', type=float, default=0, help="지연에 더할 무작위 값의 최대치(ms)")
+    serve_parser.add_argument('--error-rate', type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    serve_parser.add_argument('--geocode-miss-rate', type=float, default=0.05, help="카카오 API가 빈 결과를 주는 주소 비율")
+    serve_parser.add_argument('--verbose', action='store_true', help="요청 로그 출력")
+    serve_parser.set_defaults(func=serve)
+
+    load_parser = subparsers.add_parser('loadgen', help="모의 서버에 부하를 주어 처리량 측정")
+    load_parser.add_argument('--url', default='http://127.0.0.1:8089')
+    load_parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16], help="비교할 동시 요청 수 목록")
+    load_parser.add_argument('--bgnde', default=(date.today() - timedelta(days=180)).strftime('%Y%m%d'))
+    load_parser.add_argument('--endde', default=date.today().strftime('%Y%m%d'))
+    load_parser.add_argument('--num-of-rows', type=int, default=1000)
+    load_parser.add_argument('--max-pages', type=int, default=0, help="측정할 최대 페이지 수 (0이면 전체)")
+    load_parser.add_argument('--response-format', choices=['json', 'xml'], default='json')
+    load_parser.add_argument('--timeout', type=float, default=30.0)
+    load_parser.set_defaults(func=loadgen)
+
+    check_parser = subparsers.add_parser('check-shelters', help="보호소 수집 전략별 결과 비교")
+    check_parser.add_argument('--shelters', type=int, default=300, help="합성 보호소 수")
+    check_parser.add_argument('--seed', type=int, default=0)
+    check_parser.set_defaults(func=check_shelters)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# ==============================================================================
+# benchmarks/synthetic_data.py - 벤치마크용 합성 데이터 생성
+# ==============================================================================
+# DB의 `animals` 테이블과 같은 컬럼 구성을 가진 합성 동물 데이터를 만듭니다.
+# 보호소별 동물 수는 실제처럼 일부 보호소에 몰리도록 치우친 분포를 사용합니다.
+# 지역 코드는 `make_region_table`의 합성 시/도·시/군/구 목록(구00 ~ 구24)으로 해석합니다.
+# ==============================================================================
+
+import numpy as np
+import pandas as pd
+
+SIDO_NAMES = ['서울특별시', '부산광역시', '대구광역시', '인천광역시', '광주광역시', '대전광역시', '울산광역시',
+              '세종특별자치시', '경기도', '강원특별자치도', '충청북도', '충청남도', '전북특별자치도', '전라남도',
+              '경상북도', '경상남도', '제주특별자치도']
+UPKINDS = ['개', '고양이', '기타']
+KINDS = {
+    '개': ['믹스견', '진도견', '말티즈', '푸들', '포메라니안', '시츄', '치와와', '요크셔 테리어', '비숑 프리제', '골든 리트리버'],
+    '고양이': ['한국 고양이', '코리안숏헤어', '페르시안', '러시안 블루', '스코티시폴드', '샴'],
+    '기타': ['기타축종', '토끼', '햄스터'],
+}
+DISTRICTS = 25
+PROCESS_STATES = ['보호중', '종료(입양)', '종료(반환)', '종료(자연사)', '종료(안락사)', '종료(방사)']
+
+
+def make_animals(rows: int, shelters: int = 1000, days: int = 180, seed: int = 0) -> pd.DataFrame:
+    """`animals` 테이블 형태의 합성 데이터프레임을 만듭니다."""
+    rng = np.random.default_rng(seed)
+
+    shelter_names = np.array([f'보호소{i:05d}' for i in range(shelters)], dtype=object)
+    shelter_sido = rng.integers(0, len(SIDO_NAMES), shelters)
+    shelter_addr = np.array([f'{SIDO_NAMES[s]} 구{i % DISTRICTS:02d} 동물보호로 {i}' for i, s in enumerate(shelter_sido)], dtype=object)
+    weights = 1.0 / np.arange(1, shelters + 1) ** 0.8
+    shelter_idx = rng.choice(shelters, size=rows, p=weights / weights.sum())
+
+    upkind_idx = rng.choice(len(UPKINDS), size=rows, p=[0.7, 0.25, 0.05])
+    upkind = np.array(UPKINDS, dtype=object)[upkind_idx]
+    kind_name = np.empty(rows, dtype=object)
+    for i, name in enumerate(UPKINDS):
+        mask = upkind_idx == i
+        kind_name[mask] = np.array(KINDS[name], dtype=object)[rng.integers(0, len(KINDS[name]), mask.sum())]
+    species = np.array([f'[{u}] {k}' for u, k in zip(upkind, kind_name)], dtype=object)
+
+    notice_date = pd.Timestamp.now().normalize() - pd.to_timedelta(rng.integers(0, days, rows), unit='D')
+    sex = np.array(['M', 'F', 'Q'], dtype=object)[rng.integers(0, 3, rows)]
+    process_state = np.array(PROCESS_STATES, dtype=object)[rng.choice(len(PROCESS_STATES), size=rows, p=[0.45, 0.25, 0.1, 0.1, 0.05, 0.05])]
+
+    return pd.DataFrame({
+        'desertion_no': np.char.add('4', np.arange(rows).astype(str).astype(object).astype(str)).astype(object),
+        'shelter_name': shelter_names[shelter_idx],
+        'animal_name': species + ' (' + sex + ')',
+        'species': species,
+        'kind_name': kind_name,
+        'age': np.char.add((2025 - rng.integers(0, 15, rows)).astype(str), '(년생)').astype(object),
+        'upkind_name': upkind,
+        'image_url': np.char.add('http://www.animal.go.kr/files/shelter/', np.arange(rows).astype(str)).astype(object),
+        'personality': '정보 없음',
+        'special_mark': '온순함',
+        'notice_date': notice_date,
+        'notice_no': np.char.add('공고-', np.arange(rows).astype(str)).astype(object),
+        'sex': sex,
+        'neuter': np.array(['Y', 'N', 'U'], dtype=object)[rng.integers(0, 3, rows)],
+        'color': np.array(['흰색', '검정', '갈색', '치즈', '삼색', '고등어'], dtype=object)[rng.integers(0, 6, rows)],
+        'weight': np.char.add(rng.integers(1, 30, rows).astype(str), '(Kg)').astype(object),
+        'care_tel': '02-000-0000',
+        'care_addr': shelter_addr[shelter_idx],
+        'happen_place': '도로변',
+        'process_state': process_state,
+    })
+
+
+def make_region_table():
+    """`sido_v2`/`sigungu_v2` 응답 형태의 합성 목록으로 `RegionTable`을 만듭니다."""
+    from region_codes import RegionTable
+
+    sido_list = [{'code': str(6100000 + i * 10000), 'name': name} for i, name in enumerate(SIDO_NAMES)]
+    sigungu_lists = {
+        sido['code']: [{'code': str(int(sido['code']) + 1000 + d), 'name': f'구{d:02d}'} for d in range(DISTRICTS)]
+        for sido in sido_list
+    }
+    return RegionTable(sido_list, sigungu_lists)
+
+
+def make_shelters(animals: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """합성 동물 데이터로 `shelters` 테이블 형태의 데이터프레임을 만듭니다. (좌표는 임의 값)"""
+    from shelter_aggregation import aggregate_shelters
+
+    rng = np.random.default_rng(seed)
+    shelters = aggregate_shelters(animals).rename(columns={'care_addr_animal': 'care_addr'})
+    shelters['lat'] = rng.uniform(33.1, 38.6, len(shelters))
+    shelters['lon'] = rng.uniform(124.6, 131.9, len(shelters))
+    shelters['geo_source'] = 'api'
+    return make_region_table().assign_codes(shelters)
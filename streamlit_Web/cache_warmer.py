@@ -0,0 +1,170 @@
+# ==============================================================================
+# cache_warmer.py - 자주 보는 화면의 캐시 예열
+# ==============================================================================
+# 배포 직후나 ETL 직후의 첫 방문자는 `init_db`, 시/도 목록, 두 테이블 전체 읽기,
+# 기본 필터(최근 30일, 전체 지역, 전체 축종)의 `get_filtered_data`, 대시보드 전처리,
+# 지도 생성을 모두 기다려야 했습니다.
+#
+# `CacheWarmer`는 데몬 스레드에서 같은 함수를 같은 인자로 미리 호출해 캐시를 채웁니다.
+# 방문자의 요청은 같은 캐시 키를 쓰므로 바로 캐시에서 응답합니다.
+#
+# [예열 순서] (`warm_caches`)
+# 1. `init_db`, `get_sido_list`
+# 2. `load_data('animals')`, `load_data('shelters')` ([FILTER] backend가 pandas/memory일 때.
+#    sql 방식은 화면이 두 테이블 전체를 읽지 않으므로 건너뜁니다.)
+# 3. 기본 필터의 `get_filtered_data` → 대시보드 전처리(`preprocess_for_dashboard`) → 지도 마커(`map_markers`)
+# 4. 기본 필터 결과에서 보호 동물이 많은 시/도 `top_sido`곳에 대해 3번 반복
+#
+# 단계마다 걸린 시간을 `[캐시 예열]`로 출력합니다. 한 단계가 실패해도 다음 단계를 계속합니다.
+#
+# [실행 시점]
+# - 프로세스의 첫 실행: `app.py`가 `start_cache_warmer()`를 호출합니다. Streamlit은 첫 세션이
+#   연결될 때 스크립트를 처음 실행하므로, 그 세션과 동시에 예열을 시작합니다.
+# - 새 데이터 버전: [DATA_VERSION] poll_seconds마다 화면에 내주는 데이터 버전을 확인하고,
+#   바뀌면(pandas/memory 방식은 새 스냅샷으로 교체된 뒤) 다시 예열합니다.
+#
+# [설정]
+# `config.ini`의 [CACHE_WARMER] 섹션(선택)
+#   enabled = true
+#   top_sido = 3      ; 기본 필터 외에 미리 계산할 시/도 수
+# ==============================================================================
+
+import configparser
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from data_manager import (DATA_TABLES, get_data_status, get_dataset, get_filtered_data, get_sido_list,
+                          init_db, load_data)
+from data_version import get_data_version_config
+from filter_query import get_filter_config
+from tabs.analysis_dashboard_view import preprocess_for_dashboard
+from tabs.map_view import map_cache_key, map_markers
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+
+# `app.init_session_state`의 기본 조회 기간과 같아야 합니다.
+DEFAULT_DAYS = 30
+
+
+def get_cache_warmer_config() -> dict:
+    """`config.ini`의 [CACHE_WARMER] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    warmer_config = {'enabled': True, 'top_sido': 3}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'CACHE_WARMER' in config:
+        section = config['CACHE_WARMER']
+        warmer_config['enabled'] = section.getboolean('enabled', warmer_config['enabled'])
+        warmer_config['top_sido'] = max(section.getint('top_sido', warmer_config['top_sido']), 0)
+    return warmer_config
+
+
+def _step(timings: list, name: str, func, *args):
+    """`func(*args)`를 실행하고 걸린 시간을 기록합니다. 실패하면 None을 반환합니다."""
+    started = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        print(f"경고: [캐시 예열] {name} 실패: {e}")
+        result = None
+    elapsed = time.perf_counter() - started
+    timings.append((name, elapsed))
+    print(f"[캐시 예열] {name}: {elapsed:.2f}초")
+    return result
+
+
+def _warm_filter(timings: list, label: str, start_date, end_date, sido_code):
+    data = _step(timings, f"{label} get_filtered_data", get_filtered_data, start_date, end_date, sido_code, None, [])
+    if data is None:
+        return None
+    final_animals, filtered_shelters = data[0], data[1]
+    if not final_animals.empty:
+        _step(timings, f"{label} 대시보드 전처리", preprocess_for_dashboard, final_animals)
+    if not filtered_shelters.empty:
+        map_key = map_cache_key(start_date, end_date, sido_code, None, [])
+        _step(timings, f"{label} 지도 마커", map_markers, map_key, filtered_shelters, final_animals)
+    return data
+
+
+def warm_caches(top_sido: int = 3) -> list:
+    """기본 화면과 상위 시/도 화면의 캐시를 채우고 [(단계, 초)]를 반환합니다."""
+    timings = []
+    started = time.perf_counter()
+    _step(timings, "init_db", init_db)
+    _step(timings, "get_sido_list", get_sido_list)
+    if get_filter_config()['backend'] != 'sql':
+        for table_name in DATA_TABLES:
+            _step(timings, f"load_data('{table_name}')", load_data, table_name)
+
+    end_date = datetime.now().date()
+    start_date = (datetime.now() - timedelta(days=DEFAULT_DAYS)).date()
+    data = _warm_filter(timings, "기본 필터", start_date, end_date, None)
+
+    # 기본 필터 결과에서 보호 동물이 많은 시/도
+    if data is not None and top_sido and not data[1].empty and 'sido_code' in data[1].columns:
+        counts = data[1].groupby('sido_code', observed=True)['count'].sum().sort_values(ascending=False)
+        for sido_code in counts.index[:top_sido]:
+            _warm_filter(timings, f"시/도 {int(sido_code)}", start_date, end_date, int(sido_code))
+
+    print(f"[캐시 예열] 완료: {len(timings)}단계, {time.perf_counter() - started:.2f}초")
+    return timings
+
+
+def served_version() -> int | None:
+    """화면에 내주는 데이터 버전. (pandas/memory 방식은 새 버전 확인과 백그라운드 준비도 함께 시작)"""
+    if get_filter_config()['backend'] != 'sql':
+        get_dataset()
+    return get_data_status()['version']
+
+
+class CacheWarmer:
+    """`current_version()`이 바뀔 때마다 `warm()`을 실행하는 데몬 스레드입니다. (프로세스당 하나)"""
+
+    def __init__(self, warm, current_version, poll_seconds: float = 30):
+        self.warm = warm
+        self.current_version = current_version
+        self.poll_seconds = poll_seconds
+        self.warmed_version = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                version = self.current_version()
+                if version is not None and version != self.warmed_version:
+                    print(f"[캐시 예열] 데이터 버전 {version}")
+                    self.warm()
+                    self.warmed_version = version
+            except Exception as e:
+                print(f"경고: [캐시 예열] 실패: {e}")
+            self._stop.wait(self.poll_seconds)
+
+
+@st.cache_resource
+def start_cache_warmer() -> CacheWarmer | None:
+    """프로세스의 캐시 예열 스레드를 한 번만 시작합니다. ([CACHE_WARMER] enabled = false이면 None)"""
+    warmer_config = get_cache_warmer_config()
+    if not warmer_config['enabled']:
+        return None
+    warmer = CacheWarmer(lambda: warm_caches(warmer_config['top_sido']), served_version,
+                         get_data_version_config()['poll_seconds'])
+    warmer.start()
+    return warmer
@@ -0,0 +1,157 @@
+# ==============================================================================
+# checkpoints.py - 수집(crawl) 단계 체크포인트
+# ==============================================================================
+# `update_data.py`가 받은 유기동물 페이지와 시/군구별 보호소 목록을 로컬 디스크에
+# 저장해 두고, 실행이 중간에 실패하거나 중단되었을 때 `--resume`으로 다시 실행하면
+# 저장된 부분은 API를 다시 호출하지 않고 이어서 수집하도록 합니다.
+#
+# [저장 구조]
+#   <체크포인트 폴더>/manifest.json          ; 실행 조건(params), 시작 시각, 상태(state)
+#   <체크포인트 폴더>/<스트림>/<키>.json      ; 예: animals_417000/page_00012.json
+#
+# - 실행 조건(수집 기간, 모드 등)이 다른 체크포인트는 이어서 쓰지 않고 새로 시작합니다.
+# - DB 적재가 성공하면 체크포인트를 지웁니다. (`clear()`)
+# - 지울 때는 체크포인트가 쓴 파일(`manifest.json`과 manifest에 기록된 스트림 폴더의 .json 파일)만
+#   지웁니다. `manifest.json`이 없는데 비어 있지 않은 폴더는 잘못 지정한 폴더로 보고 사용하지 않습니다.
+# ==============================================================================
+
+import json
+import os
+import threading
+from datetime import datetime
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+DEFAULT_CHECKPOINT_DIR = os.path.join(streamlit_web_dir, 'data', 'checkpoints', 'etl')
+
+
+def _write_json(path: str, value):
+    """임시 파일에 쓴 뒤 교체하여, 중간에 중단되어도 깨진 파일이 남지 않게 합니다."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class CheckpointStream:
+    """하나의 수집 단위(예: 축종별 유기동물 페이지)의 키별 저장소입니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def load(self, key):
+        """저장된 값을 반환합니다. 없으면 None을 반환합니다."""
+        try:
+            with open(self._file(key), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key, value):
+        _write_json(self._file(key), value)
+
+    def child(self, name: str) -> 'CheckpointStream':
+        """하위 저장소를 반환합니다. (예: 시/도별 페이지)"""
+        return CheckpointStream(os.path.join(self.path, name))
+
+
+class CrawlCheckpoint:
+    """한 번의 ETL 실행에 대한 체크포인트입니다."""
+
+    def __init__(self, path: str, params: dict, resume: bool = False):
+        self.path = path
+        self.params = params
+        self.resumed = False
+        manifest_path = os.path.join(path, 'manifest.json')
+
+        if (os.path.isdir(path) and os.listdir(path) and not os.path.exists(manifest_path)):
+            raise ValueError(f"체크포인트 폴더가 아닌 폴더입니다 (manifest.json 없음): {path}. "
+                             "비어 있는 폴더나 새 폴더를 --checkpoint-dir로 지정하세요.")
+
+        manifest = None
+        if resume and os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('params') != params:
+                print(f"경고: 체크포인트의 실행 조건이 다릅니다. 새로 수집합니다. (저장된 조건: {manifest.get('params')})")
+                manifest = None
+        elif resume:
+            print("정보: 이어서 수집할 체크포인트가 없습니다. 처음부터 수집합니다.")
+
+        if manifest is None:
+            self._remove_files()
+            os.makedirs(path, exist_ok=True)
+            manifest = {'params': params, 'started_at': datetime.now().isoformat(timespec='seconds'),
+                        'state': {}, 'streams': []}
+            _write_json(manifest_path, manifest)
+        else:
+            self.resumed = True
+            print(f"체크포인트에서 이어서 수집합니다. (시작 시각: {manifest['started_at']}, 폴더: {path})")
+
+        self._manifest_path = manifest_path
+        self._manifest = manifest
+        self._lock = threading.Lock()
+
+    def stream(self, name: str) -> CheckpointStream:
+        # 지울 때 이 폴더만 지우도록 manifest에 기록합니다.
+        with self._lock:
+            streams = self._manifest.setdefault('streams', [])
+            if name not in streams:
+                streams.append(name)
+                _write_json(self._manifest_path, self._manifest)
+        return CheckpointStream(os.path.join(self.path, name))
+
+    def get_state(self, key, default=None):
+        with self._lock:
+            return self._manifest['state'].get(key, default)
+
+    def set_state(self, key, value):
+        with self._lock:
+            self._manifest['state'][key] = value
+            _write_json(self._manifest_path, self._manifest)
+
+    def clear(self):
+        """수집과 적재가 끝난 체크포인트를 지웁니다."""
+        self._remove_files()
+
+    def _remove_files(self):
+        """`manifest.json`과 manifest에 기록된 스트림 폴더의 .json 파일만 지우고, 비게 된 폴더를 지웁니다."""
+        manifest_path = os.path.join(self.path, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                streams = json.load(f).get('streams')
+        except (OSError, ValueError):
+            streams = None
+        if streams is None:
+            # 스트림 목록을 기록하기 전의 체크포인트: .json 파일만 든 하위 폴더를 스트림으로 봅니다.
+            streams = [name for name in os.listdir(self.path)
+                       if os.path.isdir(os.path.join(self.path, name)) and _only_json(os.path.join(self.path, name))]
+        for name in streams:
+            stream_path = os.path.join(self.path, name)
+            if not os.path.isdir(stream_path):
+                continue
+            for root, _, files in os.walk(stream_path, topdown=False):
+                for file_name in files:
+                    if file_name.endswith(('.json', '.tmp')):
+                        os.remove(os.path.join(root, file_name))
+                _remove_if_empty(root)
+        os.remove(manifest_path)
+        _remove_if_empty(self.path)
+
+
+def _only_json(path: str) -> bool:
+    return all(name.endswith(('.json', '.tmp')) for _, _, files in os.walk(path) for name in files)
+
+
+def _remove_if_empty(path: str):
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
@@ -4,13 +4,20 @@ import pandas as pd
 import streamlit as st
 import configparser
 import os
-from sqlalchemy import create_engine, text
-import xml.etree.ElementTree as ET
-from urllib.parse import quote
-import subprocess
-import tempfile
+from sqlalchemy import bindparam, text
 from datetime import date
 from typing import List, Tuple
+from schema import apply_frame_dtypes
+from filter_query import FilterKey, filter_frames, get_filter_config, query_filtered_data
+from filter_engine import FilterEngine
+from region_codes import parse_code
+from data_version import VersionPoller, get_data_version_config
+from data_plane import DataPlane
+from dataset_loader import BackgroundLoader, DatasetSnapshot
+from db_engine import get_engine, start_pool_stats_logger
+from reference_data import ReferenceData
+from result_cache import ResultCache
+from table_reader import read_table
 
 # --- 경로 및 설정 로드 ---
 current_script_path = os.path.abspath(__file__)
@@ -29,17 +36,16 @@ def get_config():
 # --- DB 및 API 클라이언트 ---
 @st.cache_resource
 def get_db_engine():
+    """공용 DB 엔진(연결 풀)을 한 번 연결해 확인한 뒤 반환합니다. (db_engine.py 참고)"""
     config = get_config()
     if not config or 'DB' not in config:
         st.error("DB 설정이 올바르지 않습니다.")
         return None
-    db_config = config['DB']
     try:
-        engine = create_engine(
-            f"mysql+mysqlconnector://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config.get('port', 3306)}/{db_config['database']}"
-        )
+        engine = get_engine()
         with engine.connect() as _: 
             pass
+        start_pool_stats_logger()
         return engine
     except Exception as e:
         st.error(f"DB 연결에 실패했습니다: {e}")
@@ -52,72 +58,43 @@ def get_api_key():
         return None
     return config['API']['service_key']
 
-def fetch_api_data_powershell(url: str) -> ET.Element | None:
-    fp, temp_path = tempfile.mkstemp(suffix=".xml")
-    os.close(fp)
-    try:
-        command = f"powershell -Command \"(New-Object System.Net.WebClient).DownloadFile('{url}', '{temp_path}')\""
-        subprocess.run(command, check=True, shell=True, capture_output=True, text=True)
-        with open(temp_path, 'rb') as f:
-            xml_data = f.read()
-        if not xml_data:
-            return None
-        return ET.fromstring(xml_data)
-    except subprocess.CalledProcessError as e:
-        st.warning(f"PowerShell을 통한 데이터 다운로드 중 오류 발생: {e.stderr}")
-        return None
-    except Exception as e:
-        st.warning(f"API 데이터 처리 중 알 수 없는 오류 발생: {e}")
-        return None
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+# --- 코드 목록 (reference_data.py 참고) ---
+@st.cache_resource
+def get_reference_data() -> ReferenceData | None:
+    """로컬 파일에 저장된 코드 목록을 읽고 백그라운드 갱신 스레드를 시작합니다. (프로세스당 한 번)"""
+    api_key = get_api_key()
+    if not api_key: return None
+    reference_data = ReferenceData.from_config(api_key)
+    reference_data.start()
+    return reference_data
 
-@st.cache_data
 def get_sido_list() -> List[dict]:
-    api_key = get_api_key()
-    if not api_key: return []
-    encoded_key = quote(api_key, safe='/')
-    endpoint = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2/sido_v2"
-    url = f"{endpoint}?serviceKey={encoded_key}&numOfRows=100&_type=xml"
-    root = fetch_api_data_powershell(url)
-    if root is None: return []
-    return [{"code": item.findtext("orgCd"), "name": item.findtext("orgdownNm")} for item in root.findall('.//item')]
+    reference_data = get_reference_data()
+    return reference_data.get('sido') if reference_data else []
 
-@st.cache_data
 def get_sigungu_list(sido_code: str) -> List[dict]:
     if not sido_code: return []
-    api_key = get_api_key()
-    if not api_key: return []
-    encoded_key = quote(api_key, safe='/')
-    endpoint = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2/sigungu_v2"
-    url = f"{endpoint}?serviceKey={encoded_key}&upr_cd={sido_code}&_type=xml"
-    root = fetch_api_data_powershell(url)
-    if root is None: return []
-    return [{"code": item.findtext("orgCd"), "name": item.findtext("orgdownNm")} for item in root.findall('.//item')]
+    reference_data = get_reference_data()
+    return reference_data.get(f"sigungu_{sido_code}") if reference_data else []
+
+def get_region_codes(sido_name: str, sigungu_name: str) -> Tuple[int | None, int | None]:
+    """사이드바에서 고른 시/도·시/군/구 이름을 `shelters`의 정수 코드로 바꿉니다. ("전체"는 None)"""
+    if not sido_name or sido_name == "전체":
+        return None, None
+    sido_code = next((s['code'] for s in get_sido_list() if s['name'] == sido_name), None)
+    if sido_code is None:
+        return None, None
+    sigungu_code = None
+    if sigungu_name and sigungu_name != "전체":
+        sigungu_code = next((s['code'] for s in get_sigungu_list(sido_code) if s['name'] == sigungu_name), None)
+    # 하위 목록이 없는 시/도(예: 세종)는 시/도 자신이 시/군구로 조회되므로 시/도 조건만 적용합니다.
+    if sigungu_code == sido_code:
+        sigungu_code = None
+    return parse_code(sido_code), parse_code(sigungu_code)
 
-@st.cache_data
 def get_kind_list(upkind_code: str = '') -> List[dict]:
-    api_key = get_api_key()
-    if not api_key: return []
-    encoded_key = quote(api_key, safe='/')
-    endpoint = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2/kind_v2"
-    codes_to_fetch = [upkind_code] if upkind_code else ['417000', '422400', '429900']
-    all_kinds = []
-    for code in codes_to_fetch:
-        page_no = 1
-        while True:
-            url = f"{endpoint}?serviceKey={encoded_key}&up_kind_cd={code}&pageNo={page_no}&numOfRows=1000&_type=xml"
-            root = fetch_api_data_powershell(url)
-            if root is None or root.find('.//resultCode').text != '00': break
-            items_in_page = root.findall('.//item')
-            if not items_in_page: break
-            for item in items_in_page:
-                all_kinds.append({"code": item.findtext("kindCd"), "name": item.findtext("kindNm")})
-            total_count = int(root.find('.//totalCount').text)
-            if len(all_kinds) >= total_count: break
-            page_no += 1
-    return list({v['code']:v for v in all_kinds}.values())
+    reference_data = get_reference_data()
+    return reference_data.get(f"kind_{upkind_code}") if reference_data else []
 
 def init_db():
     engine = get_db_engine()
@@ -132,58 +109,209 @@ def init_db():
     except Exception as e:
         st.error(f"DB 초기화 중 오류 발생: {e}")
 
+# --- 데이터 버전 (data_version.py 참고) ---
+# 아래 데이터 캐시는 모두 테이블의 데이터 버전을 캐시 키에 포함합니다. ETL이 새 버전을 기록하면
+# 재시작 없이 다음 요청부터 새 데이터를 읽고, 이전 버전의 항목은 `_evict_stale_caches`가 비웁니다.
+DATA_TABLES = ['animals', 'shelters']
+
+@st.cache_resource
+def get_version_poller() -> VersionPoller | None:
+    engine = get_db_engine()
+    if engine is None: return None
+    return VersionPoller(engine, get_data_version_config()['poll_seconds'], on_change=_evict_stale_caches)
+
+def get_data_version(tables: List[str] | None = None) -> int:
+    """`tables`(기본값: `animals`, `shelters`)의 현재 데이터 버전. 확인 주기는 [DATA_VERSION] poll_seconds입니다."""
+    poller = get_version_poller()
+    return poller.version(tables or DATA_TABLES) if poller else 0
+
+def _evict_stale_caches(changed_tables: List[str]):
+    """
+    데이터 버전이 바뀐 테이블을 읽는 캐시를 비웁니다. (새 버전 항목은 다음 요청에서 채워집니다.)
+    `animals`/`shelters` 전체와 필터 색인은 비우지 않고, `get_dataset`이 새 버전을 백그라운드에서 준비해 교체합니다.
+    """
+    if set(changed_tables) & set(DATA_TABLES):
+        for cached in (_load_table, _load_shelter_animals, _load_animals_by_ids):
+            cached.clear()
+        get_result_cache().clear()
+
+def _fetch_table(engine, table_name: str) -> pd.DataFrame:
+    """테이블 전체를 읽어 타입을 맞춥니다. 실패하면 예외를 그대로 올립니다."""
+    with engine.connect() as conn:
+        # [TABLE_READER] mode에 따라 나눠 읽기(기본값) 또는 한 번에 읽기 (table_reader.py 참고)
+        data = read_table(conn, table_name)
+    if table_name == 'shelters':
+        data['lat'] = pd.to_numeric(data['lat'], errors='coerce')
+        data['lon'] = pd.to_numeric(data['lon'], errors='coerce')
+    # 값의 종류가 적은 컬럼은 category, 나머지 문자열은 Arrow 문자열로 (schema.py 참고)
+    return apply_frame_dtypes(data, table_name)
+
 @st.cache_data
+def _load_table(table_name: str, data_version: int) -> pd.DataFrame:
+    engine = get_db_engine()
+    if engine is None: return pd.DataFrame()
+    try:
+        return _fetch_table(engine, table_name)
+    except Exception as e:
+        st.warning(f"'{table_name}' 테이블 로딩 중 오류: {e}. 빈 데이터를 반환합니다.")
+        return pd.DataFrame()
+
+@st.cache_resource
+def get_data_plane() -> DataPlane | None:
+    return DataPlane.from_config()
+
+@st.cache_resource
+def get_dataset_loader() -> BackgroundLoader:
+    engine, plane, result_cache = get_db_engine(), get_data_plane(), get_result_cache()
+    use_filter_engine = get_filter_config()['backend'] == 'memory'
+
+    def build(data_version: int):
+        # 요청 경로 밖(백그라운드 스레드)에서 실행되므로 st.* 대신 예외로 실패를 알립니다.
+        if engine is None:
+            raise RuntimeError("DB 엔진을 초기화할 수 없습니다.")
+        frames = {}
+        for table_name in DATA_TABLES:
+            read = lambda table_name=table_name: _fetch_table(engine, table_name)
+            if plane is not None and data_version > 0:
+                frames[table_name] = plane.load_or_publish(table_name, data_version, read)
+            else:
+                frames[table_name] = read()
+        animals, shelters = frames['animals'], frames['shelters']
+        if not use_filter_engine or animals.empty or shelters.empty:
+            return frames, None
+        return frames, FilterEngine(animals, shelters)
+
+    # 새 스냅샷으로 바뀌면 이전 스냅샷으로 계산한 필터 결과는 다시 쓰지 않습니다.
+    return BackgroundLoader(build, on_swap=lambda snapshot: result_cache.clear())
+
+def get_dataset() -> DatasetSnapshot | None:
+    """
+    `animals`, `shelters` 전체와 필터 색인([FILTER] backend = memory일 때)을 담은 스냅샷을 반환합니다.
+    새 데이터 버전은 백그라운드에서 준비하고, 준비될 때까지 이전 버전을 반환합니다. (dataset_loader.py 참고)
+    처음 실행할 때만 준비를 기다리며, 준비하지 못하면 None을 반환합니다.
+    """
+    poller = get_version_poller()
+    if poller is None: return None
+    data_version, loaded_at = poller.latest(DATA_TABLES)
+    return get_dataset_loader().get(data_version, loaded_at)
+
+def get_data_status() -> dict:
+    """
+    화면에 표시할 데이터 기준. {'version', 'loaded_at'(ETL 적재 시각), 'refreshing'(준비 중인 새 버전 또는 None)}
+    [FILTER] backend = sql이면 조회마다 DB를 읽으므로 최신 버전을, 아니면 지금 내주는 스냅샷의 버전을 반환합니다.
+    """
+    if get_filter_config()['backend'] == 'sql':
+        poller = get_version_poller()
+        data_version, loaded_at = poller.latest(DATA_TABLES) if poller else (0, None)
+        return {'version': data_version, 'loaded_at': loaded_at, 'refreshing': None}
+    return get_dataset_loader().status()
+
+def is_first_load() -> bool:
+    """
+    아직 내줄 데이터 스냅샷이 없어 이번 요청이 준비를 기다려야 하는지 여부. (스피너 표시용)
+    [FILTER] backend = sql이면 미리 준비하는 데이터가 없으므로 항상 False입니다.
+    """
+    if get_filter_config()['backend'] == 'sql':
+        return False
+    return get_dataset_loader().status()['version'] is None
+
 def load_data(table_name: str) -> pd.DataFrame:
+    """
+    테이블 전체를 읽습니다. `animals`/`shelters`는 `get_dataset`의 스냅샷을, 그 밖의 테이블은 현재 데이터 버전의 캐시를 씁니다.
+    [DATA_PLANE]을 켜면 세션마다 복사하지 않고, 모든 프로세스가 버전별 Arrow 파일을 매핑해 공유합니다. (data_plane.py 참고)
+    """
+    if table_name in DATA_TABLES:
+        dataset = get_dataset()
+        return dataset.frames[table_name].copy(deep=False) if dataset is not None else pd.DataFrame()
+    return _load_table(table_name, get_data_version([table_name]))
+
+def _read_animals(query, params: dict) -> pd.DataFrame:
+    """`animals` 테이블에서 조건에 맞는 행만 읽습니다. (인덱스를 사용하는 조회)"""
     engine = get_db_engine()
     if engine is None: return pd.DataFrame()
     try:
         with engine.connect() as conn:
-            data = pd.read_sql(f"SELECT * FROM {table_name}", conn)
-            if table_name == 'shelters':
-                data['lat'] = pd.to_numeric(data['lat'], errors='coerce')
-                data['lon'] = pd.to_numeric(data['lon'], errors='coerce')
-            return data
+            return apply_frame_dtypes(pd.read_sql(query, conn, params=params), 'animals')
     except Exception as e:
-        st.warning(f"'{table_name}' 테이블 로딩 중 오류: {e}. 빈 데이터를 반환합니다.")
+        st.warning(f"'animals' 테이블 조회 중 오류: {e}. 빈 데이터를 반환합니다.")
         return pd.DataFrame()
 
 @st.cache_data
+def _load_shelter_animals(shelter_name: str, data_version: int) -> pd.DataFrame:
+    return _read_animals(text("SELECT * FROM animals WHERE shelter_name = :shelter_name"),
+                         {'shelter_name': shelter_name})
+
+def load_shelter_animals(shelter_name: str) -> pd.DataFrame:
+    """보호소 한 곳의 동물을 `(shelter_name, notice_date)` 인덱스로 조회합니다."""
+    if not shelter_name: return pd.DataFrame()
+    return _load_shelter_animals(shelter_name, get_data_version(['animals']))
+
+@st.cache_data
+def _load_animals_by_ids(desertion_nos: List[str], data_version: int) -> pd.DataFrame:
+    query = text("SELECT * FROM animals WHERE desertion_no IN :ids").bindparams(bindparam('ids', expanding=True))
+    return _read_animals(query, {'ids': list(desertion_nos)})
+
+def load_animals_by_ids(desertion_nos: List[str]) -> pd.DataFrame:
+    """유기번호 목록에 해당하는 동물을 기본 키(`desertion_no`)로 조회합니다."""
+    if not desertion_nos: return pd.DataFrame()
+    return _load_animals_by_ids(desertion_nos, get_data_version(['animals']))
+
 def get_filtered_data(
     start_date: date, 
     end_date: date, 
-    sido: str, 
-    sigungu: str, 
+    sido_code: int | None, 
+    sigungu_code: int | None, 
     species: List[str]
 ) -> Tuple[pd.DataFrame, pd.DataFrame, int, int, int, int]:
-    animals = load_data("animals")
-    shelters = load_data("shelters")
-
-    if animals.empty or shelters.empty:
+    """
+    사이드바 필터에 맞는 (동물, 보호소, KPI 4종)을 반환합니다. 방식은 [FILTER] backend 설정을 따릅니다. (기본값: sql)
+    지역은 `get_region_codes`로 바꾼 정수 코드로 받습니다. (None이면 조건 없음)
+    결과는 메모리 예산이 있는 LRU 캐시(`get_result_cache`)에 데이터 버전, 조회 방식과 함께 키로 저장합니다.
+    (pandas, memory 방식은 새 버전을 준비하는 동안 지금 내주는 `get_dataset` 스냅샷의 버전)
+    조건을 좁힌 요청(짧은 기간, 시/도 안의 시/군/구, 일부 축종)은 캐시된 더 넓은 결과를 다시 걸러 계산합니다.
+    조회에 실패하면 경고와 함께 빈 결과를 반환하고, 캐시하지 않아 다음 요청에서 다시 조회합니다.
+    """
+    backend = get_filter_config()['backend']
+    dataset = get_dataset() if backend != 'sql' else None
+    data_version = dataset.version if dataset is not None else get_data_version()
+    key = FilterKey(start_date, end_date, sido_code, sigungu_code, tuple(sorted(species or [])), data_version, backend)
+    try:
+        return get_result_cache().get_or_compute(
+            key,
+            compute=lambda: _query_filtered_data(start_date, end_date, sido_code, sigungu_code, species, backend, dataset),
+            derive=lambda cached: filter_frames(cached[0], cached[1], start_date, end_date, sido_code, sigungu_code, species))
+    except Exception as e:
+        st.warning(f"필터 조회 중 오류: {e}. 빈 데이터를 반환합니다.")
         return pd.DataFrame(), pd.DataFrame(), 0, 0, 0, 0
 
-    animals['notice_date'] = pd.to_datetime(animals['notice_date'])
-    mask = (animals['notice_date'].dt.date >= start_date) & (animals['notice_date'].dt.date <= end_date)
-    filtered_animals = animals[mask]
-
-    if species:
-        filtered_animals = filtered_animals[filtered_animals['upkind_name'].isin(species)]
-
-    shelter_names_with_animals = filtered_animals['shelter_name'].unique()
-    filtered_shelters = shelters[shelters['shelter_name'].isin(shelter_names_with_animals)]
-
-    addr_col = "care_addr" if "care_addr" in filtered_shelters.columns else "careAddr"
-    if sido != "전체":
-        filtered_shelters = filtered_shelters[filtered_shelters[addr_col].str.startswith(sido, na=False)]
-    if sigungu != "전체":
-        full_region_name = f"{sido} {sigungu}"
-        filtered_shelters = filtered_shelters[filtered_shelters[addr_col].str.startswith(full_region_name, na=False)]
-
-    final_animal_shelters = filtered_shelters['shelter_name'].unique()
-    final_animals = filtered_animals[filtered_animals['shelter_name'].isin(final_animal_shelters)]
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """필터 결과 캐시 (프로세스당 하나, [RESULT_CACHE] max_mb). `stats()`로 항목 수/바이트/적중/제거 횟수를 확인합니다."""
+    return ResultCache.from_config()
 
-    shelter_count = filtered_shelters['shelter_name'].nunique()
-    animal_count = len(final_animals)
-    long_term_count = int(filtered_shelters['long_term'].sum())
-    adopted_count = int(filtered_shelters['adopted'].sum())
+def _query_filtered_data(
+    start_date: date, 
+    end_date: date, 
+    sido_code: int | None, 
+    sigungu_code: int | None, 
+    species: List[str],
+    backend: str,
+    dataset: DatasetSnapshot | None = None
+) -> Tuple[pd.DataFrame, pd.DataFrame, int, int, int, int]:
+    """필터 결과를 새로 계산합니다. 데이터를 준비하지 못했거나 조회에 실패하면 예외를 냅니다. (결과 캐시에 저장하지 않도록)"""
+    if backend in ('pandas', 'memory'):
+        # 한 요청 안에서는 같은 스냅샷만 씁니다. (계산 도중 새 버전으로 바뀌어도 섞이지 않음)
+        if dataset is None:
+            raise RuntimeError("데이터를 아직 준비하지 못했습니다")
+        if backend == 'pandas':
+            return filter_frames(dataset.frames['animals'], dataset.frames['shelters'],
+                                 start_date, end_date, sido_code, sigungu_code, species)
+        # 색인이 없으면 테이블이 비어 있는 버전입니다. (실패가 아니므로 빈 결과를 캐시해도 됨)
+        if dataset.filter_engine is None: return pd.DataFrame(), pd.DataFrame(), 0, 0, 0, 0
+        return dataset.filter_engine.filter(start_date, end_date, sido_code, sigungu_code, species)
 
-    return final_animals, filtered_shelters, shelter_count, animal_count, long_term_count, adopted_count
+    engine = get_db_engine()
+    if engine is None:
+        raise RuntimeError("DB 엔진을 초기화할 수 없습니다")
+    with engine.connect() as conn:
+        return query_filtered_data(conn, start_date, end_date, sido_code, sigungu_code, species)
@@ -0,0 +1,149 @@
+# ==============================================================================
+# data_plane.py - 데이터 버전별 Arrow 파일 공유 (메모리 매핑)
+# ==============================================================================
+# Streamlit 서버 프로세스를 여러 개 띄우면, 프로세스마다 `load_data`로 읽은
+# `animals`/`shelters` 데이터프레임을 따로 들고 있고, `st.cache_data`는 꺼낼 때마다
+# 세션별 복사본을 또 만듭니다. 메모리가 (프로세스 수 × 세션 수)만큼 늘어납니다.
+#
+# [DATA_PLANE] enabled = true이면, 데이터 버전마다 테이블을 한 번만 Arrow IPC 파일
+# (`<table>-v<version>.arrow`, 압축 없음)로 저장하고 모든 프로세스와 세션이 이 파일을
+# 읽기 전용으로 메모리 매핑합니다.
+#
+# - **게시:** 어떤 프로세스든 그 버전의 파일이 없으면 DB에서 읽어 임시 파일에 쓴 뒤
+#   이름을 바꿔(`os.replace`) 게시합니다. 읽는 쪽은 완성된 파일만 봅니다.
+# - **매핑:** 문자열 컬럼(Arrow 문자열)은 파일의 페이지를 그대로 가리키므로 복사본이 생기지 않고,
+#   운영체제의 페이지 캐시를 모든 프로세스가 함께 씁니다. category 코드와 날짜 컬럼만
+#   프로세스마다 작은 배열로 만들어집니다.
+# - **정리:** 게시할 때 같은 테이블의 최근 `keep_versions`개보다 오래된 파일을 지웁니다.
+#   (이미 매핑한 프로세스는 계속 읽을 수 있습니다. 지우지 못한 파일은 다음 게시 때 다시 시도)
+#
+# pyarrow가 없으면 이 기능은 꺼지고, 기존처럼 프로세스마다 DB에서 읽습니다.
+# 메모리 비교는 `benchmarks/bench_data_plane.py`를 참고하세요.
+#
+# [설정]
+# `config.ini`의 [DATA_PLANE] 섹션(선택)
+#   enabled = false
+#   path = streamlit_Web/data/data_plane
+#   keep_versions = 2
+# ==============================================================================
+
+import configparser
+import glob
+import os
+import re
+import time
+
+import pandas as pd
+
+from schema import STRING_DTYPE
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+DEFAULT_PLANE_PATH = os.path.join(streamlit_web_dir, 'data', 'data_plane')
+
+
+def get_data_plane_config() -> dict:
+    """`config.ini`의 [DATA_PLANE] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    plane_config = {'enabled': False, 'path': DEFAULT_PLANE_PATH, 'keep_versions': 2}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'DATA_PLANE' in config:
+        section = config['DATA_PLANE']
+        plane_config['enabled'] = section.getboolean('enabled', plane_config['enabled'])
+        path = section.get('path')
+        if path:
+            plane_config['path'] = path if os.path.isabs(path) else os.path.join(project_root, path)
+        plane_config['keep_versions'] = max(section.getint('keep_versions', plane_config['keep_versions']), 1)
+    if plane_config['enabled'] and pa is None:
+        print("경고: pyarrow가 설치되어 있지 않아 [DATA_PLANE]을 사용하지 않습니다.")
+        plane_config['enabled'] = False
+    return plane_config
+
+
+def _string_types(arrow_type):
+    # Arrow 문자열은 `schema.STRING_DTYPE`(string[pyarrow_numpy])로 감싸 복사 없이 읽습니다.
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return STRING_DTYPE
+    return None
+
+
+class DataPlane:
+    """데이터 버전별 테이블을 Arrow IPC 파일로 게시하고 메모리 매핑으로 읽습니다."""
+
+    def __init__(self, path: str, keep_versions: int = 2):
+        self.path = path
+        self.keep_versions = keep_versions
+        os.makedirs(path, exist_ok=True)
+
+    @classmethod
+    def from_config(cls):
+        """[DATA_PLANE] enabled = true이고 pyarrow가 있으면 `DataPlane`을, 아니면 None을 반환합니다."""
+        plane_config = get_data_plane_config()
+        if not plane_config['enabled']:
+            return None
+        return cls(plane_config['path'], plane_config['keep_versions'])
+
+    def file_path(self, table: str, version: int) -> str:
+        return os.path.join(self.path, f"{table}-v{version}.arrow")
+
+    def open(self, table: str, version: int) -> pd.DataFrame | None:
+        """게시된 파일을 메모리 매핑하여 데이터프레임으로 반환합니다. 파일이 없으면 None."""
+        path = self.file_path(table, version)
+        if not os.path.exists(path):
+            return None
+        arrow_table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        return arrow_table.to_pandas(types_mapper=_string_types, split_blocks=True)
+
+    def publish(self, table: str, version: int, df: pd.DataFrame) -> str:
+        """데이터프레임을 `<table>-v<version>.arrow`로 게시하고 오래된 버전 파일을 지웁니다."""
+        started = time.perf_counter()
+        path = self.file_path(table, version)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
+        os.replace(tmp_path, path)
+        print(f"[데이터 공유] {table} v{version} 게시: {len(df):,}행, "
+              f"{os.path.getsize(path) / 1024 / 1024:.1f}MB ({time.perf_counter() - started:.2f}초)")
+        self._remove_old_versions(table, version)
+        return path
+
+    def _remove_old_versions(self, table: str, version: int):
+        pattern = re.compile(rf"^{re.escape(table)}-v(\d+)\.arrow$")
+        versions = sorted((int(m.group(1)), name) for name in os.listdir(self.path) if (m := pattern.match(name)))
+        for old_version, name in versions[:-self.keep_versions]:
+            if old_version >= version:
+                continue
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                # Windows에서는 매핑 중인 파일을 지울 수 없으므로 다음 게시 때 다시 시도합니다.
+                pass
+        # 게시 도중 중단된 임시 파일
+        for tmp_path in glob.glob(os.path.join(self.path, f"{glob.escape(table)}-v*.arrow.*.tmp")):
+            if time.time() - os.path.getmtime(tmp_path) > 3600:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def load_or_publish(self, table: str, version: int, read) -> pd.DataFrame:
+        """게시된 파일이 있으면 매핑하고, 없으면 `read()` 결과를 게시한 뒤 매핑하여 반환합니다."""
+        df = self.open(table, version)
+        if df is not None:
+            return df
+        df = read()
+        if df.empty:
+            return df
+        self.publish(table, version, df)
+        return self.open(table, version)
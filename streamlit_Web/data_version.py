@@ -0,0 +1,146 @@
+# ==============================================================================
+# data_version.py - 데이터 버전 기록과 확인
+# ==============================================================================
+# 앱의 데이터 캐시(`st.cache_data`)는 TTL이 없어서, 밤마다 ETL이 새 데이터를 적재해도
+# 프로세스를 다시 시작하기 전까지 이전 데이터를 보여 주었습니다.
+#
+# [기록 - ETL]
+# 적재가 반영될 때 `data_version` 테이블에 테이블별 버전을 기록합니다.
+# 버전은 모든 테이블에 걸쳐 하나씩 증가하는 정수(`MAX(version) + 1`)이므로, 여러 테이블의
+# 버전 중 가장 큰 값만 비교해도 그중 하나라도 바뀌었는지 알 수 있습니다.
+#   - `db_loader.load_tables`: `animals`, `shelters` (merge는 같은 트랜잭션 안에서 기록)
+#   - `update_web_data.update_web_database`: `web_cats`, `web_dogs`
+#
+# [확인 - 앱]
+# `VersionPoller`가 `poll_seconds`마다 한 번만 `data_version`을 읽습니다. (기본 키 조회 한 번)
+# 데이터 캐시는 이 버전을 캐시 키에 포함하므로, 버전이 바뀌면 재시작 없이 다음 요청부터
+# 새 데이터를 읽습니다. 버전이 바뀐 것을 처음 발견하면 `on_change(바뀐 테이블 목록)` 콜백으로
+# 이전 버전의 캐시 항목을 비웁니다.
+#
+# `data_version` 테이블이 없으면(이 기능 이전에 적재한 DB) 버전을 0으로 보고 이전처럼 동작합니다.
+# 그 밖의 오류(연결 끊김 등)로 확인에 실패하면 마지막으로 확인한 버전을 계속 씁니다.
+#
+# [설정]
+# `config.ini`의 [DATA_VERSION] 섹션(선택)
+#   poll_seconds = 30
+# ==============================================================================
+
+import configparser
+import os
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+
+VERSION_TABLE = 'data_version'
+
+# MySQL ER_NO_SUCH_TABLE
+NO_SUCH_TABLE_ERRNO = 1146
+
+
+def get_data_version_config() -> dict:
+    """`config.ini`의 [DATA_VERSION] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    version_config = {'poll_seconds': 30.0}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'DATA_VERSION' in config:
+        version_config['poll_seconds'] = config['DATA_VERSION'].getfloat('poll_seconds', version_config['poll_seconds'])
+    return version_config
+
+
+def ensure_version_table(conn):
+    """`data_version` 테이블이 없으면 만듭니다. (DDL은 MySQL에서 암묵적으로 커밋되므로 적재 트랜잭션 밖에서 호출)"""
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS `{VERSION_TABLE}` ("
+        "`table_name` VARCHAR(64) NOT NULL PRIMARY KEY, "
+        "`version` BIGINT NOT NULL, "
+        "`loaded_at` DATETIME NOT NULL)"
+    ))
+
+
+def publish_version(conn, tables: list) -> int:
+    """`tables`의 버전을 새 버전으로 올리고 그 값을 반환합니다. 적재를 반영하는 트랜잭션 안에서 호출합니다."""
+    version = conn.execute(text(
+        f"SELECT COALESCE(MAX(`version`), 0) + 1 FROM `{VERSION_TABLE}` FOR UPDATE"
+    )).scalar()
+    for table in tables:
+        conn.execute(text(
+            f"INSERT INTO `{VERSION_TABLE}` (`table_name`, `version`, `loaded_at`) VALUES (:table, :version, NOW()) "
+            "ON DUPLICATE KEY UPDATE `version` = VALUES(`version`), `loaded_at` = VALUES(`loaded_at`)"
+        ), {'table': table, 'version': version})
+    print(f"[데이터 버전] {', '.join(tables)} → {version}")
+    return int(version)
+
+
+def _is_missing_table(error: DBAPIError) -> bool:
+    orig = error.orig
+    errno = getattr(orig, 'errno', None) or (orig.args[0] if getattr(orig, 'args', None) else None)
+    # sqlite3는 오류 번호 없이 메시지로만 알려 줍니다.
+    return errno == NO_SUCH_TABLE_ERRNO or 'no such table' in str(orig)
+
+
+def read_versions(conn) -> dict:
+    """
+    {테이블 이름: (버전, 적재 시각)}을 반환합니다. `data_version` 테이블이 없으면 빈 dict를 반환하고,
+    그 밖의 오류는 그대로 올립니다.
+    """
+    try:
+        rows = conn.execute(text(f"SELECT `table_name`, `version`, `loaded_at` FROM `{VERSION_TABLE}`")).all()
+    except DBAPIError as e:
+        if not _is_missing_table(e):
+            raise
+        conn.rollback()
+        return {}
+    return {row.table_name: (int(row.version), row.loaded_at) for row in rows}
+
+
+class VersionPoller:
+    """`data_version`을 최대 `poll_seconds`마다 한 번 읽어 테이블별 버전을 알려 줍니다. (여러 세션이 공유)"""
+
+    def __init__(self, engine, poll_seconds: float = 30, on_change=None):
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._versions = None
+        self._checked_at = 0.0
+
+    def versions(self) -> dict:
+        """{테이블 이름: (버전, 적재 시각)}. 마지막 확인 후 `poll_seconds`가 지났을 때만 DB를 읽습니다."""
+        with self._lock:
+            if self._versions is None or time.monotonic() - self._checked_at >= self.poll_seconds:
+                try:
+                    with self.engine.connect() as conn:
+                        latest = read_versions(conn)
+                except Exception as e:
+                    # 버전을 0으로 되돌리면 모든 캐시를 비우고 빈 버전을 새로 만들므로, 마지막으로 확인한 버전을 씁니다.
+                    print(f"경고: 데이터 버전 확인 실패, 마지막으로 확인한 버전을 사용합니다: {e}")
+                    if self._versions is None:
+                        return {}
+                    latest = self._versions
+                changed = [] if self._versions is None else sorted(
+                    table for table in set(latest) | set(self._versions) if latest.get(table) != self._versions.get(table))
+                self._versions, self._checked_at = latest, time.monotonic()
+                if changed and self.on_change is not None:
+                    print(f"[데이터 버전] 새 데이터 발견: {', '.join(changed)}")
+                    self.on_change(changed)
+            return self._versions
+
+    def version(self, tables=None) -> int:
+        """`tables`(기본값: 전체) 중 가장 큰 버전. 캐시 키에 사용합니다. (기록이 없으면 0)"""
+        return self.latest(tables)[0]
+
+    def latest(self, tables=None) -> tuple:
+        """`tables`(기본값: 전체) 중 가장 큰 버전과 가장 최근 적재 시각. (기록이 없으면 (0, None))"""
+        entries = [entry for table, entry in self.versions().items() if tables is None or table in tables]
+        if not entries:
+            return 0, None
+        return max(v for v, _ in entries), max(loaded_at for _, loaded_at in entries)
@@ -0,0 +1,119 @@
+# ==============================================================================
+# dataset_loader.py - 주 데이터(animals, shelters)의 백그라운드 준비와 교체
+# ==============================================================================
+# 캐시가 비어 있거나 새 데이터 버전으로 캐시를 비운 직후에는, 그 요청이 MySQL에서
+# 두 테이블 전체를 읽고 타입을 바꾸고 필터 색인을 만드는 동안 사용자가 스피너 앞에서
+# 기다려야 했습니다.
+#
+# `BackgroundLoader`는 이전 버전을 계속 내주면서(stale-while-revalidate) 새 버전을
+# 별도 스레드에서 준비합니다.
+#
+# - **조회 (`get`):** 준비된 스냅샷(`DatasetSnapshot`)을 바로 반환합니다. 요청한 버전이 더 새로우면
+#   백그라운드 준비를 시작하고, 끝날 때까지는 이전 스냅샷을 그대로 반환합니다.
+# - **교체:** 준비가 끝나면 잠금 안에서 참조 하나만 바꿉니다. 한 요청은 처음 받은 스냅샷을
+#   끝까지 쓰므로, 두 테이블과 색인이 서로 다른 버전으로 섞이지 않습니다.
+# - **실패:** 준비에 실패하면 이전 스냅샷을 계속 쓰고 `RETRY_SECONDS` 뒤에 다시 시도합니다.
+# - **처음 실행:** 내줄 스냅샷이 없을 때만 요청이 준비를 기다립니다.
+#
+# 준비하는 동안에는 이전 버전과 새 버전이 함께 메모리에 있습니다.
+# ==============================================================================
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+# 준비에 실패한 뒤 다시 시도하기까지 기다리는 시간(초)
+RETRY_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """한 데이터 버전의 테이블들과 필터 색인입니다. 만든 뒤에는 바꾸지 않습니다."""
+    version: int
+    loaded_at: datetime | None        # ETL이 이 버전을 적재한 시각 (`data_version.loaded_at`)
+    frames: dict = field(repr=False)  # 테이블 이름 → 데이터프레임
+    filter_engine: object = field(default=None, repr=False)
+    build_seconds: float = 0.0
+
+
+class BackgroundLoader:
+    """
+    `build(version)`으로 (테이블 dict, 필터 색인)을 만들어 스냅샷으로 내주고, 새 버전은 백그라운드에서 준비합니다.
+    교체될 때마다 `on_swap(스냅샷)`을 호출합니다. (여러 세션이 공유)
+    """
+
+    def __init__(self, build, on_swap=None):
+        self.build = build
+        self.on_swap = on_swap
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._thread = None
+        self._building = None      # 준비 중인 (버전, 적재 시각)
+        self._wanted = None        # 준비 중에 요청된 더 새로운 (버전, 적재 시각)
+        self._retry_at = 0.0
+        self._error = None
+
+    def get(self, version: int, loaded_at: datetime | None = None) -> DatasetSnapshot | None:
+        """준비된 스냅샷을 반환하고, `version`이 더 새로우면 백그라운드 준비를 시작합니다."""
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or version > snapshot.version:
+                self._request(version, loaded_at)
+            thread = self._thread
+        if snapshot is None and thread is not None:
+            thread.join()
+            with self._lock:
+                snapshot = self._snapshot
+        return snapshot
+
+    def status(self) -> dict:
+        """{'version', 'loaded_at', 'refreshing'(준비 중인 새 버전 또는 None), 'error'(마지막 실패)}"""
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                'version': snapshot.version if snapshot else None,
+                'loaded_at': snapshot.loaded_at if snapshot else None,
+                'refreshing': self._building[0] if self._building else None,
+                'error': self._error,
+            }
+
+    def _request(self, version: int, loaded_at):
+        # self._lock 안에서 호출합니다.
+        if self._building is not None:
+            if version > self._building[0] and (self._wanted is None or version > self._wanted[0]):
+                self._wanted = (version, loaded_at)
+            return
+        if time.monotonic() < self._retry_at:
+            return
+        self._building = (version, loaded_at)
+        self._thread = threading.Thread(target=self._run, args=(version, loaded_at),
+                                        name=f'dataset-loader-v{version}', daemon=True)
+        self._thread.start()
+
+    def _run(self, version: int, loaded_at):
+        started = time.perf_counter()
+        try:
+            frames, filter_engine = self.build(version)
+        except Exception as e:
+            print(f"경고: 데이터 버전 {version} 준비 실패, 이전 데이터를 계속 사용합니다: {e}")
+            with self._lock:
+                self._error = str(e)
+                self._retry_at = time.monotonic() + RETRY_SECONDS
+                self._building, self._wanted = None, None
+            return
+
+        snapshot = DatasetSnapshot(version, loaded_at, frames, filter_engine, time.perf_counter() - started)
+        rows = ', '.join(f"{name} {len(frame):,}행" for name, frame in frames.items())
+        print(f"[데이터 준비] 버전 {version} 교체: {rows} ({snapshot.build_seconds:.1f}초)")
+        with self._lock:
+            swapped = self._snapshot is None or snapshot.version > self._snapshot.version
+            if swapped:
+                self._snapshot = snapshot
+            self._error = None
+            self._building = None
+            wanted, self._wanted = self._wanted, None
+            if wanted is not None and wanted[0] > version:
+                self._request(*wanted)
+        if swapped and self.on_swap is not None:
+            self.on_swap(snapshot)
@@ -0,0 +1,224 @@
+# ==============================================================================
+# db_engine.py - 공용 DB 엔진 (연결 풀)
+# ==============================================================================
+# 앱(`data_manager.get_db_engine`, 웹 스크래핑 탭)과 ETL(`update_data.py`,
+# `update_web_data.py`)이 각자 `config.ini`로 엔진을 만들던 것을 하나로 모았습니다.
+# 특히 웹 스크래핑 탭은 호출할 때마다 새 엔진(= 새 연결 풀)을 만들어, 여러 세션이
+# 화면을 그릴 때마다 MySQL 연결을 새로 열었습니다.
+#
+# [주요 기능]
+# - **공용 엔진:** `get_engine()`은 프로세스 전체에서 하나의 엔진을 공유합니다.
+# - **연결 풀 설정:** 풀 크기, 추가 연결 수, 대기 시간, 연결 재사용 시간(`pool_recycle`)과
+#   사용 전 연결 확인(`pool_pre_ping`, 밤새 끊긴 연결을 미리 걸러냄)을 [DB_POOL]로 조정합니다.
+# - **풀 통계:** `pool_stats()`로 사용 중/최대 동시 사용 연결 수, 새로 연 연결 수,
+#   풀 소진(모든 연결 사용 중) 횟수와 연결 대기 시간 초과 횟수를 확인합니다.
+#   풀이 소진되면 경고를 출력합니다. (같은 경고는 1분에 한 번)
+# - **풀 통계 기록:** ETL은 실행이 끝날 때 통계를 출력하고, 앱(`data_manager.get_db_engine`)은
+#   `start_pool_stats_logger()`로 `stats_log_seconds`마다 `[DB 연결 풀]` 로그를 남깁니다.
+#   (그동안 연결을 한 번도 꺼내지 않았으면 건너뜀)
+#
+# [설정]
+# `config.ini`의 [DB] 섹션(필수)과 [DB_POOL] 섹션(선택)
+#   pool_size = 10        ; 유지할 연결 수
+#   max_overflow = 20     ; 풀이 모자랄 때 추가로 열 수 있는 연결 수
+#   pool_timeout = 10     ; 연결을 기다리는 최대 시간(초)
+#   pool_recycle = 1800   ; 이 시간(초)보다 오래된 연결은 새로 엽니다. (MySQL wait_timeout보다 짧게)
+#   pool_pre_ping = true  ; 연결을 꺼낼 때마다 살아 있는지 확인
+#   stats_log_seconds = 300  ; 앱 프로세스가 풀 통계를 로그로 남기는 주기(초), 0이면 끄기
+# ==============================================================================
+
+import configparser
+import os
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+
+DEFAULT_POOL_CONFIG = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 10.0,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+}
+EXHAUSTED_WARNING_INTERVAL = 60
+DEFAULT_STATS_LOG_SECONDS = 300.0
+
+
+def _read_config() -> configparser.ConfigParser:
+    config = configparser.ConfigParser()
+    if not os.path.exists(CONFIG_PATH):
+        raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {CONFIG_PATH}")
+    config.read(CONFIG_PATH, encoding='utf-8')
+    if 'DB' not in config:
+        raise KeyError(f"[DB] 섹션을 config.ini에서 찾을 수 없습니다. (path={CONFIG_PATH})")
+    return config
+
+
+def get_pool_config() -> dict:
+    """`config.ini`의 [DB_POOL] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    pool_config = dict(DEFAULT_POOL_CONFIG)
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'DB_POOL' in config:
+        section = config['DB_POOL']
+        pool_config['pool_size'] = section.getint('pool_size', pool_config['pool_size'])
+        pool_config['max_overflow'] = section.getint('max_overflow', pool_config['max_overflow'])
+        pool_config['pool_timeout'] = section.getfloat('pool_timeout', pool_config['pool_timeout'])
+        pool_config['pool_recycle'] = section.getint('pool_recycle', pool_config['pool_recycle'])
+        pool_config['pool_pre_ping'] = section.getboolean('pool_pre_ping', pool_config['pool_pre_ping'])
+    return pool_config
+
+
+def get_stats_log_seconds() -> float:
+    """`config.ini`의 [DB_POOL] stats_log_seconds (풀 통계 로그 주기, 0이면 끄기)를 반환합니다."""
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'DB_POOL' in config:
+        return max(config['DB_POOL'].getfloat('stats_log_seconds', DEFAULT_STATS_LOG_SECONDS), 0.0)
+    return DEFAULT_STATS_LOG_SECONDS
+
+
+def get_db_url() -> str:
+    """`config.ini`의 [DB] 설정으로 MySQL 접속 URL을 만듭니다. (utf8mb4)"""
+    db_config = _read_config()['DB']
+    return (f"mysql+mysqlconnector://{db_config['user']}:{db_config['password']}@"
+            f"{db_config['host']}:{db_config.get('port', '3306')}/{db_config['database']}?charset=utf8mb4")
+
+
+class PoolMetrics:
+    """엔진의 연결 풀 이벤트를 세어 사용량과 소진 여부를 기록합니다."""
+
+    def __init__(self, engine, pool_config: dict):
+        self.capacity = pool_config['pool_size'] + max(pool_config['max_overflow'], 0)
+        self._lock = threading.Lock()
+        self._stats = {'connects': 0, 'checkouts': 0, 'in_use': 0, 'peak_in_use': 0,
+                       'exhausted': 0, 'timeouts': 0, 'invalidated': 0}
+        self._last_warning = 0.0
+        event.listen(engine.pool, 'connect', self._on_connect)
+        event.listen(engine.pool, 'checkout', self._on_checkout)
+        event.listen(engine.pool, 'checkin', self._on_checkin)
+        event.listen(engine.pool, 'invalidate', self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._stats['connects'] += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._stats['in_use'])
+            exhausted = self._stats['in_use'] >= self.capacity
+            if exhausted:
+                self._stats['exhausted'] += 1
+            warn = exhausted and time.monotonic() - self._last_warning >= EXHAUSTED_WARNING_INTERVAL
+            if warn:
+                self._last_warning = time.monotonic()
+        if warn:
+            print(f"경고: DB 연결 풀이 모두 사용 중입니다. ({self.capacity}개) "
+                  "[DB_POOL] pool_size/max_overflow를 늘리는 것을 검토하세요.")
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._stats['in_use'] = max(self._stats['in_use'] - 1, 0)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self._stats['invalidated'] += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self._stats['timeouts'] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._stats, capacity=self.capacity)
+
+
+class MeteredQueuePool(QueuePool):
+    """연결 대기 시간 초과를 `PoolMetrics`에 기록하는 연결 풀입니다."""
+
+    metrics = None
+
+    def _do_get(self):
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+
+    def recreate(self):
+        # `engine.dispose()`로 풀을 새로 만들어도 같은 통계를 이어서 기록합니다.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def create_pooled_engine(url: str | None = None, pool_config: dict | None = None):
+    """연결 풀 설정과 통계(`engine.pool.metrics`)를 붙인 엔진을 새로 만듭니다. (보통은 공용 엔진 `get_engine()`을 사용)"""
+    pool_config = pool_config or get_pool_config()
+    engine = create_engine(url or get_db_url(), poolclass=MeteredQueuePool, **pool_config)
+    engine.pool.metrics = PoolMetrics(engine, pool_config)
+    return engine
+
+
+# --- 공용 엔진 ---
+_default_engine = None
+_default_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """프로세스 전체에서 공유하는 기본 엔진을 반환합니다."""
+    global _default_engine
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = create_pooled_engine()
+        return _default_engine
+
+
+def pool_stats() -> dict:
+    """공용 엔진의 연결 풀 통계. 엔진을 아직 만들지 않았으면 빈 dict를 반환합니다."""
+    with _default_engine_lock:
+        engine = _default_engine
+    if engine is None:
+        return {}
+    stats = engine.pool.metrics.snapshot()
+    stats['pool_status'] = engine.pool.status()
+    return stats
+
+
+# --- 풀 통계 로그 (앱) ---
+_stats_logger = None
+
+
+def _log_pool_stats(interval: float):
+    last_checkouts = None
+    while True:
+        time.sleep(interval)
+        stats = pool_stats()
+        if stats and stats['checkouts'] != last_checkouts:
+            last_checkouts = stats['checkouts']
+            print(f"[DB 연결 풀] {stats}")
+
+
+def start_pool_stats_logger(interval: float | None = None):
+    """공용 엔진의 풀 통계를 `interval`초(기본값: [DB_POOL] stats_log_seconds)마다 출력하는 데몬 스레드를 한 번만 시작합니다."""
+    global _stats_logger
+    interval = get_stats_log_seconds() if interval is None else interval
+    with _default_engine_lock:
+        if _stats_logger is not None or interval <= 0:
+            return
+        _stats_logger = threading.Thread(target=_log_pool_stats, args=(interval,), name='db-pool-stats', daemon=True)
+        _stats_logger.start()
@@ -0,0 +1,223 @@
+# ==============================================================================
+# db_loader.py - 스테이징 테이블 기반 DB 적재 모듈
+# ==============================================================================
+# `update_data.update_database`가 사용하는 적재(Load) 단계입니다.
+# 운영 테이블(`shelters`, `animals`)에 직접 `to_sql(if_exists='replace')`를
+# 실행하면 적재 도중 앱이 빈 테이블이나 일부만 채워진 테이블을 보게 되므로,
+# 다음 순서로 적재합니다.
+#
+# 1. **스테이징 적재:** 각 데이터프레임을 `schema.py`의 컬럼 타입(VARCHAR/ENUM/DATE)에
+#    맞춘 뒤 `<table>__staging` 테이블에 다중 행 INSERT(`method='multi'`)로 밀어 넣고,
+#    `schema.TABLE_INDEXES`의 기본 키/인덱스를 만듭니다. (행을 모두 넣은 뒤 한 번에 생성)
+# 2. **반영:**
+#    - `merge` (기본): 하나의 트랜잭션 안에서
+#      `INSERT ... SELECT ... ON DUPLICATE KEY UPDATE`로 신규/변경 행만 반영하고,
+#      스테이징에 없는 행을 삭제합니다. 값이 같은 행은 다시 쓰지 않습니다.
+#    - `swap`: `RENAME TABLE` 한 문장으로 운영 테이블과 스테이징 테이블을
+#      동시에 교체합니다.
+#    - `upsert` (델타 동기화): `merge`와 같지만 스테이징에 없는 행을 삭제하지 않습니다.
+#      받은 행만 스테이징하면 되므로 운영 테이블 전체를 읽거나 다시 쓰지 않습니다.
+#      `after_merge(conn)`을 넘기면 같은 트랜잭션에서 버전 기록 직전에 호출합니다.
+#      (예: `shelter_aggregation.refresh_shelter_aggregates`)
+#    운영 테이블이 없거나, 정의된 키/인덱스가 없거나, 컬럼 구성/타입이 바뀐 경우에는
+#    `merge`를 요청해도 `swap`으로 적재합니다. (`upsert`는 일부 행만 있으므로 교체하지 않고
+#    오류를 냅니다.) 어느 방식이든 적재 후 운영 테이블에는 정의된 키/인덱스가 모두 있습니다.
+# 3. **버전 기록:** 반영과 함께 `data_version` 테이블에 새 데이터 버전을 기록합니다.
+#    (`data_version.py` 참고. 앱은 이 버전이 바뀌면 재시작 없이 캐시를 새로 채웁니다.)
+# 4. **정리:** 남은 스테이징/이전 테이블을 삭제합니다.
+#
+# 어느 방식이든 읽는 쪽(`data_manager.load_data`)은 적재 전 또는 적재 후의
+# 완전한 데이터만 보게 됩니다.
+# ==============================================================================
+
+import time
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from data_version import ensure_version_table, publish_version
+from schema import TABLE_INDEXES, column_types, conform_frame
+
+# 테이블별 자연 키 컬럼
+TABLE_KEYS = {
+    'shelters': 'shelter_name',
+    'animals': 'desertion_no',
+}
+
+LOAD_STRATEGIES = ('merge', 'swap')
+# 받은 행만 반영하는 델타 동기화 전용 방식 (`update_data.py --mode delta`)
+UPSERT_STRATEGY = 'upsert'
+
+
+def _staging_name(table: str) -> str:
+    return f"{table}__staging"
+
+
+def _old_name(table: str) -> str:
+    return f"{table}__old"
+
+
+def _quote(name: str) -> str:
+    return f"`{name}`"
+
+
+def _index_clause(kind: str, name: str, columns: list) -> str:
+    col_list = ', '.join(_quote(c) for c in columns)
+    if kind == 'PRIMARY':
+        return f"ADD PRIMARY KEY ({col_list})"
+    if kind == 'UNIQUE':
+        return f"ADD UNIQUE KEY {_quote(name)} ({col_list})"
+    return f"ADD INDEX {_quote(name)} ({col_list})"
+
+
+def create_indexes(conn, table: str, target: str | None = None):
+    """`schema.TABLE_INDEXES`에 정의된 `table`의 키/인덱스를 `target` 테이블(기본값: `table`)에 만듭니다."""
+    indexes = TABLE_INDEXES.get(table, [])
+    if indexes:
+        clauses = ', '.join(_index_clause(*index) for index in indexes)
+        conn.execute(text(f"ALTER TABLE {_quote(target or table)} {clauses}"))
+
+
+def _missing_indexes(inspector, table: str) -> list:
+    """운영 테이블에 없는, 정의된 키/인덱스의 이름 목록을 반환합니다."""
+    existing = {('PRIMARY', 'PRIMARY', tuple(inspector.get_pk_constraint(table).get('constrained_columns') or []))}
+    for index in inspector.get_indexes(table):
+        existing.add(('UNIQUE' if index.get('unique') else 'INDEX', index['name'], tuple(index['column_names'])))
+    return [name for kind, name, columns in TABLE_INDEXES.get(table, [])
+            if (kind, name, tuple(columns)) not in existing]
+
+
+def _load_staging(engine, table: str, df: pd.DataFrame, chunksize: int) -> int:
+    """데이터프레임을 스테이징 테이블에 적재하고 정의된 키/인덱스를 만듭니다."""
+    key = TABLE_KEYS[table]
+    staging = _staging_name(table)
+    df = df[df[key].notna()].drop_duplicates(subset=[key], keep='last')
+    df = conform_frame(df, table)
+
+    with engine.begin() as conn:
+        df.to_sql(staging, conn, if_exists='replace', index=False, method='multi', chunksize=chunksize,
+                  dtype=column_types(table, df.columns))
+        create_indexes(conn, table, target=staging)
+    return len(df)
+
+
+def _can_merge(conn, table: str) -> bool:
+    """운영 테이블이 존재하고, 정의된 키/인덱스가 모두 있으며, 스테이징과 컬럼 구성·타입이 같은지 확인합니다."""
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return False
+    missing = _missing_indexes(inspector, table)
+    if missing:
+        print(f"[적재] {table}: 운영 테이블에 없는 키/인덱스 {missing}")
+        return False
+    # 타입까지 비교하여, 스키마가 바뀐 경우(예: TEXT → VARCHAR)에는 swap으로 테이블을 새로 만듭니다.
+    target_cols = {col['name']: str(col['type']) for col in inspector.get_columns(table)}
+    staging_cols = {col['name']: str(col['type']) for col in inspector.get_columns(_staging_name(table))}
+    return target_cols == staging_cols
+
+
+def _merge_table(conn, table: str, columns: list, delete_missing: bool = True) -> dict:
+    """스테이징 테이블의 신규/변경 행만 운영 테이블에 upsert하고, `delete_missing`이면 사라진 행을 삭제합니다."""
+    key = TABLE_KEYS[table]
+    staging = _staging_name(table)
+    col_list = ', '.join(_quote(c) for c in columns)
+    select_list = ', '.join(f"s.{_quote(c)}" for c in columns)
+    same_row = ' AND '.join(f"t.{_quote(c)} <=> s.{_quote(c)}" for c in columns)
+    changed_filter = f"NOT EXISTS (SELECT 1 FROM {_quote(table)} t WHERE {same_row})"
+    update_list = ', '.join(
+        f"{_quote(table)}.{_quote(c)} = VALUES({_quote(c)})" for c in columns if c != key
+    )
+
+    inserted = conn.execute(text(
+        f"SELECT COUNT(*) FROM {_quote(staging)} s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {_quote(table)} t WHERE t.{_quote(key)} = s.{_quote(key)})"
+    )).scalar()
+    upserted = conn.execute(text(f"SELECT COUNT(*) FROM {_quote(staging)} s WHERE {changed_filter}")).scalar()
+
+    if upserted:
+        conn.execute(text(
+            f"INSERT INTO {_quote(table)} ({col_list}) "
+            f"SELECT {select_list} FROM {_quote(staging)} s WHERE {changed_filter} "
+            f"ON DUPLICATE KEY UPDATE {update_list}"
+        ))
+    deleted = 0
+    if delete_missing:
+        deleted = conn.execute(text(
+            f"DELETE t FROM {_quote(table)} t LEFT JOIN {_quote(staging)} s ON t.{_quote(key)} = s.{_quote(key)} "
+            f"WHERE s.{_quote(key)} IS NULL"
+        )).rowcount
+
+    return {'inserted': inserted, 'updated': upserted - inserted, 'deleted': deleted}
+
+
+def _swap_tables(conn, tables: list):
+    """모든 운영 테이블을 스테이징 테이블과 한 번의 `RENAME TABLE`로 교체합니다."""
+    inspector = inspect(conn)
+    renames = []
+    for table in tables:
+        conn.execute(text(f"DROP TABLE IF EXISTS {_quote(_old_name(table))}"))
+        if inspector.has_table(table):
+            renames.append(f"{_quote(table)} TO {_quote(_old_name(table))}")
+        renames.append(f"{_quote(_staging_name(table))} TO {_quote(table)}")
+    conn.execute(text("RENAME TABLE " + ', '.join(renames)))
+    for table in tables:
+        conn.execute(text(f"DROP TABLE IF EXISTS {_quote(_old_name(table))}"))
+
+
+def load_tables(engine, frames: dict, strategy: str = 'merge', chunksize: int = 1000, after_merge=None) -> dict:
+    """
+    {테이블 이름: DataFrame}을 스테이징 테이블을 거쳐 운영 테이블에 반영합니다.
+    `upsert`는 받은 행만 반영하고, `after_merge(conn)`을 같은 트랜잭션에서 버전 기록 전에 호출합니다.
+    반환값은 테이블별 적재 통계와 실제 사용한 방식(`strategy`)입니다.
+    """
+    strategies = LOAD_STRATEGIES + (UPSERT_STRATEGY,)
+    if strategy not in strategies:
+        raise ValueError(f"알 수 없는 적재 방식입니다: {strategy} (사용 가능: {', '.join(strategies)})")
+    upsert = strategy == UPSERT_STRATEGY
+
+    tables = list(frames)
+    stats = {}
+
+    started = time.perf_counter()
+    for table, df in frames.items():
+        rows = _load_staging(engine, table, df, chunksize)
+        stats[table] = {'staged': rows}
+        print(f"[적재] {table} 스테이징 적재 완료: {rows}건")
+    staged_elapsed = time.perf_counter() - started
+
+    with engine.begin() as conn:
+        ensure_version_table(conn)
+    with engine.connect() as conn:
+        mergeable = strategy != 'swap' and all(_can_merge(conn, table) for table in tables)
+    if upsert and not mergeable:
+        # 받은 행만 있는 스테이징으로 테이블을 교체하면 나머지 행이 사라지므로 적재하지 않습니다.
+        with engine.begin() as conn:
+            for table in tables:
+                conn.execute(text(f"DROP TABLE IF EXISTS {_quote(_staging_name(table))}"))
+        raise RuntimeError("운영 테이블이 없거나 키·인덱스/컬럼 구성·타입이 달라 upsert로 적재할 수 없습니다. "
+                           "full 모드로 먼저 전체를 적재하세요.")
+    if strategy == 'merge' and not mergeable:
+        print("[적재] 운영 테이블이 없거나 키·인덱스/컬럼 구성·타입이 달라 merge 대신 swap으로 적재합니다.")
+    used_strategy = strategy if mergeable else 'swap'
+
+    if used_strategy != 'swap':
+        with engine.begin() as conn:
+            for table in tables:
+                stats[table].update(_merge_table(conn, table, list(frames[table].columns), delete_missing=not upsert))
+            if after_merge is not None:
+                after_merge(conn)
+            version = publish_version(conn, tables)
+        with engine.begin() as conn:
+            for table in tables:
+                conn.execute(text(f"DROP TABLE IF EXISTS {_quote(_staging_name(table))}"))
+    else:
+        with engine.begin() as conn:
+            _swap_tables(conn, tables)
+            # RENAME TABLE은 DDL이라 바로 반영되므로, 교체 직후에 버전을 기록합니다.
+            version = publish_version(conn, tables)
+
+    total_elapsed = time.perf_counter() - started
+    for table in tables:
+        print(f"[적재] {table}: {stats[table]}")
+    print(f"[TIMING] DB 적재 소요 시간: {total_elapsed:.1f}초 (스테이징 {staged_elapsed:.1f}초, 방식: {used_strategy})")
+    return {'strategy': used_strategy, 'tables': stats, 'version': version}
@@ -0,0 +1,142 @@
+# ==============================================================================
+# filter_engine.py - 메모리 색인 기반 필터 엔진
+# ==============================================================================
+# `data_manager.get_filtered_data`의 `[FILTER] backend = memory` 방식입니다.
+# pandas 방식(`filter_query.filter_frames`)은 필터가 바뀔 때마다 전체 동물 데이터에
+# `pd.to_datetime`과 마스크 연산을 다시 하므로, 데이터를 읽을 때 한 번만 색인을 만들고
+# 필터는 색인끼리의 교집합으로 계산합니다.
+#
+# [색인]
+# - **공고일:** 동물을 공고일 순으로 정렬해 두어, 기간 조건은 이진 탐색(`searchsorted`)
+#   두 번으로 행 범위 [시작, 끝)가 됩니다. (공고일이 없는 행은 어떤 기간에도 포함되지 않으므로 제외)
+# - **축종별 행 목록:** `upkind_name`별 행 번호 (오름차순 = 공고일 순)
+# - **보호소별 행 목록:** (보호소 번호, 행 번호) 순으로 정렬한 행 번호. 보호소마다 기간에 해당하는
+#   부분을 이진 탐색으로 바로 잘라 낼 수 있습니다.
+# - **지역별 보호소 목록:** 시/도 코드별, 시/군/구 코드별 보호소 번호 (`region_codes.py`의 정수 코드)
+#
+# 결과(동물, 보호소, KPI 4종)는 pandas 방식과 같습니다. 동물은 공고일 순으로 반환합니다.
+# 성능 비교는 `benchmarks/bench_filter_engine.py`를 참고하세요.
+# ==============================================================================
+
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from filter_query import ANIMAL_COLUMNS, SHELTER_COLUMNS, region_conditions
+
+# 축종 조건으로 고른 행이 기간 안 행의 1/8을 넘으면 행 목록 대신 범위 안의 축종 코드로 고릅니다.
+DENSE_SELECTION_RATIO = 8
+
+
+def _concat_ranges(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """[starts[i], stops[i]) 범위들을 이어 붙인 위치 배열을 반환합니다."""
+    lengths = stops - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.r_[0, np.cumsum(lengths)[:-1]], lengths)
+    return offsets + np.arange(total)
+
+
+class FilterEngine:
+    """`animals`/`shelters` 데이터프레임의 색인을 만들고 사이드바 필터를 계산합니다."""
+
+    def __init__(self, animals: pd.DataFrame, shelters: pd.DataFrame):
+        started = time.perf_counter()
+
+        # --- 보호소: 이름 → 보호소 번호 (행 위치). 이름은 `shelters`의 UNIQUE 키입니다. ---
+        shelters = shelters.drop_duplicates(subset=['shelter_name']).reset_index(drop=True)
+        self.shelters = shelters[[c for c in SHELTER_COLUMNS if c in shelters.columns]]
+        self._long_term = pd.to_numeric(shelters['long_term'], errors='coerce').fillna(0).to_numpy()
+        self._adopted = pd.to_numeric(shelters['adopted'], errors='coerce').fillna(0).to_numpy()
+        shelter_index = pd.Index(shelters['shelter_name'].astype(object))
+
+        # --- 동물: 공고일 순으로 정렬 ---
+        notice_date = pd.to_datetime(animals['notice_date'], errors='coerce')
+        days = notice_date.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        valid_rows = np.flatnonzero(notice_date.notna().to_numpy())
+        rows = valid_rows[np.argsort(days[valid_rows], kind='stable')]
+        self.animals = animals[[c for c in ANIMAL_COLUMNS if c in animals.columns]].take(rows).reset_index(drop=True)
+        self._days = days[rows]
+        self._shelter_codes = shelter_index.get_indexer(self.animals['shelter_name'].astype(object))
+
+        # --- 축종별 행 목록 ---
+        upkind_codes, upkind_values = pd.factorize(self.animals['upkind_name'])
+        self._upkind_codes = upkind_codes
+        self._upkind_index = {value: i for i, value in enumerate(upkind_values)}
+        self._rows_by_upkind = [np.flatnonzero(upkind_codes == i) for i in range(len(upkind_values))]
+
+        # --- 보호소별 행 목록: (보호소 번호 * 행 수 + 행 번호)로 정렬한 키 ---
+        self._n_rows = len(self.animals)
+        has_shelter = np.flatnonzero(self._shelter_codes >= 0)
+        shelter_keys = self._shelter_codes[has_shelter].astype(np.int64) * self._n_rows + has_shelter
+        self._shelter_keys = np.sort(shelter_keys)
+
+        # --- 지역별 보호소 목록: {(컬럼, 코드): 보호소 번호 배열} ---
+        self._region_index = {}
+        for col in ['sido_code', 'sigungu_code']:
+            if col not in shelters.columns:
+                print(f"경고: shelters 테이블에 {col} 컬럼이 없습니다. `update_data.py`로 다시 적재하세요.")
+                continue
+            codes = pd.to_numeric(shelters[col], errors='coerce')
+            for code, ids in codes.groupby(codes).indices.items():
+                self._region_index[(col, int(code))] = np.sort(ids)
+
+        self.build_seconds = time.perf_counter() - started
+        print(f"[필터 엔진] 동물 {self._n_rows:,}건, 보호소 {len(self.shelters):,}곳, "
+              f"지역 코드 {len(self._region_index):,}개 색인 ({self.build_seconds:.2f}초)")
+
+    def _date_range(self, start_date: date, end_date: date) -> tuple[int, int]:
+        lo = int(np.searchsorted(self._days, np.datetime64(start_date, 'D'), side='left'))
+        hi = int(np.searchsorted(self._days, np.datetime64(end_date, 'D'), side='right'))
+        return lo, max(lo, hi)
+
+    def select(self, start_date: date, end_date: date, sido_code: int | None, sigungu_code: int | None,
+               species: list) -> tuple[np.ndarray, np.ndarray]:
+        """조건에 맞는 (동물 행 번호, 보호소 번호)를 반환합니다. 동물 행 번호는 공고일 순입니다."""
+        lo, hi = self._date_range(start_date, end_date)
+        regions = list(region_conditions(sido_code, sigungu_code).items())
+        species_codes = [self._upkind_index[s] for s in species if s in self._upkind_index] if species else None
+
+        if regions:
+            # 지역의 보호소별 행 목록에서 기간 [lo, hi)에 해당하는 부분만 잘라 모읍니다.
+            empty = np.empty(0, dtype=np.int64)
+            region = self._region_index.get(regions[0], empty)
+            for key in regions[1:]:
+                region = np.intersect1d(region, self._region_index.get(key, empty), assume_unique=True)
+            base = region.astype(np.int64) * self._n_rows
+            positions = _concat_ranges(np.searchsorted(self._shelter_keys, base + lo),
+                                       np.searchsorted(self._shelter_keys, base + hi))
+            rows = np.sort(self._shelter_keys[positions] % self._n_rows)
+            if species_codes is not None:
+                rows = rows[np.isin(self._upkind_codes[rows], species_codes)]
+        else:
+            if species_codes is None:
+                rows = np.arange(lo, hi)
+            else:
+                # 축종별 행 목록도 공고일 순이므로 기간은 이진 탐색으로 자릅니다.
+                parts = [r[np.searchsorted(r, lo):np.searchsorted(r, hi)]
+                         for r in (self._rows_by_upkind[c] for c in species_codes)]
+                if sum(len(p) for p in parts) * DENSE_SELECTION_RATIO > hi - lo:
+                    # 기간 안의 대부분이 선택되면 목록을 합쳐 정렬하는 것보다 범위 안에서 고르는 편이 빠릅니다.
+                    allowed = np.zeros(len(self._rows_by_upkind) + 1, dtype=bool)
+                    allowed[species_codes] = True
+                    rows = lo + np.flatnonzero(allowed[self._upkind_codes[lo:hi]])
+                else:
+                    rows = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+            rows = rows[self._shelter_codes[rows] >= 0]
+
+        shelter_ids = np.flatnonzero(np.bincount(self._shelter_codes[rows], minlength=len(self.shelters)))
+        return rows, shelter_ids
+
+    def filter(self, start_date: date, end_date: date, sido_code: int | None, sigungu_code: int | None,
+               species: list) -> tuple:
+        """
+        (동물, 보호소, 보호소 수, 동물 수, 장기 보호 수, 입양 수)를 반환합니다.
+        반환 형식은 `filter_query.filter_frames`와 같습니다.
+        """
+        rows, shelter_ids = self.select(start_date, end_date, sido_code, sigungu_code, species)
+        return (self.animals.take(rows), self.shelters.take(shelter_ids), len(shelter_ids), len(rows),
+                int(self._long_term[shelter_ids].sum()), int(self._adopted[shelter_ids].sum()))
@@ -0,0 +1,193 @@
+# ==============================================================================
+# filter_query.py - 사이드바 필터 조회 (SQL push-down)
+# ==============================================================================
+# `data_manager.get_filtered_data`가 사용하는 조회 단계입니다.
+# 기존 방식은 필터 조합이 바뀔 때마다 `animals`/`shelters` 전체를 `SELECT *`로
+# 읽은 뒤 pandas에서 기간, 축종, 주소 앞부분으로 걸러냈습니다. 여기서는 필터를
+# 파라미터 바인딩된 SQL로 바꾸어 DB가 인덱스로 조건에 맞는 행만 찾게 합니다.
+# 지역은 ETL이 주소를 해석해 둔 정수 코드(`sido_code`, `sigungu_code`)로 비교합니다.
+# (`region_codes.py` 참고. 코드가 None이면 해당 지역 조건을 적용하지 않습니다.)
+#
+# - **동물:** 화면에서 쓰는 컬럼(`ANIMAL_COLUMNS`)만, 보호소와 조인하여 조회
+# - **보호소:** 조건에 맞는 동물이 있는 보호소의 `SHELTER_COLUMNS`만 조회
+# - **KPI 4종:** 보호소 수, 동물 수, 장기 보호 수, 입양 수를 한 번의 집계 쿼리로 계산
+#
+# 결과는 기존 pandas 방식(`filter_frames`)과 같습니다. `config.ini`의 [FILTER]
+# 섹션에서 `backend = memory`(메모리 색인 엔진, `filter_engine.py`) 또는
+# `backend = pandas`(기존 방식)를 선택할 수 있습니다.
+# 성능 비교는 `benchmarks/bench_filter_query.py`를 참고하세요.
+#
+# `FilterKey`는 필터 결과 캐시(`result_cache.py`)의 키입니다. `covers`로 캐시된 더 넓은
+# 조건의 결과를 `filter_frames`로 다시 걸러 쓸 수 있는지 판단합니다.
+# ==============================================================================
+
+import configparser
+import os
+from dataclasses import dataclass
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import Date, bindparam, text
+
+from schema import apply_frame_dtypes
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+
+FILTER_BACKENDS = ('sql', 'memory', 'pandas')
+
+# 지도/분석 탭에서 사용하는 컬럼
+ANIMAL_COLUMNS = ['desertion_no', 'shelter_name', 'upkind_name', 'kind_name', 'age', 'color', 'neuter',
+                  'process_state', 'notice_date', 'image_url']
+# 지역 코드는 캐시된 결과를 더 좁은 지역으로 다시 거를 때 사용합니다. (`FilterKey.covers`)
+SHELTER_COLUMNS = ['shelter_name', 'region', 'kind_name', 'count', 'long_term', 'adopted', 'lat', 'lon',
+                   'sido_code', 'sigungu_code']
+
+
+def get_filter_config() -> dict:
+    """`config.ini`의 [FILTER] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    filter_config = {'backend': 'sql'}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'FILTER' in config:
+        filter_config['backend'] = config['FILTER'].get('backend', filter_config['backend'])
+    if filter_config['backend'] not in FILTER_BACKENDS:
+        print(f"경고: 알 수 없는 필터 방식({filter_config['backend']})입니다. sql 방식을 사용합니다.")
+        filter_config['backend'] = 'sql'
+    return filter_config
+
+
+@dataclass(frozen=True)
+class FilterKey:
+    """필터 결과 캐시의 키. 축종은 정렬한 tuple입니다. (빈 tuple은 전체 축종)"""
+    start_date: date
+    end_date: date
+    sido_code: int | None
+    sigungu_code: int | None
+    species: tuple
+    data_version: int
+    backend: str
+
+    def covers(self, other: 'FilterKey') -> bool:
+        """
+        `other`의 결과가 이 키의 결과의 부분집합인지 확인합니다. 그러면 이 키의 결과를
+        `filter_frames`로 다시 걸러 `other`의 결과를 얻을 수 있습니다. (조회 방식은 달라도 결과가 같음)
+        """
+        return (self.data_version == other.data_version
+                and self.start_date <= other.start_date and other.end_date <= self.end_date
+                and all(mine is None or mine == theirs for mine, theirs in
+                        [(self.sido_code, other.sido_code), (self.sigungu_code, other.sigungu_code)])
+                and (not self.species or (bool(other.species) and set(other.species) <= set(self.species))))
+
+
+def region_conditions(sido_code: int | None, sigungu_code: int | None) -> dict:
+    """적용할 지역 조건 {컬럼: 코드}를 반환합니다. (None인 코드는 조건 없음)"""
+    return {col: int(code) for col, code in [('sido_code', sido_code), ('sigungu_code', sigungu_code)]
+            if code is not None}
+
+
+def _filter_conditions(start_date: date, end_date: date, sido_code: int | None, sigungu_code: int | None, species: list):
+    """(동물 조건, 보호소 조건, 파라미터, 타입/목록 바인딩)을 반환합니다."""
+    params = {'start_date': start_date, 'end_date': end_date}
+    binds = [bindparam('start_date', type_=Date()), bindparam('end_date', type_=Date())]
+
+    animal_where = ["a.notice_date BETWEEN :start_date AND :end_date"]
+    if species:
+        animal_where.append("a.upkind_name IN :species")
+        params['species'] = list(species)
+        binds.append(bindparam('species', expanding=True))
+
+    shelter_where = []
+    for col, code in region_conditions(sido_code, sigungu_code).items():
+        shelter_where.append(f"s.{col} = :{col}")
+        params[col] = code
+    return ' AND '.join(animal_where), ' AND '.join(shelter_where) or '1=1', params, binds
+
+
+def build_filter_queries(start_date: date, end_date: date, sido_code: int | None, sigungu_code: int | None,
+                         species: list) -> tuple[dict, dict]:
+    """필터 조건을 {'animals', 'shelters', 'kpis'} 쿼리와 파라미터로 바꿉니다."""
+    animal_where, shelter_where, params, binds = _filter_conditions(start_date, end_date, sido_code, sigungu_code, species)
+    animal_cols = ', '.join(f"a.{c}" for c in ANIMAL_COLUMNS)
+    shelter_cols = ', '.join(f"s.{c}" for c in SHELTER_COLUMNS)
+
+    # 조건에 맞는 동물의 보호소별 수. 보호소 목록과 KPI는 보호소마다 동물 테이블을 다시
+    # 찾는 상관 서브쿼리(EXISTS) 대신 이 집계 결과와 조인합니다.
+    matched = (
+        f"SELECT a.shelter_name, COUNT(*) AS animal_count FROM animals a WHERE {animal_where} "
+        "GROUP BY a.shelter_name"
+    )
+    queries = {
+        'animals': (
+            f"SELECT {animal_cols} FROM animals a "
+            "JOIN shelters s ON s.shelter_name = a.shelter_name "
+            f"WHERE {animal_where} AND {shelter_where}"
+        ),
+        'shelters': (
+            f"SELECT {shelter_cols} FROM shelters s "
+            f"JOIN ({matched}) m ON m.shelter_name = s.shelter_name "
+            f"WHERE {shelter_where}"
+        ),
+        'kpis': (
+            "SELECT COUNT(*) AS shelter_count, COALESCE(SUM(m.animal_count), 0) AS animal_count, "
+            "COALESCE(SUM(s.long_term), 0) AS long_term_count, COALESCE(SUM(s.adopted), 0) AS adopted_count "
+            f"FROM shelters s JOIN ({matched}) m ON m.shelter_name = s.shelter_name "
+            f"WHERE {shelter_where}"
+        ),
+    }
+    # 세 쿼리 모두 동물 조건과 보호소 조건을 함께 사용하므로 파라미터도 같습니다.
+    return {name: text(sql).bindparams(*binds) for name, sql in queries.items()}, params
+
+
+def query_filtered_data(conn, start_date: date, end_date: date, sido_code: int | None, sigungu_code: int | None,
+                        species: list) -> tuple:
+    """
+    SQL로 필터링한 (동물, 보호소, 보호소 수, 동물 수, 장기 보호 수, 입양 수)를 반환합니다.
+    반환 형식은 `filter_frames`와 같습니다.
+    """
+    queries, params = build_filter_queries(start_date, end_date, sido_code, sigungu_code, species)
+
+    kpis = conn.execute(queries['kpis'], params).one()
+    if not kpis.shelter_count:
+        return pd.DataFrame(), pd.DataFrame(), 0, 0, 0, 0
+
+    animals = pd.read_sql(queries['animals'], conn, params=params)
+    shelters = pd.read_sql(queries['shelters'], conn, params=params)
+    shelters['lat'] = pd.to_numeric(shelters['lat'], errors='coerce')
+    shelters['lon'] = pd.to_numeric(shelters['lon'], errors='coerce')
+    return (apply_frame_dtypes(animals, 'animals'), apply_frame_dtypes(shelters, 'shelters'),
+            int(kpis.shelter_count), int(kpis.animal_count), int(kpis.long_term_count), int(kpis.adopted_count))
+
+
+def filter_frames(animals: pd.DataFrame, shelters: pd.DataFrame, start_date: date, end_date: date,
+                  sido_code: int | None, sigungu_code: int | None, species: list) -> tuple:
+    """전체 테이블을 읽은 데이터프레임을 pandas로 필터링합니다. (기존 방식)"""
+    if animals.empty or shelters.empty:
+        return pd.DataFrame(), pd.DataFrame(), 0, 0, 0, 0
+
+    notice_date = pd.to_datetime(animals['notice_date'])
+    mask = (notice_date.dt.date >= start_date) & (notice_date.dt.date <= end_date)
+    filtered_animals = animals[mask]
+
+    if species:
+        filtered_animals = filtered_animals[filtered_animals['upkind_name'].isin(species)]
+
+    shelter_names_with_animals = filtered_animals['shelter_name'].unique()
+    filtered_shelters = shelters[shelters['shelter_name'].isin(shelter_names_with_animals)]
+
+    for col, code in region_conditions(sido_code, sigungu_code).items():
+        filtered_shelters = filtered_shelters[filtered_shelters[col] == code]
+
+    final_animal_shelters = filtered_shelters['shelter_name'].unique()
+    final_animals = filtered_animals[filtered_animals['shelter_name'].isin(final_animal_shelters)]
+
+    shelter_count = filtered_shelters['shelter_name'].nunique()
+    animal_count = len(final_animals)
+    long_term_count = int(filtered_shelters['long_term'].sum())
+    adopted_count = int(filtered_shelters['adopted'].sum())
+
+    return final_animals, filtered_shelters, shelter_count, animal_count, long_term_count, adopted_count
@@ -0,0 +1,208 @@
+# ==============================================================================
+# geocoding.py - 주소 좌표 변환(지오코딩) 캐시 및 일괄 처리
+# ==============================================================================
+# 보호소 주소 → 위도/경도 변환 결과를 로컬 SQLite 파일에 저장해 두고,
+# ETL을 다시 실행할 때 카카오 API를 반복 호출하지 않도록 합니다.
+#
+# [캐시 정책]
+# - **키:** 공백을 정리한 정규화 주소 (`normalize_address`)
+# - **성공 결과:** `ttl_days` 동안 유효합니다.
+# - **실패 결과(좌표 없음):** 좌표가 없다는 사실도 `negative_ttl_days` 동안
+#   저장하여(네거티브 캐시) 같은 주소를 매번 다시 조회하지 않습니다.
+#   네트워크 오류 등 일시적인 실패는 저장하지 않습니다.
+#
+# [일괄 처리]
+# `geocode_addresses`는 캐시에 없는 주소만 모아, 공용 API 클라이언트의
+# 동시 요청 수/속도 제한 안에서 병렬로 조회한 뒤 결과를 한 번에 저장합니다.
+#
+# [좌표 결정]
+# `resolve_coordinates`는 보호소 테이블 전체를 열 단위로 처리하여 좌표를 정합니다.
+#   1. 보호소 API 좌표(`lat_api`/`lon_api`, 0은 값 없음으로 간주)
+#   2. 주소 지오코딩 결과(캐시 또는 카카오 API)
+#   3. 둘 다 없으면 좌표를 NULL로 두고 `geo_source`를 'unresolved'로 표시
+#      (0으로 채우면 지도에서 바다 한가운데에 마커가 찍히므로 채우지 않습니다.)
+#
+# [설정]
+# `config.ini`의 [GEOCODE] 섹션(선택)
+#   cache_path = streamlit_Web/data/geocode_cache.sqlite3
+#   ttl_days = 180
+#   negative_ttl_days = 7
+# ==============================================================================
+
+import configparser
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from api_client import get_client
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+DEFAULT_CACHE_PATH = os.path.join(streamlit_web_dir, 'data', 'geocode_cache.sqlite3')
+
+# `geo_source` 컬럼 값
+GEO_SOURCE_API = 'api'
+GEO_SOURCE_GEOCODE = 'geocode'
+GEO_SOURCE_UNRESOLVED = 'unresolved'
+
+
+def get_geocode_config() -> dict:
+    """`config.ini`의 [GEOCODE] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    geocode_config = {'cache_path': DEFAULT_CACHE_PATH, 'ttl_days': 180.0, 'negative_ttl_days': 7.0}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'GEOCODE' in config:
+        section = config['GEOCODE']
+        cache_path = section.get('cache_path')
+        if cache_path:
+            geocode_config['cache_path'] = cache_path if os.path.isabs(cache_path) else os.path.join(project_root, cache_path)
+        geocode_config['ttl_days'] = section.getfloat('ttl_days', geocode_config['ttl_days'])
+        geocode_config['negative_ttl_days'] = section.getfloat('negative_ttl_days', geocode_config['negative_ttl_days'])
+    return geocode_config
+
+
+def normalize_address(address: str) -> str:
+    """캐시 키로 쓰기 위해 주소의 앞뒤/연속 공백을 정리합니다."""
+    return ' '.join(str(address).split())
+
+
+class GeocodeCache:
+    """정규화 주소를 키로 좌표(또는 '좌표 없음')를 저장하는 SQLite 캐시입니다."""
+
+    def __init__(self, path: str, ttl_days: float = 180, negative_ttl_days: float = 7):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.negative_ttl_seconds = negative_ttl_days * 86400
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                address TEXT PRIMARY KEY,
+                lat REAL,
+                lon REAL,
+                found INTEGER NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @classmethod
+    def from_config(cls):
+        geocode_config = get_geocode_config()
+        return cls(geocode_config['cache_path'], geocode_config['ttl_days'], geocode_config['negative_ttl_days'])
+
+    def get_many(self, addresses) -> dict:
+        """
+        유효한 캐시 항목을 {정규화 주소: (lat, lon) 또는 None}으로 반환합니다.
+        None은 '좌표 없음'으로 캐시된 주소이며, 캐시에 없거나 만료된 주소는 결과에 포함되지 않습니다.
+        """
+        keys = list(set(addresses))
+        now = time.time()
+        found = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT address, lat, lon, found, fetched_at FROM geocode_cache WHERE address IN ({placeholders})", chunk
+            ).fetchall()
+            for address, lat, lon, is_found, fetched_at in rows:
+                ttl = self.ttl_seconds if is_found else self.negative_ttl_seconds
+                if now - fetched_at <= ttl:
+                    found[address] = (lat, lon) if is_found else None
+        return found
+
+    def put_many(self, results: dict):
+        """{정규화 주소: (lat, lon) 또는 None} 결과를 저장합니다."""
+        now = time.time()
+        rows = [
+            (address, coords[0] if coords else None, coords[1] if coords else None, 1 if coords else 0, now)
+            for address, coords in results.items()
+        ]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO geocode_cache (address, lat, lon, found, fetched_at) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def geocode_addresses(addresses, lookup, client=None, cache=None) -> dict:
+    """
+    주소 목록을 {원본 주소: (lat, lon) 또는 None}으로 변환합니다.
+    캐시에 없는 주소만 `lookup(address, client)`로 병렬 조회합니다.
+    `lookup`은 좌표가 없으면 None을 반환하고, 일시적인 오류는 예외로 알려야 합니다.
+    """
+    client = client or get_client()
+    owns_cache = cache is None
+    cache = cache or GeocodeCache.from_config()
+    started = time.perf_counter()
+
+    try:
+        key_by_address = {address: normalize_address(address) for address in addresses}
+        cached = cache.get_many(key_by_address.values())
+        misses = sorted({key for key in key_by_address.values() if key not in cached})
+
+        def resolve(key):
+            try:
+                return key, lookup(key, client), True
+            except Exception as e:
+                print(f"지오코딩 실패 (다음 실행에서 재시도): {key} - {e}")
+                return key, None, False
+
+        fetched = {key: coords for key, coords, ok in client.map(resolve, misses) if ok}
+        cache.put_many(fetched)
+    finally:
+        if owns_cache:
+            cache.close()
+
+    resolved = {**cached, **fetched}
+    elapsed = time.perf_counter() - started
+    print(f"[TIMING] 지오코딩 소요 시간: {elapsed:.1f}초 (주소 {len(key_by_address)}건, 캐시 적중 {len(cached)}건, "
+          f"API 조회 {len(misses)}건, 좌표 없음 {sum(1 for v in resolved.values() if v is None)}건)")
+    return {address: resolved.get(key) for address, key in key_by_address.items()}
+
+
+def resolve_coordinates(shelter_df: pd.DataFrame, lookup, client=None, cache=None) -> pd.DataFrame:
+    """
+    보호소 테이블의 `lat`/`lon`/`geo_source` 컬럼을 채워 반환합니다.
+    API 좌표가 없는 보호소만 `care_addr`를 지오코딩하며, 결과는 주소 기준으로 열 전체에 한 번에 붙입니다.
+    """
+    started = time.perf_counter()
+    df = shelter_df.copy()
+    missing = pd.Series(np.nan, index=df.index)
+    lat_api = pd.to_numeric(df['lat_api'], errors='coerce') if 'lat_api' in df.columns else missing
+    lon_api = pd.to_numeric(df['lon_api'], errors='coerce') if 'lon_api' in df.columns else missing
+    has_api = lat_api.notna() & lon_api.notna() & (lat_api != 0) & (lon_api != 0)
+
+    care_addr = df['care_addr'] if 'care_addr' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    addresses = care_addr[~has_api & care_addr.notna()].unique()
+    geocoded = geocode_addresses(addresses, lookup, client=client, cache=cache) if len(addresses) else {}
+
+    found = {address: coords for address, coords in geocoded.items() if coords}
+    lat_geo = care_addr.map({address: coords[0] for address, coords in found.items()})
+    lon_geo = care_addr.map({address: coords[1] for address, coords in found.items()})
+    has_geo = ~has_api & lat_geo.notna() & lon_geo.notna()
+
+    df['lat'] = lat_api.where(has_api, lat_geo.where(has_geo)).astype(float)
+    df['lon'] = lon_api.where(has_api, lon_geo.where(has_geo)).astype(float)
+    df['geo_source'] = np.select([has_api, has_geo], [GEO_SOURCE_API, GEO_SOURCE_GEOCODE], GEO_SOURCE_UNRESOLVED)
+
+    total = len(df)
+    n_api, n_geo = int(has_api.sum()), int(has_geo.sum())
+    n_unresolved = total - n_api - n_geo
+    coverage = (n_api + n_geo) / total * 100 if total else 100.0
+    elapsed = time.perf_counter() - started
+    print(f"[TIMING] 좌표 결정 소요 시간: {elapsed:.1f}초 (보호소 {total}곳: API 좌표 {n_api}곳, 지오코딩 {n_geo}곳, "
+          f"미해결 {n_unresolved}곳, 좌표 확보율 {coverage:.1f}%)")
+    if n_unresolved:
+        unresolved_names = df.loc[df['geo_source'] == GEO_SOURCE_UNRESOLVED, 'shelter_name'].head(5).tolist()
+        print(f"[DEBUG] 좌표 미해결 보호소 예시: {unresolved_names}")
+    return df
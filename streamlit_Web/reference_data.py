@@ -0,0 +1,217 @@
+# ==============================================================================
+# reference_data.py - 코드 목록(시/도, 시/군/구, 품종) 로컬 캐시와 백그라운드 갱신
+# ==============================================================================
+# 사이드바의 시/도 목록은 앱을 처음 띄울 때마다, 시/군/구 목록은 새 시/도를 고를 때마다
+# 공공데이터포털 API를 호출했습니다. 첫 화면이 외부 API 응답을 기다리고, API가 멈추면
+# 앱도 지역 필터 없이 떠야 했습니다. 품종 목록은 세 축종을 차례로 페이지 단위로 받았습니다.
+#
+# 코드 목록은 거의 바뀌지 않으므로 로컬 SQLite 파일(`ReferenceStore`)에 저장해 두고
+# 바로 꺼내 씁니다.
+#
+# [조회 - `ReferenceData.get`]
+# 1. 메모리에 있으면 바로 반환합니다.
+# 2. 없으면 로컬 파일에서 읽어 반환합니다. (오래된 목록이어도 먼저 보여 줌)
+# 3. 파일에도 없을 때(처음 실행)만 API를 바로 호출합니다. 실패하면 빈 목록을 반환하고
+#    다음 조회에서 다시 시도합니다. (API가 멈춰도 앱은 뜹니다.)
+#
+# [백그라운드 갱신]
+# `start()`로 띄운 스레드가 `refresh_hours`보다 오래된 목록을 API로 다시 받아
+# 파일과 메모리를 바꿉니다. 갱신에 실패하면 기존 목록을 그대로 씁니다.
+#
+# [설정]
+# `config.ini`의 [REFERENCE] 섹션(선택)
+#   cache_path = streamlit_Web/data/reference_cache.sqlite3
+#   refresh_hours = 24
+# ==============================================================================
+
+import configparser
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from api_client import get_api_endpoints, get_client
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+DEFAULT_CACHE_PATH = os.path.join(streamlit_web_dir, 'data', 'reference_cache.sqlite3')
+
+# 축종 코드 (개, 고양이, 기타)
+UPKIND_CODES = ['417000', '422400', '429900']
+
+
+def get_reference_config() -> dict:
+    """`config.ini`의 [REFERENCE] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    reference_config = {'cache_path': DEFAULT_CACHE_PATH, 'refresh_hours': 24.0}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'REFERENCE' in config:
+        section = config['REFERENCE']
+        cache_path = section.get('cache_path')
+        if cache_path:
+            reference_config['cache_path'] = cache_path if os.path.isabs(cache_path) else os.path.join(project_root, cache_path)
+        reference_config['refresh_hours'] = section.getfloat('refresh_hours', reference_config['refresh_hours'])
+    return reference_config
+
+
+# --- API 조회 (실패하면 예외) ---
+def _items(root, fields: dict) -> list:
+    return [{key: item.findtext(tag) for key, tag in fields.items()} for item in root.findall('.//item')]
+
+
+def fetch_sido_list(api_key: str, client=None) -> list:
+    client = client or get_client()
+    root = client.get_xml(get_api_endpoints()['sido'], {'serviceKey': api_key, 'numOfRows': 100, '_type': 'xml'})
+    if root is None:
+        raise ValueError("시/도 목록 응답이 비어 있습니다.")
+    return _items(root, {'code': 'orgCd', 'name': 'orgdownNm'})
+
+
+def fetch_sigungu_list(api_key: str, sido_code: str, client=None) -> list:
+    client = client or get_client()
+    root = client.get_xml(get_api_endpoints()['sigungu'], {'serviceKey': api_key, 'upr_cd': sido_code, '_type': 'xml'})
+    if root is None:
+        raise ValueError(f"시/군/구 목록({sido_code}) 응답이 비어 있습니다.")
+    return _items(root, {'code': 'orgCd', 'name': 'orgdownNm'})
+
+
+def fetch_kind_list(api_key: str, upkind_code: str = '', client=None) -> list:
+    """축종의 품종 목록을 모든 페이지에 걸쳐 받습니다. `upkind_code`가 없으면 세 축종을 동시에 받습니다."""
+    client = client or get_client()
+    if not upkind_code:
+        kinds = [kind for kinds in client.map(lambda code: fetch_kind_list(api_key, code, client), UPKIND_CODES)
+                 for kind in kinds]
+        return list({kind['code']: kind for kind in kinds}.values())
+
+    kinds, page_no = [], 1
+    while True:
+        root = client.get_xml(get_api_endpoints()['kind'], {'serviceKey': api_key, 'up_kind_cd': upkind_code,
+                                                           'pageNo': page_no, 'numOfRows': 1000, '_type': 'xml'})
+        if root is None or root.findtext('.//resultCode') != '00':
+            raise ValueError(f"품종 목록({upkind_code}) 조회 실패")
+        page = _items(root, {'code': 'kindCd', 'name': 'kindNm'})
+        kinds.extend(page)
+        if not page or len(kinds) >= int(root.findtext('.//totalCount') or 0):
+            return list({kind['code']: kind for kind in kinds}.values())
+        page_no += 1
+
+
+class ReferenceStore:
+    """코드 목록을 {키: (목록, 받은 시각)}으로 저장하는 SQLite 파일입니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 백그라운드 갱신 스레드와 요청 스레드가 함께 쓰므로 잠금으로 보호합니다.
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS reference_lists (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def load_all(self) -> dict:
+        with self._lock:
+            rows = self.conn.execute("SELECT key, payload, fetched_at FROM reference_lists").fetchall()
+        return {key: (json.loads(payload), fetched_at) for key, payload, fetched_at in rows}
+
+    def put(self, key: str, items: list, fetched_at: float):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO reference_lists (key, payload, fetched_at) VALUES (?, ?, ?)",
+                              (key, json.dumps(items, ensure_ascii=False), fetched_at))
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class ReferenceData:
+    """
+    코드 목록을 메모리 → 로컬 파일 → API 순서로 찾아 반환하고, 오래된 목록은 백그라운드에서 갱신합니다.
+    키는 'sido', 'sigungu_<시/도 코드>', 'kind_<축종 코드>'('kind_'는 전체 축종)입니다.
+    """
+
+    def __init__(self, api_key: str, store: ReferenceStore, refresh_hours: float = 24, client=None):
+        self.api_key = api_key
+        self.store = store
+        self.refresh_seconds = refresh_hours * 3600
+        self.client = client or get_client()
+        self._lock = threading.Lock()
+        self._lists = store.load_all()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, api_key: str):
+        reference_config = get_reference_config()
+        return cls(api_key, ReferenceStore(reference_config['cache_path']), reference_config['refresh_hours'])
+
+    def _fetch(self, key: str) -> list:
+        kind, _, code = key.partition('_')
+        if kind == 'sido':
+            return fetch_sido_list(self.api_key, self.client)
+        if kind == 'sigungu':
+            return fetch_sigungu_list(self.api_key, code, self.client)
+        if kind == 'kind':
+            return fetch_kind_list(self.api_key, code, self.client)
+        raise KeyError(key)
+
+    def refresh(self, key: str) -> bool:
+        """`key`의 목록을 API로 다시 받아 저장합니다. 실패하면 기존 목록을 유지하고 False를 반환합니다."""
+        try:
+            items = self._fetch(key)
+        except Exception as e:
+            print(f"경고: 코드 목록({key}) 갱신 실패, 저장된 목록을 사용합니다: {e}")
+            return False
+        fetched_at = time.time()
+        self.store.put(key, items, fetched_at)
+        with self._lock:
+            self._lists[key] = (items, fetched_at)
+        return True
+
+    def get(self, key: str) -> list:
+        with self._lock:
+            cached = self._lists.get(key)
+        if cached is not None:
+            return cached[0]
+        # 처음 보는 목록만 요청 경로에서 API를 호출합니다.
+        self.refresh(key)
+        with self._lock:
+            cached = self._lists.get(key)
+        return cached[0] if cached is not None else []
+
+    def stale_keys(self) -> list:
+        now = time.time()
+        with self._lock:
+            return [key for key, (_, fetched_at) in self._lists.items() if now - fetched_at >= self.refresh_seconds]
+
+    def start(self):
+        """오래된 목록을 주기적으로 갱신하는 데몬 스레드를 시작합니다. (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='reference-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # 갱신할 목록이 없어도 최소 1분 간격으로 다시 확인합니다.
+        interval = max(min(self.refresh_seconds, 3600), 60)
+        while not self._stop.is_set():
+            stale = self.stale_keys()
+            if stale:
+                started = time.perf_counter()
+                refreshed = sum(self.refresh(key) for key in stale)
+                print(f"[코드 목록] {refreshed}/{len(stale)}개 갱신 ({time.perf_counter() - started:.1f}초)")
+            self._stop.wait(interval)
@@ -0,0 +1,109 @@
+# ==============================================================================
+# region_codes.py - 보호소 주소 → 시/도·시/군/구 코드
+# ==============================================================================
+# 사이드바의 지역 필터는 예전에는 요청마다 `care_addr.str.startswith(시/도)`처럼
+# 주소 문자열을 비교했습니다. 이 방식은 매번 문자열을 훑어야 하고, "서울"과
+# "서울특별시", "강원도"와 "강원특별자치도"처럼 표기가 다른 주소를 놓칩니다.
+#
+# ETL(`update_data.preprocess_data`)에서 보호소 주소를 한 번만 해석하여, 공공데이터포털의
+# 공식 목록(`sido_v2`, `sigungu_v2`)의 기관 코드(`orgCd`)를 정수 컬럼
+# `sido_code`, `sigungu_code`로 저장합니다. 앱은 이 정수 컬럼으로 지역을 비교합니다.
+#
+# [해석 규칙]
+# - 공백을 정리한 주소가 시/도 이름(공식 이름 또는 `SIDO_NAME_GROUPS`의 다른 표기)으로
+#   시작하면 그 시/도로 봅니다. 다른 표기는 뒤에 공백이 오거나 주소가 끝나야 합니다.
+# - 나머지 주소가 그 시/도의 시/군/구 공식 이름으로 시작하면 그 시/군/구로 봅니다.
+#   여러 이름이 맞으면 가장 긴 이름을 고릅니다. (예: "수원시 장안구" > "수원시")
+# - 해석하지 못한 부분은 NULL로 남기고, 적재 전에 해석률을 출력합니다.
+# ==============================================================================
+
+import time
+
+import pandas as pd
+
+# 같은 시/도를 가리키는 표기 (공식 목록의 이름이 어느 쪽이든 나머지를 다른 표기로 인정)
+SIDO_NAME_GROUPS = [
+    ['서울특별시', '서울시', '서울'],
+    ['부산광역시', '부산시', '부산'],
+    ['대구광역시', '대구시', '대구'],
+    ['인천광역시', '인천시', '인천'],
+    ['광주광역시', '광주'],  # '광주시'는 경기도 광주시와 겹치므로 제외
+    ['대전광역시', '대전시', '대전'],
+    ['울산광역시', '울산시', '울산'],
+    ['세종특별자치시', '세종시', '세종'],
+    ['경기도', '경기'],
+    ['강원특별자치도', '강원도', '강원'],
+    ['충청북도', '충북'],
+    ['충청남도', '충남'],
+    ['전북특별자치도', '전라북도', '전북'],
+    ['전라남도', '전남'],
+    ['경상북도', '경북'],
+    ['경상남도', '경남'],
+    ['제주특별자치도', '제주도', '제주'],
+]
+
+
+def parse_code(code) -> int | None:
+    """기관 코드(`orgCd`) 문자열을 정수로 바꿉니다. 숫자가 아니면 None을 반환합니다."""
+    code = str(code or '').strip()
+    return int(code) if code.isdigit() else None
+
+
+class RegionTable:
+    """공식 시/도·시/군/구 목록으로 주소를 (시/도 코드, 시/군/구 코드)로 해석합니다."""
+
+    def __init__(self, sido_list: list, sigungu_lists: dict):
+        """
+        `sido_list`: [{'code', 'name'}, ...] (`sido_v2`)
+        `sigungu_lists`: {시/도 코드: [{'code', 'name'}, ...]} (`sigungu_v2`)
+        """
+        aliases = {name: group for group in SIDO_NAME_GROUPS for name in group}
+        self._sido_names = []   # (이름, 시/도 코드, 공식 이름 여부)
+        self._sigungu_names = {}
+        for sido in sido_list:
+            sido_code = parse_code(sido.get('code'))
+            name = (sido.get('name') or '').strip()
+            if sido_code is None or not name:
+                continue
+            self._sido_names.append((name, sido_code, True))
+            self._sido_names.extend((alias, sido_code, False) for alias in aliases.get(name, []) if alias != name)
+            sigungu_names = []
+            for sigungu in sigungu_lists.get(sido.get('code')) or []:
+                sigungu_code = parse_code(sigungu.get('code'))
+                sigungu_name = ' '.join((sigungu.get('name') or '').split())
+                # 하위 목록이 없는 시/도는 시/도 자신을 시/군/구로 넣어 조회하므로 제외합니다.
+                if sigungu_code is not None and sigungu_name and sigungu_code != sido_code:
+                    sigungu_names.append((sigungu_name, sigungu_code))
+            self._sigungu_names[sido_code] = sorted(sigungu_names, key=lambda item: -len(item[0]))
+        self._sido_names.sort(key=lambda item: -len(item[0]))
+
+    def parse(self, address) -> tuple[int | None, int | None]:
+        """주소 하나를 (시/도 코드, 시/군/구 코드)로 해석합니다."""
+        if not isinstance(address, str):
+            return None, None
+        address = ' '.join(address.split())
+        for name, sido_code, official in self._sido_names:
+            if not address.startswith(name):
+                continue
+            rest = address[len(name):]
+            if not official and rest and not rest.startswith(' '):
+                continue
+            rest = rest.lstrip()
+            for sigungu_name, sigungu_code in self._sigungu_names.get(sido_code, []):
+                if rest.startswith(sigungu_name):
+                    return sido_code, sigungu_code
+            return sido_code, None
+        return None, None
+
+    def assign_codes(self, df: pd.DataFrame, addr_col: str = 'care_addr') -> pd.DataFrame:
+        """`df`에 정수 컬럼 `sido_code`, `sigungu_code`를 추가합니다. 같은 주소는 한 번만 해석합니다."""
+        started = time.perf_counter()
+        df = df.copy()
+        addresses = df[addr_col]
+        codes = {address: self.parse(address) for address in addresses.dropna().unique()}
+        parsed = addresses.map(codes)
+        df['sido_code'] = pd.array([c[0] if isinstance(c, tuple) else None for c in parsed], dtype='Int64')
+        df['sigungu_code'] = pd.array([c[1] if isinstance(c, tuple) else None for c in parsed], dtype='Int64')
+        print(f"[TIMING] 지역 코드 해석: 보호소 {len(df)}곳 (주소 {len(codes)}개) → 시/도 {int(df['sido_code'].notna().sum())}곳, "
+              f"시/군/구 {int(df['sigungu_code'].notna().sum())}곳 해석 ({time.perf_counter() - started:.2f}초)")
+        return df
@@ -0,0 +1,165 @@
+# ==============================================================================
+# response_archive.py - API 원본 응답 기록/재생 (record / replay)
+# ==============================================================================
+# 공공데이터포털/카카오 API의 원본 응답을 로컬 디스크에 저장해 두고,
+# 같은 요청을 네트워크 없이 다시 재생할 수 있게 합니다.
+# 네트워크가 없는 환경에서 ETL 전체(`fetch_*` → `preprocess_data` →
+# `update_database`)를 같은 입력으로 반복 실행하여 성능을 측정하거나
+# 결과를 비교할 때 사용합니다.
+#
+# [모드]
+# - **live:** 기록/재생 없이 실제 API만 호출합니다. (기본값)
+# - **record:** 실제 API를 호출하고, 성공한 응답을 아카이브에 저장합니다.
+# - **replay:** 아카이브에 저장된 응답만 사용합니다. 없는 요청은
+#   `ArchiveMissError`(requests 예외의 하위 클래스)로 실패합니다.
+#
+# [저장 형식]
+# - **키:** 엔드포인트 URL과 정렬된 요청 파라미터의 SHA-256 해시.
+#   인증키(`serviceKey`)는 키와 메타데이터에서 제외하고, 헤더(카카오 인증키)는
+#   키에 포함하지 않으므로, 다른 인증키로 기록한 아카이브도 재생할 수 있습니다.
+# - **파일:** `<아카이브>/<해시 앞 2자리>/<해시>.body.gz` (gzip 압축한 응답 본문)과
+#   `<해시>.json` (URL, 파라미터, 상태 코드, Content-Type, 기록 시각)
+#
+# [설정]
+# `config.ini`의 [HTTP_ARCHIVE] 섹션(선택). `update_data.py --http-mode`,
+# `--archive-dir` 옵션이 우선합니다.
+#   mode = live
+#   path = streamlit_Web/data/http_archive
+# ==============================================================================
+
+import configparser
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+DEFAULT_ARCHIVE_PATH = os.path.join(streamlit_web_dir, 'data', 'http_archive')
+
+ARCHIVE_MODES = ('live', 'record', 'replay')
+REDACTED_PARAMS = {'serviceKey', 'ServiceKey', 'servicekey'}
+
+
+class ArchiveMissError(requests.exceptions.RequestException):
+    """replay 모드에서 아카이브에 없는 요청을 보냈을 때 발생합니다."""
+
+
+def get_archive_config() -> dict:
+    """`config.ini`의 [HTTP_ARCHIVE] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    archive_config = {'mode': 'live', 'path': DEFAULT_ARCHIVE_PATH}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'HTTP_ARCHIVE' in config:
+        section = config['HTTP_ARCHIVE']
+        archive_config['mode'] = section.get('mode', archive_config['mode'])
+        path = section.get('path')
+        if path:
+            archive_config['path'] = path if os.path.isabs(path) else os.path.join(project_root, path)
+    return archive_config
+
+
+def _canonical_params(params: dict | None) -> dict:
+    """인증키를 뺀 파라미터를 키 이름순, 문자열 값으로 정리합니다."""
+    return {str(k): str(v) for k, v in sorted((params or {}).items()) if k not in REDACTED_PARAMS}
+
+
+def request_key(url: str, params: dict | None = None) -> str:
+    """요청(엔드포인트 + 인증키를 뺀 파라미터)의 아카이브 키를 반환합니다."""
+    canonical = json.dumps({'url': url, 'params': _canonical_params(params)}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResponseArchive:
+    """요청 키별로 응답 본문을 저장하고 다시 읽어 오는 디스크 아카이브입니다."""
+
+    def __init__(self, path: str, mode: str = 'record'):
+        if mode not in ARCHIVE_MODES:
+            raise ValueError(f"지원하지 않는 아카이브 모드입니다: {mode} (가능한 값: {', '.join(ARCHIVE_MODES)})")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._stats = {'recorded': 0, 'replayed': 0, 'missed': 0}
+        if mode == 'record':
+            os.makedirs(path, exist_ok=True)
+        elif mode == 'replay' and not os.path.isdir(path):
+            raise FileNotFoundError(f"재생할 아카이브 폴더가 없습니다: {path}")
+
+    @classmethod
+    def from_config(cls, mode: str | None = None, path: str | None = None):
+        """설정으로 아카이브를 만듭니다. live 모드면 None을 반환합니다."""
+        archive_config = get_archive_config()
+        mode = mode or archive_config['mode']
+        if mode == 'live':
+            return None
+        return cls(path or archive_config['path'], mode)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = os.path.join(self.path, key[:2], key)
+        return base + '.body.gz', base + '.json'
+
+    def load(self, url: str, params: dict | None = None) -> requests.Response:
+        """저장된 응답을 `requests.Response`로 만들어 반환합니다."""
+        key = request_key(url, params)
+        body_path, meta_path = self._paths(key)
+        if not os.path.exists(body_path):
+            with self._lock:
+                self._stats['missed'] += 1
+            raise ArchiveMissError(f"아카이브에 없는 요청입니다: {url} {_canonical_params(params)}")
+
+        with gzip.open(body_path, 'rb') as f:
+            content = f.read()
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+
+        response = requests.Response()
+        response._content = content
+        response.status_code = meta.get('status_code', 200)
+        response.url = meta.get('url', url)
+        response.encoding = 'utf-8'
+        if meta.get('content_type'):
+            response.headers['Content-Type'] = meta['content_type']
+        with self._lock:
+            self._stats['replayed'] += 1
+        return response
+
+    def save(self, url: str, params: dict | None, response: requests.Response):
+        """성공한 응답 본문과 메타데이터를 저장합니다. 같은 요청은 덮어씁니다."""
+        key = request_key(url, params)
+        body_path, meta_path = self._paths(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        meta = {
+            'url': url,
+            'params': _canonical_params(params),
+            'status_code': response.status_code,
+            'content_type': response.headers.get('Content-Type'),
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        # 동시에 같은 요청을 기록해도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(body_path + suffix, 'wb') as f:
+            f.write(response.content)
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(body_path + suffix, body_path)
+        os.replace(meta_path + suffix, meta_path)
+        with self._lock:
+            self._stats['recorded'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
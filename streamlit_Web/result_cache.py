@@ -0,0 +1,174 @@
+# ==============================================================================
+# result_cache.py - 필터 결과 캐시 (LRU, 메모리 예산)
+# ==============================================================================
+# `get_filtered_data`는 `st.cache_data`로 캐시되어, (기간, 시/도, 시/군/구, 축종) 조합마다
+# 데이터프레임 복사본을 담은 항목이 제한 없이 쌓였습니다. 사용자가 날짜 선택기를 움직일 때마다
+# 새 조합이 생기므로 서버 메모리가 계속 늘어납니다.
+#
+# `ResultCache`는 필터 결과를 최근에 쓴 순서(LRU)로 보관하고, 전체 크기가 `max_mb`를
+# 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다. 항목 크기는 결과 데이터프레임의
+# `memory_usage(deep=True)` 합계입니다. 혼자서 예산의 절반을 넘는 결과는 저장하지 않습니다.
+#
+# [포함 관계 재사용]
+# 키가 `covers(다른 키)` 메서드를 가지면(예: `filter_query.FilterKey`), 정확히 같은 키가 없을 때
+# 새 요청을 포함하는 더 넓은 결과를 찾아 `derive(넓은 결과)`로 좁힙니다. 전체 테이블 대신
+# 이미 걸러 둔 작은 결과만 다시 거르면 되므로, 사용자가 시/도 → 시/군/구 → 축종 순서로
+# 조건을 좁히거나 기간을 줄일 때 빠르게 응답합니다. 포함하는 결과가 여럿이면 가장 작은 것을 씁니다.
+# 실패한 계산(`compute()`의 예외)은 저장하지 않으므로 포함하는 결과로 쓰이지 않습니다.
+# `derive`가 실패하면 그 넓은 결과를 지우고 `compute()`로 새로 계산합니다.
+#
+# `stats()`로 항목 수, 사용 중인 바이트, 적중(`hits`)/포함 결과 재사용(`subsumed`)/
+# 실패(`misses`)/제거/저장 거부 횟수를 확인할 수 있습니다.
+#
+# [설정]
+# `config.ini`의 [RESULT_CACHE] 섹션(선택)
+#   max_mb = 256      ; 필터 결과 캐시의 메모리 예산 (0이면 캐시하지 않음)
+# ==============================================================================
+
+import configparser
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+
+# 한 항목이 예산에서 차지할 수 있는 최대 비율
+MAX_ENTRY_RATIO = 0.5
+
+
+def get_result_cache_config() -> dict:
+    """`config.ini`의 [RESULT_CACHE] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    cache_config = {'max_mb': 256.0}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'RESULT_CACHE' in config:
+        cache_config['max_mb'] = config['RESULT_CACHE'].getfloat('max_mb', cache_config['max_mb'])
+    return cache_config
+
+
+def result_nbytes(value) -> int:
+    """결과(데이터프레임 또는 데이터프레임을 담은 tuple)의 메모리 크기(바이트)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, tuple):
+        return sum(result_nbytes(item) for item in value)
+    return 0
+
+
+def _shallow_copy(value):
+    # 캐시에 있는 데이터프레임을 호출한 쪽이 바꾸지 않도록, 데이터는 공유하고 틀만 새로 만들어 반환합니다.
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_shallow_copy(item) for item in value)
+    return value
+
+
+class ResultCache:
+    """메모리 예산(`max_mb`) 안에서 최근에 쓴 결과를 보관하는 LRU 캐시입니다. (여러 세션이 공유)"""
+
+    def __init__(self, max_mb: float = 256):
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # 키 → (결과, 바이트)
+        self._bytes = 0
+        self._stats = {'hits': 0, 'subsumed': 0, 'misses': 0, 'evictions': 0, 'rejected': 0}
+
+    @classmethod
+    def from_config(cls):
+        return cls(get_result_cache_config()['max_mb'])
+
+    def get(self, key):
+        """캐시된 결과를 반환합니다. 없으면 None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+        return _shallow_copy(entry[0])
+
+    def put(self, key, value) -> bool:
+        """결과를 저장하고, 예산을 넘으면 오래된 항목부터 지웁니다. 저장하지 않았으면 False를 반환합니다."""
+        nbytes = result_nbytes(value)
+        with self._lock:
+            if nbytes > self.max_bytes * MAX_ENTRY_RATIO:
+                self._stats['rejected'] += 1
+                return False
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self._stats['evictions'] += 1
+        return True
+
+    def _find_covering_entry(self, key):
+        with self._lock:
+            covering = [(nbytes, cached_key) for cached_key, (_, nbytes) in self._entries.items()
+                        if cached_key != key and hasattr(cached_key, 'covers') and cached_key.covers(key)]
+            if not covering:
+                return None, None
+            _, cached_key = min(covering, key=lambda item: item[0])
+            self._entries.move_to_end(cached_key)
+            return cached_key, self._entries[cached_key][0]
+
+    def find_covering(self, key):
+        """`key`를 포함하는(`cached_key.covers(key)`) 결과 중 가장 작은 것을 반환합니다. 없으면 None."""
+        return self._find_covering_entry(key)[1]
+
+    def discard(self, key):
+        """항목이 있으면 지웁니다."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def get_or_compute(self, key, compute, derive=None):
+        """
+        캐시된 결과가 있으면 반환하고, 없으면 포함하는 결과를 `derive(결과)`로 좁히거나
+        (`derive`가 있을 때) `compute()`로 새로 계산한 뒤 저장하여 반환합니다.
+        `compute()`가 예외를 내면 아무것도 저장하지 않고 그대로 올립니다. (실패한 결과를 캐시하지 않음)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return _shallow_copy(entry[0])
+        covering_key, covering = self._find_covering_entry(key) if derive is not None else (None, None)
+        value, stat = None, 'misses'
+        if covering_key is not None:
+            try:
+                value, stat = derive(covering), 'subsumed'
+            except Exception as e:
+                # 넓은 결과가 잘못되었으면 좁힌 결과도 모두 틀리므로, 지우고 새로 계산합니다.
+                print(f"경고: 캐시된 결과를 좁히지 못해 다시 계산합니다: {e}")
+                self.discard(covering_key)
+        if stat == 'misses':
+            value = compute()
+        with self._lock:
+            self._stats[stat] += 1
+        self.put(key, value)
+        return _shallow_copy(value)
+
+    def clear(self):
+        """모든 항목을 지웁니다. (누적 적중/실패/제거 횟수는 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes)
@@ -0,0 +1,174 @@
+# ==============================================================================
+# schema.py - `animals` / `shelters` 테이블 스키마와 데이터프레임 타입
+# ==============================================================================
+# `to_sql`이 타입을 정하게 두면 모든 문자열 컬럼이 TEXT가 되고, `load_data`가
+# 읽어 온 데이터프레임도 모든 문자열을 파이썬 객체(object)로 들고 있게 됩니다.
+# 세션 캐시마다 이 데이터가 복사되므로, 컬럼 타입을 여기서 명시합니다.
+#
+# - **DB (적재 시):** 크기를 정한 VARCHAR, 값이 정해진 컬럼은 ENUM, 공고일은 DATE.
+#   스키마에 없는 컬럼(보호소 API의 추가 필드 등)은 기존처럼 pandas가 타입을 정합니다.
+#   `conform_frame`이 적재 전에 ENUM에 없는 값은 NULL로, 길이를 넘는 문자열은 잘라서
+#   MySQL strict 모드에서도 적재가 실패하지 않게 합니다.
+# - **키/인덱스:** `TABLE_INDEXES`에 기본 키, UNIQUE 키, 보조 인덱스를 정의합니다.
+#   보호소별/기간별 조회와 유기번호 조회가 전체 스캔 대신 인덱스를 사용합니다.
+# - **데이터프레임 (읽을 때):** `apply_frame_dtypes`가 값의 종류가 적은 컬럼
+#   (보호소 이름, 축종, 상태, 성별, 품종, 색상 등)은 `category`로, 나머지 문자열은
+#   pyarrow가 있으면 Arrow 문자열(`string[pyarrow_numpy]`, 결측값은 NaN)로 바꿉니다.
+#
+# 메모리 비교는 `benchmarks/bench_frame_memory.py`를 참고하세요.
+# ==============================================================================
+
+import pandas as pd
+from sqlalchemy import Date, Double, Enum, Integer, String, Text
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype('pyarrow_numpy')
+except ImportError:
+    STRING_DTYPE = object
+
+UPKIND_NAMES = ('개', '고양이', '기타')
+SEX_CODES = ('M', 'F', 'Q')
+NEUTER_CODES = ('Y', 'N', 'U')
+GEO_SOURCES = ('api', 'geocode', 'unresolved')
+
+# 테이블별 컬럼 타입 (DB)
+TABLE_SCHEMAS = {
+    'animals': {
+        'desertion_no': String(30),
+        'shelter_name': String(100),
+        'animal_name': String(150),
+        'species': String(100),
+        'kind_name': String(100),
+        'age': String(30),
+        'upkind_name': Enum(*UPKIND_NAMES, name='upkind_name'),
+        'image_url': String(500),
+        'personality': String(100),
+        'special_mark': Text(),
+        'notice_date': Date(),
+        'notice_no': String(100),
+        'sex': Enum(*SEX_CODES, name='sex'),
+        'neuter': Enum(*NEUTER_CODES, name='neuter'),
+        'color': String(100),
+        'weight': String(50),
+        'care_tel': String(50),
+        'care_addr': String(255),
+        'happen_place': String(255),
+        'process_state': String(30),
+    },
+    'shelters': {
+        'shelter_name': String(100),
+        'region': String(50),
+        'count': Integer(),
+        'long_term': Integer(),
+        'adopted': Integer(),
+        'species': String(100),
+        'kind_name': String(100),
+        'image_url': String(500),
+        'care_reg_no': String(30),
+        'care_tel': String(50),
+        'data_std_dt': String(20),
+        'care_addr': String(255),
+        'lat': Double(),
+        'lon': Double(),
+        'geo_source': Enum(*GEO_SOURCES, name='geo_source'),
+        'sido_code': Integer(),
+        'sigungu_code': Integer(),
+    },
+    # 웹 스크래핑 테이블은 기본 키 컬럼(사이트 링크)만 타입을 정합니다.
+    'web_cats': {'사이트링크': String(255)},
+    'web_dogs': {'사이트링크': String(255)},
+}
+
+# 데이터프레임에서 category로 둘 컬럼 (값의 종류가 행 수보다 훨씬 적은 컬럼)
+CATEGORY_COLUMNS = {
+    'animals': ['shelter_name', 'animal_name', 'species', 'kind_name', 'age', 'upkind_name', 'personality',
+                'sex', 'neuter', 'color', 'weight', 'care_tel', 'care_addr', 'process_state'],
+    'shelters': ['region', 'geo_source'],
+}
+DATE_COLUMNS = {'animals': ['notice_date']}
+
+# 테이블별 기본 키와 보조 인덱스: (종류, 이름, 컬럼 목록). 종류는 PRIMARY / UNIQUE / INDEX입니다.
+# 적재할 때마다 `db_loader.create_indexes`가 같은 이름으로 다시 만들어, 테이블을
+# 교체(swap/replace)해도 인덱스가 유지됩니다.
+TABLE_INDEXES = {
+    'animals': [
+        ('PRIMARY', 'PRIMARY', ['desertion_no']),
+        ('INDEX', 'idx_animals_notice_date', ['notice_date']),
+        ('INDEX', 'idx_animals_shelter_notice', ['shelter_name', 'notice_date']),
+        ('INDEX', 'idx_animals_upkind_notice', ['upkind_name', 'notice_date']),
+    ],
+    'shelters': [
+        ('UNIQUE', 'uk_shelters_shelter_name', ['shelter_name']),
+        ('INDEX', 'idx_shelters_region', ['sido_code', 'sigungu_code']),
+        ('INDEX', 'idx_shelters_sigungu', ['sigungu_code']),
+    ],
+    'web_cats': [
+        ('PRIMARY', 'PRIMARY', ['사이트링크']),
+    ],
+    'web_dogs': [
+        ('PRIMARY', 'PRIMARY', ['사이트링크']),
+    ],
+}
+COUNT_COLUMNS = {'shelters': ['count', 'long_term', 'adopted']}
+
+
+def column_types(table: str, columns) -> dict:
+    """`to_sql(dtype=...)`에 넘길 {컬럼: 타입}을 반환합니다. 스키마에 없는 컬럼은 포함하지 않습니다."""
+    schema = TABLE_SCHEMAS.get(table, {})
+    return {col: schema[col] for col in columns if col in schema}
+
+
+def conform_frame(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """적재 전에 데이터프레임 값을 스키마에 맞춥니다. (ENUM 외 값 → NULL, 긴 문자열 → 자르기)"""
+    df = df.copy()
+    for col, col_type in column_types(table, df.columns).items():
+        if isinstance(col_type, Enum):
+            invalid = df[col].notna() & ~df[col].isin(col_type.enums)
+            if invalid.any():
+                print(f"[스키마] {table}.{col}: 허용되지 않은 값 {int(invalid.sum())}건을 NULL로 바꿉니다. "
+                      f"({sorted(df.loc[invalid, col].astype(str).unique())[:5]})")
+                df[col] = df[col].where(~invalid, None)
+        elif isinstance(col_type, String) and col_type.length:
+            too_long = df[col].astype('string').str.len() > col_type.length
+            if too_long.any():
+                print(f"[스키마] {table}.{col}: {col_type.length}자를 넘는 값 {int(too_long.sum())}건을 자릅니다.")
+                df.loc[too_long, col] = df.loc[too_long, col].str.slice(0, col_type.length)
+        elif isinstance(col_type, Date):
+            df[col] = pd.to_datetime(df[col], errors='coerce').dt.date
+    for col in COUNT_COLUMNS.get(table, []):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int64')
+    return df
+
+
+def _as_category(series: pd.Series) -> pd.Series:
+    converted = series.astype('category')
+    if converted.cat.categories.dtype != object:
+        # Arrow 문자열 컬럼(`table_reader.read_table_chunked`)에서 만든 category도 범주 값은 object로 둡니다.
+        categories = converted.cat.categories.astype(object)
+        converted = pd.Series(pd.Categorical.from_codes(converted.cat.codes, categories=categories),
+                              index=series.index, name=series.name)
+    return converted
+
+
+def apply_frame_dtypes(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """DB에서 읽은 데이터프레임의 컬럼 타입을 메모리를 적게 쓰는 타입으로 바꿉니다."""
+    if df.empty:
+        return df
+    category_cols = set(CATEGORY_COLUMNS.get(table, []))
+    date_cols = set(DATE_COLUMNS.get(table, []))
+    converted = {}
+    for col in df.columns:
+        if col in date_cols:
+            converted[col] = pd.to_datetime(df[col], errors='coerce')
+        elif col in category_cols:
+            converted[col] = _as_category(df[col])
+        elif df[col].dtype == object:
+            converted[col] = df[col].astype(STRING_DTYPE)
+    return df.assign(**converted) if converted else df
+
+
+def frame_memory_mb(df: pd.DataFrame) -> float:
+    """문자열 내용까지 포함한 데이터프레임 메모리 사용량(MB)을 반환합니다."""
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
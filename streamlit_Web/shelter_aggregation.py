@@ -0,0 +1,171 @@
+# ==============================================================================
+# shelter_aggregation.py - 동물 데이터 → 보호소별 집계
+# ==============================================================================
+# `update_data.preprocess_data`가 사용하는 보호소 집계 단계입니다.
+# `groupby(...).agg`에 파이썬 람다를 넘기면 그룹마다 파이썬 함수가 호출되어
+# 동물 수십만 건에서 크게 느려지므로, 모든 집계를 벡터 연산으로 계산합니다.
+#
+# - **그룹 키:** 보호소 이름을 정렬된 정수 코드로 한 번만 변환(`pd.factorize`)
+# - **count / long_term / adopted:** 불리언 배열을 만든 뒤 코드별 합계(`np.bincount`)
+# - **region:** 보호소별 첫 행의 주소에서 첫 단어(시/도)
+# - **species / kind_name (최빈값):** (보호소, 값)별 건수를 정렬하여 보호소마다
+#   첫 행을 고르는 정렬 기반 최빈값. 최빈값이 둘 이상인 보호소는 pandas
+#   `value_counts().index[0]`과 같은 정렬로 동률을 처리하여 결과가 기존 구현과
+#   동일하도록 합니다.
+#
+# 성능 비교는 `benchmarks/bench_shelter_aggregation.py`를 참고하세요.
+#
+# [델타 동기화 - `refresh_shelter_aggregates`]
+# 델타 동기화(`update_data.py --mode delta`)는 받은 동물 행만 적재하므로 데이터프레임으로는
+# 전체 집계를 할 수 없습니다. 대신 적재 트랜잭션 안에서 운영 `animals` 테이블 전체를
+# SQL로 집계하여 `shelters`의 집계 컬럼을 다시 씁니다. 최빈값이 둘 이상이면 이름순으로
+# 첫 값을 고르고, region은 보호소 주소 중 하나(사전순 첫 값)의 첫 단어이므로 동률·첫 행
+# 처리는 `aggregate_shelters`와 다를 수 있습니다. (MySQL 8 이상, 창 함수 사용)
+# ==============================================================================
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+ADOPTED_STATE = '종료(입양)'
+LONG_TERM_DAYS = 30
+
+# `animals`에서 집계하는 `shelters` 컬럼 (`refresh_shelter_aggregates`가 다시 씁니다)
+AGGREGATE_COLUMNS = ['region', 'count', 'long_term', 'adopted', 'species', 'kind_name', 'image_url']
+
+
+def _first_of_value_counts(counts: np.ndarray) -> int:
+    """
+    처음 나온 순서로 나열된 건수 배열에서 `value_counts().index[0]`이 고르는 위치를 반환합니다.
+    pandas의 내림차순 정렬(`nargsort`)과 같은 방식으로 정렬하여 동률 처리까지 일치시킵니다.
+    """
+    positions = np.arange(len(counts))[::-1]
+    return positions[counts[::-1].argsort(kind='quicksort')][::-1][0]
+
+
+def _first_valid(codes: np.ndarray, values: np.ndarray, valid: np.ndarray, n_groups: int) -> np.ndarray:
+    """그룹별로 처음 나오는 결측이 아닌 값을 반환합니다. (`groupby().first()`와 같음)"""
+    result = np.full(n_groups, np.nan, dtype=object)
+    valid_rows = np.flatnonzero(valid)
+    groups, first_pos = np.unique(codes[valid_rows], return_index=True)
+    result[groups] = values[valid_rows[first_pos]]
+    return result
+
+
+def _group_mode(codes: np.ndarray, values: np.ndarray, valid: np.ndarray, n_groups: int) -> np.ndarray:
+    """그룹별 최빈값을 정렬 기반으로 계산합니다. 값이 모두 결측인 그룹은 NaN입니다."""
+    result = np.full(n_groups, np.nan, dtype=object)
+    group_codes = codes[valid]
+    if not len(group_codes):
+        return result
+    value_codes, value_uniques = pd.factorize(values[valid])
+
+    # (그룹, 값) 쌍별 건수. factorize는 처음 나온 순서로 번호를 매기므로,
+    # 같은 그룹 안에서는 값이 처음 나온 순서가 유지됩니다.
+    pair_codes, pairs = pd.factorize(group_codes.astype(np.int64) * len(value_uniques) + value_codes)
+    n = np.bincount(pair_codes)
+    order = np.argsort(pairs // len(value_uniques), kind='stable')
+    pair_groups = (pairs // len(value_uniques))[order]
+    pair_values = (pairs % len(value_uniques))[order]
+    n = n[order]
+
+    starts = np.flatnonzero(np.r_[True, pair_groups[1:] != pair_groups[:-1]])
+    sizes = np.diff(np.r_[starts, len(pair_groups)])
+    is_max = n == np.repeat(np.maximum.reduceat(n, starts), sizes)
+    choice = np.empty(len(starts), dtype=np.int64)
+    max_rows = np.flatnonzero(is_max)
+    choice[np.repeat(np.arange(len(starts)), sizes)[max_rows]] = max_rows
+
+    # 최빈값이 둘 이상인 그룹만 기존 구현과 같은 동률 처리를 적용합니다.
+    for group in np.flatnonzero(np.add.reduceat(is_max, starts) > 1):
+        start = starts[group]
+        choice[group] = start + _first_of_value_counts(n[start:start + sizes[group]])
+
+    result[pair_groups[starts]] = value_uniques[pair_values[choice]]
+    return result
+
+
+def aggregate_shelters(animals_df: pd.DataFrame, now: pd.Timestamp | None = None) -> pd.DataFrame:
+    """동물 데이터를 보호소(`shelter_name`)별로 집계합니다. 결과는 보호소 이름순입니다."""
+    now = now or pd.Timestamp.now()
+    cutoff = now - pd.Timedelta(days=LONG_TERM_DAYS)
+
+    # 보호소 이름을 정렬된 정수 코드로 한 번만 바꾸고, 이후 집계는 모두 이 코드로 합니다.
+    codes, shelter_names = pd.factorize(animals_df['shelter_name'], sort=True)
+    has_shelter = codes >= 0
+    df = animals_df[has_shelter]
+    codes = codes[has_shelter]
+    n_groups = len(shelter_names)
+
+    def group_sum(mask):
+        return np.bincount(codes, weights=np.asarray(mask, dtype=np.int64), minlength=n_groups).astype(np.int64)
+
+    def column(name):
+        values = df[name].to_numpy(dtype=object)
+        return values, df[name].notna().to_numpy()
+
+    care_addr, care_addr_valid = column('care_addr')
+    species, species_valid = column('species')
+    kind_name, kind_name_valid = column('kind_name')
+
+    # region: 보호소별 첫 행의 주소에서 첫 단어, 주소가 하나도 없으면 '정보 없음'
+    _, first_rows = np.unique(codes, return_index=True)
+    region = pd.Series(care_addr[first_rows]).str.split().str[0].to_numpy(dtype=object)
+    region[group_sum(care_addr_valid) == 0] = '정보 없음'
+
+    result = pd.DataFrame({
+        'shelter_name': shelter_names,
+        'care_addr_animal': _first_valid(codes, care_addr, care_addr_valid, n_groups),
+        'region': region,
+        'count': group_sum(df['desertion_no'].notna()),
+        'long_term': group_sum(df['notice_date'] < cutoff),
+        'adopted': group_sum(df['process_state'] == ADOPTED_STATE),
+        'species': _group_mode(codes, species, species_valid, n_groups),
+        'kind_name': _group_mode(codes, kind_name, kind_name_valid, n_groups),
+    })
+    if 'image_url' in df.columns:
+        image_url, image_url_valid = column('image_url')
+        result['image_url'] = _first_valid(codes, image_url, image_url_valid, n_groups)
+    return result
+
+
+def _mode_query(column: str) -> str:
+    """보호소별 `column`의 최빈값(동률이면 이름순 첫 값)을 구하는 SELECT 문."""
+    return (
+        f"SELECT shelter_name, `{column}` AS value FROM ("
+        f"SELECT shelter_name, `{column}`, ROW_NUMBER() OVER "
+        f"(PARTITION BY shelter_name ORDER BY COUNT(*) DESC, `{column}`) AS rn "
+        f"FROM animals WHERE shelter_name IS NOT NULL AND `{column}` IS NOT NULL "
+        f"GROUP BY shelter_name, `{column}`) ranked WHERE rn = 1"
+    )
+
+
+def refresh_shelter_aggregates(conn):
+    """
+    운영 `animals` 테이블 전체로 `shelters`의 집계 컬럼(`AGGREGATE_COLUMNS`)을 SQL로 다시 계산합니다.
+    동물이 없는 보호소는 건수 0, 나머지 집계는 NULL입니다. (`db_loader.load_tables`의 `after_merge`)
+    """
+    updated = conn.execute(text(f"""
+        UPDATE shelters s
+        LEFT JOIN (
+            SELECT shelter_name,
+                   COUNT(*) AS cnt,
+                   SUM(notice_date <= CURDATE() - INTERVAL {LONG_TERM_DAYS} DAY) AS long_term,
+                   SUM(process_state = :adopted_state) AS adopted,
+                   SUBSTRING_INDEX(MIN(care_addr), ' ', 1) AS region,
+                   MAX(image_url) AS image_url
+            FROM animals
+            WHERE shelter_name IS NOT NULL
+            GROUP BY shelter_name
+        ) a ON a.shelter_name = s.shelter_name
+        LEFT JOIN ({_mode_query('species')}) sp ON sp.shelter_name = s.shelter_name
+        LEFT JOIN ({_mode_query('kind_name')}) kn ON kn.shelter_name = s.shelter_name
+        SET s.`count` = COALESCE(a.cnt, 0),
+            s.long_term = COALESCE(a.long_term, 0),
+            s.adopted = COALESCE(a.adopted, 0),
+            s.region = IF(a.shelter_name IS NULL, NULL, COALESCE(a.region, '정보 없음')),
+            s.species = sp.value,
+            s.kind_name = kn.value,
+            s.image_url = a.image_url
+    """), {'adopted_state': ADOPTED_STATE}).rowcount
+    print(f"[적재] 보호소 집계 재계산: {updated}곳 변경")
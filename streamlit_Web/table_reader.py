@@ -0,0 +1,206 @@
+# ==============================================================================
+# table_reader.py - 테이블 전체 읽기 (한 번에 읽기 vs 나눠 읽기)
+# ==============================================================================
+# `load_data`는 `pd.read_sql("SELECT * FROM <table>")`로 테이블 전체를 한 번에 읽었습니다.
+# MySQL 드라이버가 먼저 모든 행을 파이썬 튜플로 만들어 들고 있고(mysqlconnector는
+# SQLAlchemy에서 항상 buffered 커서), pandas가 이를 다시 컬럼으로 복사하므로
+# 읽는 동안 메모리가 결과 데이터프레임의 몇 배로 치솟습니다.
+#
+# [나눠 읽기 - `read_table_chunked`]
+# 1. 버퍼링하지 않는 DBAPI 커서(mysqlconnector `buffered=False`)로 서버에서 행을 흘려받고,
+#    `fetchmany(chunk_rows)`로 `chunk_rows`행씩 꺼냅니다.
+# 2. 조각마다 컬럼별 Arrow 배열로 바로 바꿉니다. 타입은 `schema.TABLE_SCHEMAS`를 따르고
+#    (문자열 → Arrow 문자열, DATE → date32, 정수/실수), 스키마에 없는 컬럼은 Arrow가 정합니다.
+#    튜플은 조각 하나 분량만 메모리에 있습니다.
+# 3. 조각들을 복사 없이 하나의 Arrow 테이블로 묶고(`pa.concat_tables`), 한 번만 pandas로 바꿉니다.
+#    문자열 컬럼은 Arrow 버퍼를 그대로 쓰는 `schema.STRING_DTYPE`이 됩니다.
+#
+# 어느 방식이든 결과에 `schema.apply_frame_dtypes`를 적용하면 같은 데이터프레임이 됩니다.
+# 읽을 때마다 행 수, 걸린 시간, 초당 행 수를 출력합니다.
+# 읽는 동안의 최대 메모리(RSS) 증가량은 프로세스 전체의 최대 메모리 기록을 초기화해야 잴 수 있으므로,
+# 여러 스레드가 함께 쓰는 앱 프로세스에서는 재지 않고 `benchmarks/bench_table_reader.py`에서만 비교합니다.
+#
+# [설정]
+# `config.ini`의 [TABLE_READER] 섹션(선택)
+#   mode = chunked     ; chunked(나눠 읽기, pyarrow 필요) 또는 whole(기존처럼 한 번에 읽기)
+#   chunk_rows = 20000
+# ==============================================================================
+
+import configparser
+import os
+import time
+
+import pandas as pd
+from sqlalchemy import Date, Double, Enum, Integer, String, Text, text
+
+from schema import STRING_DTYPE, TABLE_SCHEMAS
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# --- 경로 설정 ---
+current_script_path = os.path.abspath(__file__)
+streamlit_web_dir = os.path.dirname(current_script_path)
+project_root = os.path.dirname(streamlit_web_dir)
+CONFIG_PATH = os.path.join(project_root, 'config.ini')
+
+READ_MODES = ('chunked', 'whole')
+
+
+def get_table_reader_config() -> dict:
+    """`config.ini`의 [TABLE_READER] 섹션을 읽어 기본값과 합쳐 반환합니다."""
+    reader_config = {'mode': 'chunked', 'chunk_rows': 20000}
+    config = configparser.ConfigParser()
+    if os.path.exists(CONFIG_PATH):
+        config.read(CONFIG_PATH, encoding='utf-8')
+    if 'TABLE_READER' in config:
+        section = config['TABLE_READER']
+        reader_config['mode'] = section.get('mode', reader_config['mode'])
+        reader_config['chunk_rows'] = max(section.getint('chunk_rows', reader_config['chunk_rows']), 1)
+    if reader_config['mode'] not in READ_MODES:
+        print(f"경고: 알 수 없는 읽기 방식({reader_config['mode']})입니다. whole 방식을 사용합니다.")
+        reader_config['mode'] = 'whole'
+    if reader_config['mode'] == 'chunked' and pa is None:
+        print("경고: pyarrow가 설치되어 있지 않아 whole 방식을 사용합니다.")
+        reader_config['mode'] = 'whole'
+    return reader_config
+
+
+def _proc_status_mb(field: str) -> float | None:
+    try:
+        with open('/proc/self/status', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def rss_mb() -> float:
+    """프로세스의 현재 메모리(RSS, MB). Linux가 아니면 최대 메모리로 대신합니다."""
+    current = _proc_status_mb('VmRSS')
+    return current if current is not None else peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """프로세스의 최대 메모리(RSS, MB). 측정할 수 없으면 0."""
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    if resource is None:
+        return 0.0
+    # Linux는 KB 단위입니다. (macOS는 바이트)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def reset_peak_rss():
+    """
+    최대 메모리 기록을 현재 값으로 되돌립니다. (Linux만, 실패하면 무시)
+    프로세스 전체의 기록을 바꾸므로 벤치마크처럼 혼자 도는 프로세스에서만 호출합니다.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _arrow_type(column_type):
+    if isinstance(column_type, (String, Text, Enum)):
+        return pa.string()
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Double):
+        return pa.float64()
+    return None
+
+
+def _string_types(arrow_type):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return STRING_DTYPE
+    return None
+
+
+def _to_arrow(values, arrow_type):
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        # 드라이버가 문자열로 돌려준 날짜 등은 Arrow가 추론한 뒤 변환합니다.
+        return pa.array(values).cast(arrow_type)
+
+
+def _open_stream_cursor(conn):
+    dbapi_conn = conn.connection.dbapi_connection
+    try:
+        # mysqlconnector: 결과를 한 번에 받아 두지 않고 fetch할 때마다 서버에서 읽습니다.
+        return dbapi_conn.cursor(buffered=False)
+    except TypeError:
+        # `buffered` 인자가 없는 드라이버(sqlite3 등)는 기본 커서가 이미 나눠 읽습니다.
+        return dbapi_conn.cursor()
+
+
+def read_table_whole(conn, table_name: str) -> pd.DataFrame:
+    """테이블 전체를 `pd.read_sql`로 한 번에 읽습니다. (기존 방식)"""
+    return pd.read_sql(text(f"SELECT * FROM {table_name}"), conn)
+
+
+def read_table_chunked(conn, table_name: str, chunk_rows: int = 20000) -> pd.DataFrame:
+    """테이블 전체를 `chunk_rows`행씩 흘려받아 Arrow 컬럼으로 바꾼 뒤 하나의 데이터프레임으로 반환합니다."""
+    schema = TABLE_SCHEMAS.get(table_name, {})
+    cursor = _open_stream_cursor(conn)
+    try:
+        cursor.execute(f"SELECT * FROM {table_name}")
+        names = [column[0] for column in cursor.description]
+        types = [_arrow_type(schema[name]) if name in schema else None for name in names]
+        chunks = []
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            columns = zip(*rows)
+            del rows
+            chunks.append(pa.Table.from_arrays([_to_arrow(values, arrow_type)
+                                                for values, arrow_type in zip(columns, types)], names=names))
+    except Exception:
+        # 다 읽지 못한 결과가 남은 연결은 풀에 돌려주지 않고 버립니다.
+        conn.invalidate()
+        raise
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+    if not chunks:
+        return pd.DataFrame(columns=names)
+    # 조각마다 추론한 타입(예: 모두 NULL인 조각의 null 타입)은 더 넓은 타입으로 맞춥니다.
+    arrow_table = pa.concat_tables(chunks, promote_options='default')
+    chunks.clear()
+    return arrow_table.to_pandas(types_mapper=_string_types, date_as_object=False,
+                                 coerce_temporal_nanoseconds=True, self_destruct=True)
+
+
+def read_table(conn, table_name: str, mode: str | None = None, chunk_rows: int | None = None) -> pd.DataFrame:
+    """[TABLE_READER] 설정(또는 인자)의 방식으로 테이블 전체를 읽고 속도를 출력합니다."""
+    reader_config = get_table_reader_config()
+    mode = mode or reader_config['mode']
+    chunk_rows = chunk_rows or reader_config['chunk_rows']
+    started = time.perf_counter()
+    if mode == 'chunked':
+        data = read_table_chunked(conn, table_name, chunk_rows)
+    else:
+        data = read_table_whole(conn, table_name)
+    elapsed = time.perf_counter() - started
+    print(f"[테이블 읽기] {table_name} ({mode}): {len(data):,}행, {elapsed:.2f}초 "
+          f"({len(data) / max(elapsed, 1e-9):,.0f}행/초)")
+    return data
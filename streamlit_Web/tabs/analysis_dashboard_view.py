@@ -7,6 +7,8 @@ from datetime import datetime
 import numpy as np
 
 # --- 데이터 전처리 ---
+# 같은 필터 결과는 다시 계산하지 않습니다. (기본 필터 결과는 cache_warmer.py가 미리 계산)
+@st.cache_data(max_entries=16, show_spinner=False)
 def preprocess_for_dashboard(final_animals: pd.DataFrame) -> pd.DataFrame:
     df = final_animals.copy()
     df['notice_date'] = pd.to_datetime(df['notice_date'], errors='coerce')
@@ -33,7 +35,7 @@ def preprocess_for_dashboard(final_animals: pd.DataFrame) -> pd.DataFrame:
 # --- 차트 생성 함수들 ---
 def plot_species_distribution(df: pd.DataFrame):
     st.markdown("#### 1. 축종별 보호 동물 비율")
-    species_chart_data = df.groupby("upkind_name").size().reset_index(name='count')
+    species_chart_data = df.groupby("upkind_name", observed=True).size().reset_index(name='count')
     fig = px.pie(species_chart_data, names="upkind_name", values="count", hole=0.4,
                  color="upkind_name", color_discrete_map={'개': '#FFA07A', '고양이': '#87CEFA', '기타': '#90EE90'})
     fig.update_traces(textinfo='percent+label', pull=[0.05, 0.05, 0.05])
@@ -64,7 +66,7 @@ def plot_kind_distribution(df: pd.DataFrame):
     if 'kind_name' in df.columns and not df['kind_name'].empty:
         top_10_kinds = df['kind_name'].value_counts().nlargest(10).index
         df_top_10 = df[df['kind_name'].isin(top_10_kinds)]
-        kind_stats = df_top_10.groupby('kind_name').agg(total_count=('desertion_no', 'size'), adopted_count=('is_adopted', 'sum')).reset_index()
+        kind_stats = df_top_10.groupby('kind_name', observed=True).agg(total_count=('desertion_no', 'size'), adopted_count=('is_adopted', 'sum')).reset_index()
         kind_stats['adoption_rate'] = (kind_stats['adopted_count'] / kind_stats['total_count'] * 100).round(1)
         kind_stats = kind_stats.sort_values('total_count', ascending=False)
 
@@ -100,7 +102,7 @@ def plot_regional_heatmap(df: pd.DataFrame, filtered_shelters: pd.DataFrame):
             df_top_regions = merged_data[merged_data['region'].isin(top_regions)].copy()
             df_top_regions['month'] = df_top_regions['notice_date'].dt.month
             available_months = sorted(df_top_regions['month'].unique())
-            region_month_counts = df_top_regions.groupby(['region', 'month']).size().unstack(fill_value=0).reindex(columns=available_months, fill_value=0)
+            region_month_counts = df_top_regions.groupby(['region', 'month'], observed=True).size().unstack(fill_value=0).reindex(columns=available_months, fill_value=0)
             if not region_month_counts.empty:
                 fig = px.imshow(region_month_counts, labels=dict(x="월", y="지역명", color="발생 건수"), x=[f'{i}월' for i in available_months], y=region_month_counts.index, text_auto=True, aspect="auto", color_continuous_scale='YlGnBu')
                 fig.update_layout(title_text='월별 유기동물 발생 건수 히트맵', title_x=0.5, margin=dict(t=80, b=10), xaxis=dict(side='top', title=None))
@@ -1,16 +1,14 @@
 
 import streamlit as st
 import pandas as pd
-from data_manager import load_data
+from data_manager import load_shelter_animals
 from ui_components import render_animal_card, render_download_button
 
-@st.cache_data
 def get_animal_details(shelter_name: str) -> pd.DataFrame:
-    """특정 보호소의 동물 데이터를 필터링하여 반환합니다."""
-    animals_df = load_data("animals")
-    if animals_df.empty or shelter_name is None:
+    """특정 보호소의 동물 데이터를 DB에서 보호소 이름 인덱스로 조회하여 반환합니다."""
+    if shelter_name is None:
         return pd.DataFrame()
-    return animals_df[animals_df['shelter_name'] == shelter_name]
+    return load_shelter_animals(shelter_name)
 
 def show(filtered_shelters: pd.DataFrame):
     st.subheader("📋 보호소 상세 현황")
@@ -1,20 +1,14 @@
 
 import streamlit as st
 import pandas as pd
-from data_manager import load_data
+from data_manager import load_animals_by_ids
 from ui_components import render_animal_card
 
-@st.cache_data
 def get_favorite_animals(favorite_ids: list) -> pd.DataFrame:
-    """찜 목록에 있는 동물들의 상세 정보를 데이터베이스에서 조회합니다."""
+    """찜 목록에 있는 동물들의 상세 정보를 데이터베이스에서 유기번호(기본 키)로 조회합니다."""
     if not favorite_ids:
         return pd.DataFrame()
-    
-    all_animals = load_data("animals")
-    if all_animals.empty:
-        return pd.DataFrame()
-        
-    return all_animals[all_animals["desertion_no"].isin(favorite_ids)]
+    return load_animals_by_ids(sorted(favorite_ids))
 
 def show():
     """'찜한 동물' 탭의 전체 UI를 그리고 로직을 처리하는 메인 함수입니다."""
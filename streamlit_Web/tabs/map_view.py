@@ -4,26 +4,37 @@ import folium
 from streamlit_folium import st_folium
 import pandas as pd
 from folium.plugins import MarkerCluster
+from data_manager import get_data_status
 
-def create_map(filtered_shelters: pd.DataFrame, filtered_animals: pd.DataFrame) -> folium.Map:
-    """Folium 지도를 생성하고 마커를 추가합니다."""
+DEFAULT_IMAGE_URL = "https://via.placeholder.com/150?text=사진+없음"
+
+def map_cache_key(start_date, end_date, sido_code, sigungu_code, species) -> tuple:
+    """지도 마커 캐시 키: 화면에 내준 데이터 버전과 필터 조건. (데이터프레임을 해시하지 않도록)"""
+    return (get_data_status()['version'], start_date, end_date, sido_code, sigungu_code, tuple(sorted(species or [])))
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def map_markers(cache_key: tuple, _filtered_shelters: pd.DataFrame, _filtered_animals: pd.DataFrame) -> dict:
+    """
+    지도 중심과 마커(좌표, 보호소명, 팝업 HTML) 목록을 만듭니다.
+    데이터프레임 대신 `cache_key`(`map_cache_key`)로 캐시하며, 지도 객체는 화면마다 새로 만듭니다. (`create_map`)
+    기본 필터 결과는 cache_warmer.py가 미리 계산합니다.
+    """
+    filtered_shelters, filtered_animals = _filtered_shelters, _filtered_animals
     if filtered_shelters.empty:
-        return folium.Map(location=[36.5, 127.5], zoom_start=7)
+        return {'center': [36.5, 127.5], 'markers': []}
 
     shelter_image_map = {}
     if not filtered_animals.empty and 'image_url' in filtered_animals.columns:
-        shelter_image_map = filtered_animals.groupby('shelter_name')['image_url'].first().to_dict()
+        shelter_image_map = filtered_animals.groupby('shelter_name', observed=True)['image_url'].first().to_dict()
 
     valid_lat = filtered_shelters['lat'].dropna()
     valid_lon = filtered_shelters['lon'].dropna()
     map_center = [valid_lat.mean(), valid_lon.mean()] if not valid_lat.empty else [37.5665, 126.9780]
 
-    map_obj = folium.Map(location=map_center, zoom_start=7)
-    marker_cluster = MarkerCluster().add_to(map_obj)
-
+    markers = []
     for _, row in filtered_shelters.iterrows():
         if pd.notna(row['lat']) and pd.notna(row['lon']):
-            image_url = shelter_image_map.get(row['shelter_name'], "https://via.placeholder.com/150?text=사진+없음")
+            image_url = shelter_image_map.get(row['shelter_name'], DEFAULT_IMAGE_URL)
             popup_html = f"""
                 <b>{row['shelter_name']}</b><br>
                 <img src='{image_url}' width='150'><br>
@@ -31,13 +42,23 @@ def create_map(filtered_shelters: pd.DataFrame, filtered_animals: pd.DataFrame)
                 주요 품종: {row.get('kind_name', '정보 없음')}<br>
                 보호 중: {int(row.get('count', 0))} 마리
             """
-            folium.Marker(
-                [row['lat'], row['lon']],
-                popup=popup_html,
-                tooltip=row['shelter_name'],
-                icon=folium.Icon(color="blue", icon="paw", prefix='fa')
-            ).add_to(marker_cluster)
-            
+            markers.append({'lat': row['lat'], 'lon': row['lon'], 'name': row['shelter_name'], 'popup': popup_html})
+    return {'center': map_center, 'markers': markers}
+
+def create_map(marker_data: dict) -> folium.Map:
+    """`map_markers` 결과로 Folium 지도를 새로 만듭니다. (세션마다 다른 객체이므로 서로 영향을 주지 않음)"""
+    map_obj = folium.Map(location=marker_data['center'], zoom_start=7)
+    if not marker_data['markers']:
+        return map_obj
+
+    marker_cluster = MarkerCluster().add_to(map_obj)
+    for marker in marker_data['markers']:
+        folium.Marker(
+            [marker['lat'], marker['lon']],
+            popup=marker['popup'],
+            tooltip=marker['name'],
+            icon=folium.Icon(color="blue", icon="paw", prefix='fa')
+        ).add_to(marker_cluster)
     return map_obj
 
 def render_shelter_table(filtered_shelters: pd.DataFrame):
@@ -70,15 +91,15 @@ def handle_map_click(map_event):
             st.session_state.next_tab = "📋 보호소 상세 현황"
             st.rerun()
 
-def show(filtered_shelters: pd.DataFrame, filtered_animals: pd.DataFrame):
-    """지도 및 분석 탭의 전체 UI를 표시합니다."""
+def show(filtered_shelters: pd.DataFrame, filtered_animals: pd.DataFrame, map_key: tuple):
+    """지도 및 분석 탭의 전체 UI를 표시합니다. 마커 목록은 `map_key`(`map_cache_key`)로 캐시합니다."""
     st.subheader("🗺️ 보호소 지도")
 
     if filtered_shelters.empty:
         st.warning("표시할 데이터가 없습니다. 필터 조건을 변경해보세요.")
         return
 
-    map_obj = create_map(filtered_shelters, filtered_animals)
+    map_obj = create_map(map_markers(map_key, filtered_shelters, filtered_animals))
     
     map_event = None
     try:
@@ -87,5 +108,9 @@ def show(filtered_shelters: pd.DataFrame, filtered_animals: pd.DataFrame):
         # This can happen on fast re-runs, safe to ignore.
         pass
 
+    unresolved_count = int((filtered_shelters['lat'].isna() | filtered_shelters['lon'].isna()).sum())
+    if unresolved_count:
+        st.caption(f"📍 위치 정보를 확인하지 못한 보호소 {unresolved_count}곳은 지도에 표시되지 않습니다. (아래 표에는 포함)")
+
     handle_map_click(map_event)
     render_shelter_table(filtered_shelters)
@@ -2,24 +2,28 @@
 
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine
-from utils import get_db_config
+from data_manager import get_data_version, get_db_engine
 import math
 import json
 import plotly.express as px
 
 # --- 데이터 로딩 ---
-@st.cache_data
-def load_scraped_data(table_name: str) -> pd.DataFrame:
+# 데이터 버전을 캐시 키에 포함하여, `update_web_data.py`로 새로 적재하면 재시작 없이 다시 읽습니다.
+# (두 테이블의 현재 버전 항목만 남도록 max_entries=2)
+@st.cache_data(max_entries=2)
+def _load_scraped_table(table_name: str, data_version: int) -> pd.DataFrame:
+    engine = get_db_engine()  # 공용 엔진 (호출마다 새 연결 풀을 만들지 않음)
+    if engine is None: return pd.DataFrame()
     try:
-        db_config = get_db_config()
-        engine = create_engine(f"mysql+mysqlconnector://{db_config['user']}:{db_config['password']}@"
-                               f"{db_config['host']}:{db_config['port']}/{db_config['database']}?charset=utf8mb4")
-        return pd.read_sql(f"SELECT * FROM {table_name}", engine)
+        with engine.connect() as conn:
+            return pd.read_sql(f"SELECT * FROM {table_name}", conn)
     except Exception as e:
         st.error(f"{table_name} 데이터 로딩 중 오류 발생: {e}")
         return pd.DataFrame()
 
+def load_scraped_data(table_name: str) -> pd.DataFrame:
+    return _load_scraped_table(table_name, get_data_version([table_name]))
+
 # --- 데이터 처리 ---
 def safe_json_loads(s):
     try:
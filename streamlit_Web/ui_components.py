@@ -93,6 +93,17 @@ def render_kpi_cards(shelter_count, animal_count, long_term_count, adopted_count
             """, unsafe_allow_html=True)
     st.write("""<div style="height: 1rem;"></div>""", unsafe_allow_html=True)
 
+def render_data_status(status):
+    """
+    데이터 기준 시각(ETL 적재 시각)을 작게 표시합니다. 새 데이터를 준비 중이면 함께 알려 줍니다.
+    """
+    if status.get('loaded_at') is None:
+        return
+    text = f"🕒 데이터 기준: {status['loaded_at']:%Y-%m-%d %H:%M}"
+    if status.get('refreshing'):
+        text += " · 새 데이터를 준비하고 있어요 (준비되면 다음 조회부터 반영됩니다)"
+    st.caption(text)
+
 def render_tabs(tabs):
     """
     애플리케이션의 메인 탭을 렌더링하고 현재 활성화된 탭을 반환합니다.
@@ -12,18 +12,33 @@
 #      (최근 6개월 치, 개/고양이)
 #    - `fetch_shelters`: 전국의 모든 동물보호소 정보를 조회합니다.
 #    - `get_coordinates_from_address`: 카카오 지도 API를 사용하여 주소를
-#      위도/경도 좌표로 변환(지오코딩)합니다.
+#      위도/경도 좌표로 변환(지오코딩)합니다. 결과는 `geocoding.py`의 로컬
+#      캐시에 저장되어, 다음 실행부터는 새 주소만 조회합니다.
+#    - 모든 요청은 `api_client.ApiClient`의 연결 풀을 공유하며, 여러 페이지는
+#      동시 요청 수와 호스트별 속도 제한 안에서 병렬로 가져옵니다.
+#    - 유기동물 응답은 페이지마다 `api_parser.parse_page`로 열 지향 배치로
+#      파싱하고, 받는 즉시 `transform_animals`로 변환하여 원본을 쌓아두지 않습니다.
 # 3. **데이터 변환 (Transform):**
 #    - `preprocess_data`: API로부터 받은 원본(raw) 데이터를 분석하기 좋은 형태로
 #      가공합니다. (컬럼 이름 변경, 데이터 타입 변환, 파생 변수 생성 등)
 #    - 동물 데이터와 보호소 데이터를 결합하고, 필요한 정보들을 집계합니다.
+#    - 보호소 주소를 공식 시/도·시/군/구 목록의 정수 코드로 해석합니다. (`region_codes.py`)
 # 4. **데이터 적재 (Load):**
 #    - `update_database`: 가공된 데이터를 Pandas DataFrame 형태로 만든 후,
-#      SQLAlchemy를 통해 `shelters`와 `animals` 테이블에 한 번에 밀어 넣습니다.
-#      (`if_exists='replace'` 옵션으로 기존 테이블을 삭제하고 새로 만듭니다.)
+#      스테이징 테이블에 적재하고 `shelters`와 `animals` 테이블에 한 번에 반영합니다.
+#      (변경분만 upsert하거나 `RENAME TABLE`로 교체합니다. `db_loader.py` 참고)
 #
 # [실행 방법]
 # - 터미널에서 `python update_data.py` 명령으로 직접 실행합니다.
+#   (`--max-workers 1 --rate-limit 0`으로 실행하면 순차 수집과 소요 시간을 비교할 수 있습니다.)
+# - `python update_data.py --mode delta`로 실행하면 축종별 워터마크(`watermarks.py`)
+#   이후 구간만 조회하여, 받은 동물 행만 upsert(`db_loader`의 `upsert` 방식)하고
+#   보호소 집계는 DB에서 SQL로 다시 계산합니다. (야간 정기 실행 권장)
+# - `--http-mode record`로 실행하면 API 응답을 아카이브에 기록하고, 이후
+#   `--http-mode replay`로 네트워크 없이 같은 입력으로 다시 실행할 수 있습니다.
+#   (`response_archive.py` 참고. 재생 시에는 `--mode full`과 고정된 `--bgnde/--endde` 사용)
+# - 수집한 페이지는 체크포인트(`checkpoints.py`)에 저장됩니다. 일부 페이지/지역이 재시도 후에도
+#   실패하면 DB를 갱신하지 않으며, `--resume`으로 다시 실행하면 저장된 페이지는 건너뛰고 이어서 수집합니다.
 # - 주기적으로 자동 실행되도록 스케줄링(예: Cron, Windows Scheduler)하여
 #   데이터를 최신 상태로 유지할 수 있습니다.
 # ==============================================================================
@@ -31,15 +46,25 @@
 import pandas as pd
 import xml.etree.ElementTree as ET
 import mysql.connector
-from sqlalchemy import create_engine
 import configparser
 import os
+import argparse
+import time
 from datetime import datetime, timedelta
-import subprocess
-import tempfile
-from urllib.parse import quote
 import requests
 import json
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from api_client import ApiClient, ApiResultError, NO_DATA_RESULT_CODE, get_client, set_client, get_api_endpoints
+from api_parser import PageBatch, parse_page
+from checkpoints import CrawlCheckpoint, DEFAULT_CHECKPOINT_DIR
+from response_archive import ResponseArchive, ARCHIVE_MODES
+from geocoding import resolve_coordinates
+from shelter_aggregation import AGGREGATE_COLUMNS, aggregate_shelters, refresh_shelter_aggregates
+from region_codes import RegionTable
+from db_loader import load_tables, LOAD_STRATEGIES, UPSERT_STRATEGY
+from db_engine import get_engine, pool_stats
+from watermarks import load_watermarks, save_watermarks, compute_watermark, delta_window
 
 # --- 경로 설정 ---
 current_script_path = os.path.abspath(__file__)
@@ -48,14 +73,6 @@ project_root = os.path.dirname(streamlit_web_dir)
 CONFIG_PATH = os.path.join(project_root, 'config.ini')
 
 # --- 설정 정보 로드 함수 ---
-def get_db_config():
-    """`config.ini`에서 [DB] 섹션의 설정을 읽어옵니다."""
-    config = configparser.ConfigParser()
-    if not os.path.exists(CONFIG_PATH):
-        raise FileNotFoundError(f"설정 파일을 찾을 수 없습니다: {CONFIG_PATH}")
-    config.read(CONFIG_PATH)
-    return config['DB']
-
 def get_api_key():
     """`config.ini`에서 공공데이터포털 API 키를 읽어옵니다."""
     config = configparser.ConfigParser()
@@ -72,100 +89,142 @@ def get_kakao_rest_api_key():
     config.read(CONFIG_PATH)
     return config['API']['kakao_rest_api_key']
 
-def fetch_abandoned_animals(api_key, bgnde, endde, upkind=''):
-    """공공데이터포털에서 특정 기간과 축종의 유기동물 정보를 가져옵니다."""
-    api_key_encoded = quote(api_key)
-    endpoint = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2/abandonmentPublic_v2"
-
-    all_items = []
-    page_no = 1
-    num_of_rows = 1000 # API가 허용하는 최대 요청 개수
-
-    while True:
-        # API 요청 URL 구성
-        url = f"{endpoint}?serviceKey={api_key_encoded}&bgnde={bgnde}&endde={endde}&pageNo={page_no}&numOfRows={num_of_rows}&_type=xml"
-        if upkind:
-            url += f"&upkind={upkind}"
-
-        print(f"[DEBUG] API 요청 URL: {url}")
-
-        # PowerShell을 사용하여 데이터를 임시 파일로 다운로드
-        fp, temp_path = tempfile.mkstemp(suffix=".xml")
-        os.close(fp)
+# API 주소 (config.ini [API] base_url / kakao_base_url로 변경 가능)
+_ENDPOINTS = get_api_endpoints()
+ANIMAL_ENDPOINT = _ENDPOINTS['animal']
+SIDO_ENDPOINT = _ENDPOINTS['sido']
+SIGUNGU_ENDPOINT = _ENDPOINTS['sigungu']
+SHELTER_ENDPOINT = _ENDPOINTS['shelter']
+KAKAO_ADDRESS_ENDPOINT = _ENDPOINTS['kakao_address']
 
-        try:
-            command = f"powershell -Command \"(New-Object System.Net.WebClient).DownloadFile('{url}', '{temp_path}')\""
-            subprocess.run(command, check=True, shell=True, capture_output=True, text=True)
+def _items_to_dicts(root):
+    """XML 응답의 `<item>` 요소들을 {태그: 값} 딕셔너리 리스트로 변환합니다."""
+    return [{child.tag: child.text for child in item} for item in root.findall('.//item')]
 
-            with open(temp_path, 'rb') as f:
-                xml_data = f.read()
+def _is_transient_result(error):
+    return isinstance(error, ApiResultError) and error.transient
 
-            if not xml_data:
-                print(f"경고: 페이지 {page_no}에서 빈 응답을 받았습니다.")
-                break
-
-            root = ET.fromstring(xml_data.decode('utf-8'))
-
-            # API 응답 코드 확인
-            result_code = root.findtext('.//resultCode', 'N/A')
-            if result_code != '00':
-                print(f"API 오류 발생 (코드: {result_code}, 메시지: {root.findtext('.//resultMsg', 'N/A')})")
-                break
+def _iter_pages(client, endpoint, params, num_of_rows, label, checkpoint=None):
+    """
+    페이지 단위 API의 첫 페이지로 전체 건수(totalCount)를 확인한 뒤,
+    나머지 페이지를 클라이언트의 동시 요청 수 한도 안에서 병렬로 가져와
+    페이지 순서대로 `PageBatch`(열 지향 배치)를 하나씩 돌려줍니다.
+    요청/파싱 오류와 정상(00)이 아닌 결과 코드는 (재시도 후) 예외로 전달됩니다.
+    `checkpoint`(`checkpoints.CheckpointStream`)를 넘기면 받은 페이지를 저장하고,
+    이미 저장된 페이지는 API를 다시 호출하지 않고 읽어 옵니다.
+    """
+    def request_page(page_no):
+        print(f"[DEBUG] API 요청: {endpoint} ({label}, pageNo={page_no})")
+        content = client.get(endpoint, params={**params, 'pageNo': page_no, 'numOfRows': num_of_rows}).content
+        if not content:
+            return None
+        batch = parse_page(content)
+        if batch.result_code not in ('00', NO_DATA_RESULT_CODE):
+            raise ApiResultError(batch.result_code, batch.result_msg, f"{label} 페이지 {page_no}")
+        return batch
+
+    def fetch_page(page_no):
+        key = f"page_{page_no:05d}"
+        if checkpoint is not None:
+            saved = checkpoint.load(key)
+            if saved is not None:
+                return PageBatch(**saved)
+        # 연결/HTTP 오류는 client.get이 재시도하므로, 여기서는 일시적인 결과 코드만 재시도합니다.
+        batch = client.retry(request_page, page_no, retryable=_is_transient_result)
+        if checkpoint is not None and batch is not None and batch.num_items:
+            checkpoint.save(key, asdict(batch))
+        return batch
+
+    first_batch = fetch_page(1)
+    if first_batch is None:
+        print(f"경고: {label} 페이지 1에서 빈 응답을 받았습니다.")
+        return
 
-            items_in_page = root.findall('.//item')
-            if not items_in_page:
-                print(f"정보: 페이지 {page_no}에 더 이상 데이터가 없습니다.")
-                break
+    if not first_batch.num_items:
+        print(f"정보: {label} 페이지 1에 데이터가 없습니다.")
+        return
 
-            # 수집된 데이터를 리스트에 추가
-            for item in items_in_page:
-                item_dict = {child.tag: child.text for child in item}
-                all_items.append(item_dict)
+    # 이어서 수집할 때는 저장된 첫 페이지의 전체 건수를 그대로 써서 페이지 구간을 유지합니다.
+    total_count = first_batch.total_count
+    total_pages = -(-total_count // num_of_rows)
+    collected = first_batch.num_items
+    print(f"{label} 페이지 1에서 {collected}건 데이터 수집. (전체 {total_count}건, {total_pages}페이지)")
+    yield first_batch
+
+    for page_no, batch in enumerate(client.imap(fetch_page, range(2, total_pages + 1)), start=2):
+        if batch is None:
+            print(f"경고: {label} 페이지 {page_no}에서 빈 응답을 받았습니다.")
+            return
+        if not batch.num_items:
+            print(f"정보: {label} 페이지 {page_no}에 더 이상 데이터가 없습니다.")
+            return
+        collected += batch.num_items
+        print(f"{label} 페이지 {page_no}에서 {batch.num_items}건 데이터 수집. (현재까지 총 {collected} / 전체 {total_count}건)")
+        yield batch
+
+def _fetch_all_pages(client, endpoint, params, num_of_rows, label, checkpoint=None):
+    """`_iter_pages`의 모든 항목을 딕셔너리 리스트로 모아 반환합니다. 요청/파싱 오류가 나면 None을 반환합니다."""
+    try:
+        all_items = []
+        for batch in _iter_pages(client, endpoint, params, num_of_rows, label, checkpoint):
+            all_items.extend(batch.to_records())
+        return all_items
 
-            total_count = int(root.findtext('.//totalCount', '0'))
-            print(f"페이지 {page_no}에서 {len(items_in_page)}건 데이터 수집. (현재까지 총 {len(all_items)} / 전체 {total_count}건)")
+    except requests.exceptions.RequestException as e:
+        print(f"API 요청 중 오류 발생: {e}")
+        return None # 오류 발생 시 None 반환
+    except (ET.ParseError, ValueError) as e:
+        print(f"응답 파싱 오류: {e}")
+        return None
+    except Exception as e:
+        print(f"알 수 없는 오류 발생: {e}")
+        return None
 
-            # 모든 데이터를 수집했으면 반복 종료
-            if len(all_items) >= total_count:
-                break
+def _animal_request(api_key, bgnde, endde, upkind, response_format):
+    params = {'serviceKey': api_key, 'bgnde': bgnde, 'endde': endde, '_type': response_format}
+    if upkind:
+        params['upkind'] = upkind
+    return params, f"유기동물(upkind={upkind or '전체'})"
 
-            page_no += 1
+def stream_abandoned_animals(api_key, bgnde, endde, upkind='', client=None, response_format='json', checkpoint=None):
+    """
+    유기동물 정보를 페이지 단위 열 지향 배치(`PageBatch`)로 하나씩 돌려줍니다.
+    전체 목록을 메모리에 쌓지 않고 배치마다 바로 변환 단계로 넘길 때 사용합니다.
+    요청/파싱 오류는 예외로 전달됩니다. `checkpoint`를 넘기면 페이지별로 저장/재사용합니다.
+    """
+    client = client or get_client()
+    num_of_rows = 1000 # API가 허용하는 최대 요청 개수
+    params, label = _animal_request(api_key, bgnde, endde, upkind, response_format)
+    return _iter_pages(client, ANIMAL_ENDPOINT, params, num_of_rows, label, checkpoint)
 
-        except subprocess.CalledProcessError as e:
-            print(f"PowerShell을 통한 데이터 다운로드 중 오류 발생: {e.stderr}")
-            return None # 오류 발생 시 None 반환
-        except ET.ParseError as e:
-            print(f"XML 파싱 오류: {e}")
+def fetch_abandoned_animals(api_key, bgnde, endde, upkind='', client=None, response_format='xml'):
+    """공공데이터포털에서 특정 기간과 축종의 유기동물 정보를 가져옵니다."""
+    client = client or get_client()
+    num_of_rows = 1000 # API가 허용하는 최대 요청 개수
+    params, label = _animal_request(api_key, bgnde, endde, upkind, response_format)
+    return _fetch_all_pages(client, ANIMAL_ENDPOINT, params, num_of_rows, label)
+
+def _get_xml_checked(client, endpoint, params, label):
+    """XML 응답을 받아 결과 코드를 확인합니다. 일시적인 오류 코드는 재시도하고, 데이터 없음(03)이면 None을 반환합니다."""
+    def request():
+        root = client.get_xml(endpoint, params=params)
+        if root is None:
             return None
-        except Exception as e:
-            print(f"알 수 없는 오류 발생: {e}")
+        result_code = root.findtext('.//resultCode', 'N/A')
+        if result_code == NO_DATA_RESULT_CODE:
             return None
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-
-    return all_items
+        if result_code != '00':
+            raise ApiResultError(result_code, root.findtext('.//resultMsg', 'N/A'), label)
+        return root
+    return client.retry(request, retryable=_is_transient_result)
 
-def _fetch_sido_list(api_key):
+def _fetch_sido_list(api_key, client=None):
     """보호소 목록 조회를 위해 내부적으로 사용되는 시/도 목록 조회 함수입니다."""
-    api_key_encoded = quote(api_key)
-    endpoint = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2/sido_v2"
-    url = f"{endpoint}?serviceKey={api_key_encoded}&numOfRows=100&_type=xml"
-    
-    fp, temp_path = tempfile.mkstemp(suffix=".xml")
-    os.close(fp)
-    
+    client = client or get_client()
     try:
-        command = f"powershell -Command \"(New-Object System.Net.WebClient).DownloadFile('{url}', '{temp_path}')\""
-        subprocess.run(command, check=True, shell=True, capture_output=True, text=True)
-        
-        with open(temp_path, 'rb') as f:
-            xml_data = f.read()
-        
-        if not xml_data:
+        root = _get_xml_checked(client, SIDO_ENDPOINT, {'serviceKey': api_key, 'numOfRows': 100, '_type': 'xml'}, '시/도 목록')
+        if root is None:
             return []
-            
-        root = ET.fromstring(xml_data.decode('utf-8'))
         sido_list = []
         for item in root.findall('.//item'):
             sido_list.append({"code": item.findtext("orgCd"), "name": item.findtext("orgdownNm")})
@@ -173,196 +232,210 @@ def _fetch_sido_list(api_key):
     except Exception as e:
         print(f"시/도 목록 조회 중 오류 발생: {e}")
         return []
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
-def _fetch_sigungu_list(api_key, sido_code):
-    """특정 시/도에 속한 시/군/구 목록을 조회하는 내부 함수입니다."""
-    api_key_encoded = quote(api_key)
-    endpoint = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2/sigungu_v2"
-    url = f"{endpoint}?serviceKey={api_key_encoded}&upr_cd={sido_code}&_type=xml"
-    
-    fp, temp_path = tempfile.mkstemp(suffix=".xml")
-    os.close(fp)
-    
+
+def _fetch_sigungu_list(api_key, sido_code, client=None):
+    """특정 시/도에 속한 시/군/구 목록을 조회하는 내부 함수입니다. 오류가 나면 None을 반환합니다."""
+    client = client or get_client()
     try:
-        command = f"powershell -Command \"(New-Object System.Net.WebClient).DownloadFile('{url}', '{temp_path}')\""
-        subprocess.run(command, check=True, shell=True, capture_output=True, text=True)
-        
-        with open(temp_path, 'rb') as f:
-            xml_data = f.read()
-        
-        if not xml_data:
+        root = _get_xml_checked(client, SIGUNGU_ENDPOINT, {'serviceKey': api_key, 'upr_cd': sido_code, '_type': 'xml'}, f"시/군/구 목록({sido_code})")
+        if root is None:
             return []
-            
-        root = ET.fromstring(xml_data.decode('utf-8'))
         sigungu_list = []
         for item in root.findall('.//item'):
             sigungu_list.append({"upr_code": item.findtext("uprCd"), "code": item.findtext("orgCd"), "name": item.findtext("orgdownNm")})
         return sigungu_list
     except Exception as e:
         print(f"시/군/구 목록 조회 중 오류 발생: {e}")
-        return []
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
-def fetch_shelters(api_key):
-    """전국의 모든 동물보호소 정보를 시/도 및 시/군/구별로 순회하며 가져옵니다."""
-    api_key_encoded = quote(api_key)
-    endpoint = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2/shelter_v2"
-    all_shelters = []
-    sido_list = _fetch_sido_list(api_key)
-
-    if not sido_list:
-        print("경고: 시도 목록을 가져오지 못하여 보호소 데이터를 수집할 수 없습니다.")
-        return []
-
-    for sido_info in sido_list:
-        sido_code = sido_info['code']
-        sido_name = sido_info['name']
-        print(f"--- {sido_name} ({sido_code}) 지역의 시/군/구 목록 수집 ---")
-        sigungu_list = _fetch_sigungu_list(api_key, sido_code)
-
-        # 시/군/구 목록이 없는 경우 (e.g., 세종시), 시/도 코드를 시/군/구 코드로 사용하여 직접 조회 시도
-        if not sigungu_list:
-            print(f"정보: {sido_name}에 하위 시/군/구 목록이 없습니다. 시/도 코드로 직접 보호소 조회를 시도합니다.")
-            sigungu_list = [{'upr_code': sido_code, 'code': sido_code, 'name': sido_name}]
+        return None
 
-        for sigungu_info in sigungu_list:
-            sigungu_code = sigungu_info['code']
-            sigungu_name = sigungu_info['name']
-            print(f"--- {sido_name} > {sigungu_name} 보호소 데이터 수집 시작 ---")
-
-            url = f"{endpoint}?serviceKey={api_key_encoded}&upr_cd={sido_code}&org_cd={sigungu_code}&_type=xml"
-            print(f"[DEBUG] 보호소 API 요청 URL: {url}")
-
-            fp, temp_path = tempfile.mkstemp(suffix=".xml")
-            os.close(fp)
-
-            try:
-                command = f"powershell -Command \"(New-Object System.Net.WebClient).DownloadFile('{url}', '{temp_path}')\""
-                subprocess.run(command, check=True, shell=True, capture_output=True, text=True)
+def _fetch_shelters_in_sigungu(api_key, sido_code, sigungu_info, client):
+    """시/군/구 하나의 보호소 목록을 조회합니다. (재시도 후에도) 오류가 나면 None을 반환합니다."""
+    sigungu_name = sigungu_info['name']
+    try:
+        root = _get_xml_checked(client, SHELTER_ENDPOINT,
+                                {'serviceKey': api_key, 'upr_cd': sido_code, 'org_cd': sigungu_info['code'], '_type': 'xml'},
+                                f"{sigungu_name} 보호소")
+        if root is None:
+            return []
+        return _items_to_dicts(root)
 
-                with open(temp_path, 'rb') as f:
-                    xml_data = f.read()
+    except Exception as e:
+        print(f"{sigungu_name} 보호소 조회 중 오류 발생: {e}")
+        return None
+
+def _checkpointed(checkpoint, key, fetch):
+    """체크포인트에 `key`가 있으면 저장된 값을, 없으면 `fetch()` 결과를 저장한 뒤 반환합니다. (None은 저장하지 않음)"""
+    if checkpoint is not None:
+        saved = checkpoint.load(key)
+        if saved is not None:
+            return saved
+    value = fetch()
+    if checkpoint is not None and value is not None:
+        checkpoint.save(key, value)
+    return value
+
+def _crawl_shelters_by_sigungu(api_key, sido_list, client, max_workers, checkpoint=None, failures=None):
+    """
+    시/도별 시/군/구 목록 조회와 시/군/구별 보호소 조회를 하나의 작업 큐에서 처리합니다.
+    시/군/구 목록이 도착하는 즉시 해당 지역의 보호소 조회 작업을 큐에 넣으므로,
+    목록 조회와 보호소 조회가 동시에 진행됩니다.
+    결과는 순차 순회와 같은 순서(시/도 → 시/군/구)로 합쳐 반환합니다.
+    조회에 실패한 시/도·시/군/구는 건너뛰고 `failures` 리스트에 기록합니다.
+    """
+    failures = failures if failures is not None else []
 
-                if not xml_data:
-                    continue
+    def sigungu_list_task(sido_code):
+        return _checkpointed(checkpoint, f"sigungu_{sido_code}", lambda: _fetch_sigungu_list(api_key, sido_code, client))
 
-                root = ET.fromstring(xml_data.decode('utf-8'))
-                result_code = root.findtext('.//resultCode', 'N/A')
+    def shelters_task(sido_code, sigungu_info):
+        return _checkpointed(checkpoint, f"shelters_{sido_code}_{sigungu_info['code']}",
+                             lambda: _fetch_shelters_in_sigungu(api_key, sido_code, sigungu_info, client))
 
-                if result_code != '00':
-                    if result_code != '03':
-                         print(f"API 오류 (코드: {result_code}, 메시지: {root.findtext('.//resultMsg', 'N/A')})")
-                    continue
+    results = {}            # (시/도 순번, 시/군/구 순번) -> 보호소 목록
+    remaining = {}          # 시/도 순번 -> 남은 시/군/구 작업 수
+    sido_done = 0
 
-                items_in_page = root.findall('.//item')
-                for item in items_in_page:
-                    item_dict = {child.tag: child.text for child in item}
-                    all_shelters.append(item_dict)
-
-            except Exception as e:
-                print(f"{sigungu_name} 보호소 조회 중 오류 발생: {e}")
-            finally:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-    
-    return all_shelters
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(sigungu_list_task, sido_info['code']): ('sigungu_list', sido_idx, None, None)
+            for sido_idx, sido_info in enumerate(sido_list)
+        }
 
-    api_key_encoded = quote(api_key)
-    endpoint = "https://apis.data.go.kr/1543061/abandonmentPublicService_v2/shelter_v2"
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                task_type, sido_idx, sigungu_idx, sigungu_name = futures.pop(future)
+                sido_code = sido_list[sido_idx]['code']
+                sido_name = sido_list[sido_idx]['name']
+
+                if task_type == 'sigungu_list':
+                    sigungu_list = future.result()
+                    if sigungu_list is None:
+                        failures.append(f"{sido_name} 시/군/구 목록")
+                        sido_done += 1
+                        print(f"[진행] {sido_name}: 시/군/구 목록 조회 실패로 건너뜁니다. (시/도 {sido_done}/{len(sido_list)})")
+                        continue
+                    # 시/군/구 목록이 없는 경우 (e.g., 세종시), 시/도 코드를 시/군/구 코드로 사용하여 직접 조회 시도
+                    if not sigungu_list:
+                        print(f"정보: {sido_name}에 하위 시/군/구 목록이 없습니다. 시/도 코드로 직접 보호소 조회를 시도합니다.")
+                        sigungu_list = [{'upr_code': sido_code, 'code': sido_code, 'name': sido_name}]
+
+                    remaining[sido_idx] = len(sigungu_list)
+                    for idx, sigungu_info in enumerate(sigungu_list):
+                        task = executor.submit(shelters_task, sido_code, sigungu_info)
+                        futures[task] = ('shelters', sido_idx, idx, sigungu_info['name'])
+                else:
+                    items = future.result()
+                    if items is None:
+                        failures.append(f"{sido_name} {sigungu_name} 보호소")
+                        items = []
+                    results[(sido_idx, sigungu_idx)] = items
+                    remaining[sido_idx] -= 1
+                    if remaining[sido_idx] == 0:
+                        sido_done += 1
+                        shelter_count = sum(len(items) for (s_idx, _), items in results.items() if s_idx == sido_idx)
+                        sigungu_count = sum(1 for (s_idx, _) in results if s_idx == sido_idx)
+                        print(f"[진행] {sido_name}: 시/군/구 {sigungu_count}곳, 보호소 {shelter_count}건 수집 완료 "
+                              f"(시/도 {sido_done}/{len(sido_list)})")
+
+    return [item for key in sorted(results) for item in results[key]]
+
+def _crawl_shelters_by_sido_pages(api_key, sido_list, client, max_workers, checkpoint=None, failures=None):
+    """시/도 단위로 보호소 API를 페이지 조회합니다. (시/군/구 목록 조회 없이 시/도별로 페이지를 넘깁니다.)"""
+    failures = failures if failures is not None else []
     all_shelters = []
-    sido_list = _fetch_sido_list(api_key)
-
-    if not sido_list:
-        print("경고: 시도 목록을 가져오지 못하여 보호소 데이터를 수집할 수 없습니다.")
-        return []
-
-    for sido_info in sido_list:
+    for sido_idx, sido_info in enumerate(sido_list, start=1):
         sido_code = sido_info['code']
         sido_name = sido_info['name']
         print(f"--- {sido_name} ({sido_code}) 보호소 데이터 수집 시작 ---")
 
-        page_no = 1
-        collected_in_sido = 0
-        total_in_sido = -1 # -1로 초기화하여 아직 totalCount를 받지 않았음을 표시
-
-        while True:
-            url = f"{endpoint}?serviceKey={api_key_encoded}&upr_cd={sido_code}&pageNo={page_no}&numOfRows=1000&_type=xml"
-            print(f"[DEBUG] 보호소 API 요청 URL: {url}") # 디버깅을 위한 URL 출력
-
-            fp, temp_path = tempfile.mkstemp(suffix=".xml")
-            os.close(fp)
-
-            try:
-                command = f"powershell -Command \"(New-Object System.Net.WebClient).DownloadFile('{url}', '{temp_path}')\""
-                subprocess.run(command, check=True, shell=True, capture_output=True, text=True)
+        items = _fetch_all_pages(client, SHELTER_ENDPOINT, {'serviceKey': api_key, 'upr_cd': sido_code, '_type': 'xml'}, 1000,
+                                 label=sido_name, checkpoint=checkpoint.child(sido_code) if checkpoint is not None else None)
+        if items is None:
+            failures.append(f"{sido_name} 보호소")
+        elif items:
+            all_shelters.extend(items)
+        print(f"[진행] {sido_name}: 보호소 {len(items or [])}건 수집 완료 (시/도 {sido_idx}/{len(sido_list)})")
 
-                with open(temp_path, 'rb') as f:
-                    xml_data = f.read()
+    return all_shelters
 
-                if not xml_data:
-                    print(f"경고: {sido_name} 페이지 {page_no}에서 빈 응답을 받았습니다.")
-                    break
+# 보호소 수집 전략: 이름 -> 수집 함수
+SHELTER_CRAWL_STRATEGIES = {
+    'sigungu': _crawl_shelters_by_sigungu,
+    'sido_paged': _crawl_shelters_by_sido_pages,
+}
 
-                root = ET.fromstring(xml_data.decode('utf-8'))
-                result_code = root.findtext('.//resultCode', 'N/A')
+def fetch_shelters(api_key, client=None, strategy='sigungu', max_workers=None, checkpoint=None, failures=None):
+    """
+    전국의 모든 동물보호소 정보를 가져옵니다.
+    - `sigungu` (기본): 시/도 × 시/군/구 조회를 작업 큐로 병렬 처리합니다.
+    - `sido_paged`: 시/도 단위로 페이지를 넘기며 조회합니다.
+    `max_workers`를 지정하지 않으면 클라이언트의 동시 요청 수를 따릅니다.
+    `checkpoint`(`checkpoints.CheckpointStream`)를 넘기면 지역별 결과를 저장/재사용하고,
+    조회에 실패한 지역은 `failures` 리스트에 기록합니다.
+    """
+    client = client or get_client()
+    if strategy not in SHELTER_CRAWL_STRATEGIES:
+        raise ValueError(f"알 수 없는 보호소 수집 전략입니다: {strategy} (사용 가능: {', '.join(SHELTER_CRAWL_STRATEGIES)})")
 
-                if result_code != '00':
-                    print(f"API 오류 (코드: {result_code}, 메시지: {root.findtext('.//resultMsg', 'N/A')})")
-                    break
+    sido_list = _checkpointed(checkpoint, 'sido', lambda: _fetch_sido_list(api_key, client) or None)
 
-                items_in_page = root.findall('.//item')
-                if not items_in_page:
-                    print(f"정보: {sido_name} 페이지 {page_no}에 더 이상 데이터가 없습니다.")
-                    break
+    if not sido_list:
+        print("경고: 시도 목록을 가져오지 못하여 보호소 데이터를 수집할 수 없습니다.")
+        if failures is not None:
+            failures.append("시/도 목록")
+        return []
 
-                for item in items_in_page:
-                    item_dict = {child.tag: child.text for child in item}
-                    all_shelters.append(item_dict)
-                
-                collected_in_sido += len(items_in_page)
+    crawl = SHELTER_CRAWL_STRATEGIES[strategy]
+    return crawl(api_key, sido_list, client, max_workers or client.max_workers, checkpoint, failures)
 
-                if total_in_sido == -1: # 첫 요청 시에만 totalCount를 설정
-                    total_in_sido = int(root.findtext('.//totalCount', '0'))
 
-                print(f"{sido_name} 페이지 {page_no}에서 {len(items_in_page)}건 수집. (현재 시/도 누적 {collected_in_sido} / 전체 {total_in_sido}건)")
+def fetch_region_table(api_key, client=None, checkpoint=None, failures=None):
+    """
+    공식 시/도·시/군/구 목록으로 주소 해석용 `RegionTable`을 만듭니다. (`region_codes.py` 참고)
+    보호소 수집과 같은 체크포인트 키를 사용하므로, 보호소 수집에서 이미 받은 목록은 다시 요청하지 않습니다.
+    목록을 가져오지 못하면 `failures`에 기록하고 None을 반환합니다.
+    """
+    client = client or get_client()
+    failures = failures if failures is not None else []
+    sido_list = _checkpointed(checkpoint, 'sido', lambda: _fetch_sido_list(api_key, client) or None)
+    if not sido_list:
+        failures.append("지역 코드(시/도 목록)")
+        return None
 
-                if collected_in_sido >= total_in_sido:
-                    break
-                
-                page_no += 1
+    def sigungu_list_task(sido_code):
+        return _checkpointed(checkpoint, f"sigungu_{sido_code}", lambda: _fetch_sigungu_list(api_key, sido_code, client))
 
-            except Exception as e:
-                print(f"{sido_name} 보호소 조회 중 오류 발생: {e}")
-                break
-            finally:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-    
-    return all_shelters
+    with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+        sigungu_lists = dict(zip((sido['code'] for sido in sido_list),
+                                 executor.map(sigungu_list_task, [sido['code'] for sido in sido_list])))
+    missing = [sido['name'] for sido in sido_list if sigungu_lists[sido['code']] is None]
+    if missing:
+        failures.append(f"지역 코드(시/군/구 목록: {', '.join(missing)})")
+        return None
+    return RegionTable(sido_list, sigungu_lists)
 
 
-def get_coordinates_from_address(address):
+def get_coordinates_from_address(address, client=None, raise_errors=False):
     """
     카카오 로컬 API를 사용하여 주어진 주소 문자열을 위도, 경도 좌표로 변환합니다.
     지도 시각화를 위해 필수적인 기능입니다.
+    `raise_errors=True`이면 API 호출 오류를 (None, None) 대신 예외로 전달하여,
+    '좌표 없음'과 일시적인 오류를 구분할 수 있게 합니다.
     """
+    client = client or get_client()
     kakao_api_key = get_kakao_rest_api_key()
     if not kakao_api_key:
+        if raise_errors:
+            raise ValueError("카카오 REST API 키가 설정되지 않았습니다.")
         print("카카오 REST API 키가 설정되지 않았습니다.")
         return None, None
 
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
     headers = {"Authorization": f"KakaoAK {kakao_api_key}"}
     params = {"query": address}
 
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status() # HTTP 오류 발생 시 예외 처리
+        response = client.get(KAKAO_ADDRESS_ENDPOINT, headers=headers, params=params) # HTTP 오류 발생 시 예외 처리
         data = response.json()
         
         if data and data['documents']:
@@ -372,18 +445,35 @@ def get_coordinates_from_address(address):
             print(f"주소에 대한 좌표를 찾을 수 없습니다: {address}")
             return None, None
     except requests.exceptions.RequestException as e:
+        if raise_errors:
+            raise
         print(f"카카오 지오코딩 API 호출 중 오류 발생: {e}")
         return None, None
     except json.JSONDecodeError:
+        if raise_errors:
+            raise
         print(f"카카오 지오코딩 API 응답 파싱 오류: {response.text}")
         return None, None
 
-def preprocess_data(animal_df_raw, shelter_api_df_raw):
-    print(f"[DEBUG] preprocess_data 시작. animal_df_raw 타입: {type(animal_df_raw)}, shelter_api_df_raw 타입: {type(shelter_api_df_raw)}")
-
-    # -------------------------------------
-    # 1. 동물 데이터 처리
-    # -------------------------------------
+def _lookup_coordinates(address, client):
+    """`geocoding.geocode_addresses`용 조회 함수입니다. 좌표가 없으면 None을 반환합니다."""
+    lat, lon = get_coordinates_from_address(address, client, raise_errors=True)
+    return None if lat is None or lon is None else (lat, lon)
+
+# DB `animals` 테이블에 저장하는 최종 컬럼 목록
+FINAL_ANIMAL_COLS = [
+    'desertion_no', 'shelter_name', 'animal_name', 'species', 'kind_name', 'age',
+    'upkind_name', 'image_url', 'personality', 'special_mark', 'notice_date', 'notice_no',
+    'sex', 'neuter', 'color', 'weight', 'care_tel', 'care_addr', 
+    'happen_place', 
+    'process_state' 
+]
+
+def transform_animals(animal_df_raw):
+    """
+    유기동물 원본 데이터(API 필드명)를 DB 컬럼 형태로 변환합니다.
+    행 단위 변환만 하므로 페이지 배치마다 따로 호출할 수 있으며, 최종 컬럼만 남겨 반환합니다.
+    """
     if isinstance(animal_df_raw, pd.DataFrame):
         animals_df = animal_df_raw.copy()
     else:
@@ -391,7 +481,6 @@ def preprocess_data(animal_df_raw, shelter_api_df_raw):
 
     if animals_df.empty:
         animals_df = pd.DataFrame()
-        shelter_df_from_animals = pd.DataFrame()
     else:
         # 컬럼 이름 변경
         rename_map = {
@@ -439,20 +528,32 @@ def preprocess_data(animal_df_raw, shelter_api_df_raw):
 
         animals_df['personality'] = '정보 없음'
 
-        # 보호소 집계
-        agg_dict = {
-            'care_addr_animal': ('care_addr', 'first'),
-            'region': ('care_addr', lambda x: x.iloc[0].split()[0] if x.notna().any() else '정보 없음'),
-            'count': ('desertion_no', 'count'),
-            'long_term': ('notice_date', lambda x: (x < pd.Timestamp.now() - pd.Timedelta(days=30)).sum()),
-            'adopted': ('process_state', lambda x: (x == '종료(입양)').sum()),
-            'species': ('species', lambda x: x.value_counts().index[0] if not x.empty else '정보 없음'),
-            'kind_name': ('kind_name', lambda x: x.value_counts().index[0] if not x.empty else '정보 없음')
-        }
-        if 'image_url' in animals_df.columns:
-            agg_dict['image_url'] = ('image_url', 'first')
+        # 변환 이후 단계에서 쓰지 않는 원본 필드는 바로 버려 메모리를 줄입니다.
+        animals_df = animals_df.drop(columns=[col for col in animals_df.columns if col not in FINAL_ANIMAL_COLS])
+
+    return animals_df
+
+def preprocess_data(animal_df_raw, shelter_api_df_raw, animals_transformed=False, regions=None):
+    """
+    API 원본 데이터를 DB 적재용 보호소/동물 데이터프레임으로 가공합니다.
+    `animals_transformed=True`이면 동물 데이터가 이미 `transform_animals`를 거친 것으로 봅니다.
+    `regions`(`region_codes.RegionTable`)를 넘기면 보호소 주소를 시/도·시/군/구 코드로 해석합니다.
+    """
+    print(f"[DEBUG] preprocess_data 시작. animal_df_raw 타입: {type(animal_df_raw)}, shelter_api_df_raw 타입: {type(shelter_api_df_raw)}")
+
+    # -------------------------------------
+    # 1. 동물 데이터 처리
+    # -------------------------------------
+    if animals_transformed:
+        animals_df = animal_df_raw
+    else:
+        animals_df = transform_animals(animal_df_raw)
 
-        shelter_df_from_animals = animals_df.groupby('shelter_name').agg(**agg_dict).reset_index()
+    if animals_df.empty:
+        shelter_df_from_animals = pd.DataFrame()
+    else:
+        # 보호소 집계 (벡터 연산, shelter_aggregation.py 참고)
+        shelter_df_from_animals = aggregate_shelters(animals_df)
 
         if 'image_url' not in shelter_df_from_animals.columns:
             shelter_df_from_animals['image_url'] = None
@@ -497,34 +598,20 @@ def preprocess_data(animal_df_raw, shelter_api_df_raw):
         care_addr_animal = merged_shelter_df['care_addr_animal'] if 'care_addr_animal' in merged_shelter_df.columns else pd.Series(index=merged_shelter_df.index)
         merged_shelter_df['care_addr'] = care_addr_api.fillna(care_addr_animal)
 
-        # 좌표
-        merged_shelter_df['lat'] = merged_shelter_df['lat_api'] if 'lat_api' in merged_shelter_df.columns else pd.NA
-        merged_shelter_df['lon'] = merged_shelter_df['lon_api'] if 'lon_api' in merged_shelter_df.columns else pd.NA
-
-        # 주소 좌표 캐싱
-        cache = {}
-        unique_addresses = merged_shelter_df.loc[
-            merged_shelter_df['care_addr'].notna() &
-            (merged_shelter_df['lat'].isna() | merged_shelter_df['lon'].isna()),
-            'care_addr'
-        ].unique()
-
-        for addr in unique_addresses:
-            if addr not in cache:
-                lat, lon = get_coordinates_from_address(addr)
-                cache[addr] = (lat, lon)
-
-        for index, row in merged_shelter_df.iterrows():
-            if pd.isna(row['lat']) or pd.isna(row['lon']):
-                addr = row['care_addr']
-                if addr in cache:
-                    merged_shelter_df.at[index, 'lat'], merged_shelter_df.at[index, 'lon'] = cache[addr]
-
-        merged_shelter_df['lat'] = merged_shelter_df['lat'].fillna(0)
-        merged_shelter_df['lon'] = merged_shelter_df['lon'].fillna(0)
+        # 좌표: API 좌표 → 지오코딩(영구 캐시 + 캐시 미스 병렬 조회) → 미해결(NULL) 순으로 결정
+        merged_shelter_df = resolve_coordinates(merged_shelter_df, _lookup_coordinates)
 
         merged_shelter_df.drop(columns=['care_addr_api', 'care_addr_animal', 'lat_api', 'lon_api'], inplace=True, errors='ignore')
 
+        # 지역 코드: 주소를 한 번만 해석하여 정수 컬럼으로 저장 (앱의 지역 필터는 이 코드를 비교)
+        # (목록을 받지 못했으면 컬럼만 NULL로 두어 테이블 구조와 인덱스는 유지)
+        if regions is not None:
+            merged_shelter_df = regions.assign_codes(merged_shelter_df)
+        else:
+            print("경고: 지역 코드 목록이 없어 sido_code/sigungu_code를 NULL로 적재합니다.")
+            merged_shelter_df['sido_code'] = pd.array([None] * len(merged_shelter_df), dtype='Int64')
+            merged_shelter_df['sigungu_code'] = pd.array([None] * len(merged_shelter_df), dtype='Int64')
+
         # 중복 확인용 출력
         before_count = len(merged_shelter_df)
         duplicate_count = merged_shelter_df.duplicated(subset=['shelter_name']).sum()
@@ -542,91 +629,202 @@ def preprocess_data(animal_df_raw, shelter_api_df_raw):
     if 'image_url' not in animals_df.columns:
         animals_df['image_url'] = None
 
-    final_animal_cols = [
-        'desertion_no', 'shelter_name', 'animal_name', 'species', 'kind_name', 'age',
-        'upkind_name', 'image_url', 'personality', 'special_mark', 'notice_date', 'notice_no',
-        'sex', 'neuter', 'color', 'weight', 'care_tel', 'care_addr', 
-        'happen_place', 
-        'process_state' 
-    ]
-    existing_final_cols = [col for col in final_animal_cols if col in animals_df.columns]
+    existing_final_cols = [col for col in FINAL_ANIMAL_COLS if col in animals_df.columns]
 
     return merged_shelter_df, animals_df[existing_final_cols]
 
 # --- 데이터 적재 (Load) 함수 ---
-def update_database(shelter_df, animal_df):
+def create_db_engine():
+    """공용 DB 엔진(연결 풀)을 반환합니다. (`db_engine.py` 참고)"""
+    return get_engine()
+
+def update_database(shelter_df, animal_df, strategy='merge'):
     """
     가공된 데이터프레임을 데이터베이스의 테이블에 저장합니다.
-    `if_exists='replace'` 옵션은 기존 테이블이 있다면 삭제하고 새로 만들기 때문에,
-    항상 최신 데이터만 유지됩니다.
+    스테이징 테이블에 먼저 적재한 뒤 `merge`(변경분 upsert) 또는 `swap`(RENAME TABLE)
+    방식으로 한 번에 반영하므로, 앱은 적재 도중의 테이블을 보지 않습니다. (`db_loader.py` 참고)
+    `upsert`(델타 동기화)는 받은 행만 반영하고, 같은 트랜잭션에서 보호소 집계를 DB의
+    `animals` 전체로 다시 계산합니다. (새로 받은 동물이 없으면 보호소 정보만 반영)
+    성공 여부를 반환합니다.
     """
-    if shelter_df.empty or animal_df.empty:
+    upsert = strategy == UPSERT_STRATEGY
+    if shelter_df.empty or (animal_df.empty and not upsert):
         print("업데이트할 데이터가 없습니다.")
-        return
-        
+        return False
+
+    if upsert:
+        # 집계 컬럼은 적재 트랜잭션에서 다시 계산하므로, 받은 동물이 없어 비어 있어도 컬럼만 맞춥니다.
+        shelter_df = shelter_df.reindex(columns=shelter_df.columns.union(AGGREGATE_COLUMNS, sort=False))
+    frames = {'shelters': shelter_df}
+    if not animal_df.empty:
+        frames['animals'] = animal_df
     try:
-        db_config = get_db_config()
-        engine = create_engine(f"mysql+mysqlconnector://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}")
-        
-        with engine.connect() as conn:
-            # to_sql 메소드는 DataFrame을 SQL 테이블로 매우 편리하게 변환해줍니다.
-            shelter_df.to_sql('shelters', conn, if_exists='replace', index=False)
-            animal_df.to_sql('animals', conn, if_exists='replace', index=False)
+        engine = create_db_engine()
+        load_tables(engine, frames, strategy=strategy,
+                    after_merge=refresh_shelter_aggregates if upsert else None)
         print("데이터베이스 업데이트 성공!")
+        return True
     except Exception as e:
         print(f"데이터베이스 오류: {e}")
+        return False
+
+def _peak_memory_mb():
+    """프로세스 최대 메모리 사용량(RSS)을 문자열로 반환합니다. (`resource` 모듈이 없는 Windows에서는 '측정 불가')"""
+    try:
+        import resource
+    except ImportError:
+        return '측정 불가'
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return f"{peak_kb / 1024:.0f}MB"
 
 # --- 메인 실행 블록 ---
 # 이 스크립트가 직접 실행될 때만 아래 코드가 동작합니다.
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="공공데이터포털 유기동물/보호소 데이터를 수집하여 DB를 갱신합니다.")
+    parser.add_argument('--max-workers', type=int, default=None,
+                        help="동시에 보낼 API 요청 수 (config.ini [HTTP] max_workers, 1이면 순차 수집)")
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help="호스트별 초당 최대 요청 수 (config.ini [HTTP] rate_limit, 0이면 제한 없음)")
+    parser.add_argument('--shelter-strategy', choices=sorted(SHELTER_CRAWL_STRATEGIES), default='sigungu',
+                        help="보호소 수집 전략 (sigungu: 시/군구 작업 큐 병렬 조회, sido_paged: 시/도별 페이지 조회)")
+    parser.add_argument('--mode', choices=['full', 'delta'], default='full',
+                        help="full: 지정 구간 전체를 다시 수집, delta: 축종별 워터마크 이후만 수집하여 받은 행만 upsert")
+    parser.add_argument('--bgnde', default='20250501', help="전체 수집 시작일 (YYYYMMDD, delta 모드에서 워터마크가 없을 때도 사용)")
+    parser.add_argument('--endde', default='20250805', help="전체 수집 종료일 (YYYYMMDD, full 모드에서만 사용)")
+    parser.add_argument('--overlap-days', type=int, default=14,
+                        help="delta 모드에서 워터마크 이전으로 겹쳐 조회할 일수 (상태 변경 반영용)")
+    parser.add_argument('--load-strategy', choices=LOAD_STRATEGIES, default='merge',
+                        help="full 모드의 DB 반영 방식 (merge: 변경분만 upsert, swap: RENAME TABLE로 테이블 교체, "
+                             "delta 모드는 항상 받은 행만 upsert)")
+    parser.add_argument('--response-format', choices=['json', 'xml'], default='json',
+                        help="유기동물 API 응답 형식 (json: _type=json, xml: iterparse 스트리밍 파싱)")
+    parser.add_argument('--http-mode', choices=ARCHIVE_MODES, default=None,
+                        help="API 응답 기록/재생 (config.ini [HTTP_ARCHIVE] mode, live: 실제 호출만, "
+                             "record: 호출 결과 기록, replay: 기록된 응답만 사용)")
+    parser.add_argument('--archive-dir', default=None,
+                        help="응답 아카이브 폴더 (config.ini [HTTP_ARCHIVE] path)")
+    parser.add_argument('--resume', action='store_true',
+                        help="이전 실행의 체크포인트에서 이어서 수집 (실행 조건이 같을 때만)")
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR, help="수집 체크포인트 폴더")
+    parser.add_argument('--allow-partial', action='store_true',
+                        help="일부 페이지/지역 수집에 실패해도 수집된 데이터만으로 DB를 갱신")
+    args = parser.parse_args()
+
     print("실제 데이터로 DB 업데이트를 시작합니다...")
     try:
         API_KEY = get_api_key()
-        if not API_KEY or 'YOUR_API_KEY' in API_KEY:
+        archive = ResponseArchive.from_config(mode=args.http_mode, path=args.archive_dir)
+        if archive is not None:
+            print(f"API 응답 {archive.mode} 모드: {archive.path}")
+        # 재생 모드에서는 인증키가 요청 키에 포함되지 않으므로 실제 키가 없어도 됩니다.
+        if (not API_KEY or 'YOUR_API_KEY' in API_KEY) and not (archive is not None and archive.replaying):
             print("!!! 경고: config.ini 파일에 실제 API 키를 입력하세요.")
         else:
-            bgnde_str = '20250501'
-            endde_str = '20250805'
+            client = ApiClient.from_config(max_workers=args.max_workers, rate_limit=args.rate_limit, archive=archive)
+            set_client(client)
+            crawl_started = time.perf_counter()
+
+            # 수집 체크포인트: 실행 조건이 같으면 --resume으로 저장된 페이지부터 이어서 수집합니다.
+            run_params = {'mode': args.mode, 'bgnde': args.bgnde, 'endde': args.endde, 'overlap_days': args.overlap_days,
+                          'response_format': args.response_format, 'shelter_strategy': args.shelter_strategy}
+            checkpoint = CrawlCheckpoint(args.checkpoint_dir, run_params, resume=args.resume)
+            crawl_failures = []
+
+            engine = create_db_engine()
+            watermarks = load_watermarks(engine) if args.mode == 'delta' else {}
+            new_watermarks = {}
+            # delta 모드의 조회 구간은 실행일에 따라 달라지므로, 이어서 수집할 때는 처음 정한 구간을 그대로 씁니다.
+            windows = checkpoint.get_state('windows', {})
 
             # 동물 데이터 수집 (개, 고양이, 기타)
+            # 페이지 배치를 받는 즉시 변환하여, 원본 항목 전체를 메모리에 쌓지 않습니다.
             animal_types = {'개': '417000', '고양이': '422400', '기타': '429900'}
-            all_animals_data = []
+            animal_frames = []
 
             for animal_name, animal_code in animal_types.items():
-                print(f"--- {animal_name} 데이터 수집 시작 (기간: {bgnde_str} ~ {endde_str}) ---")
-                items = fetch_abandoned_animals(API_KEY, bgnde_str, endde_str, upkind=animal_code)
-                if isinstance(items, list):
-                    all_animals_data.extend(items)
-                    print(f"성공: {animal_name} 데이터 {len(items)}건 수집")
+                if animal_code in windows:
+                    bgnde_str, endde_str = windows[animal_code]
+                elif args.mode == 'delta':
+                    bgnde_str, endde_str = delta_window(watermarks.get(animal_code), args.overlap_days, args.bgnde)
+                    windows[animal_code] = [bgnde_str, endde_str]
+                    checkpoint.set_state('windows', windows)
                 else:
-                    print(f"경고: {animal_name} 데이터를 가져오지 못했습니다.")
+                    bgnde_str, endde_str = args.bgnde, args.endde
+                print(f"--- {animal_name} 데이터 수집 시작 (기간: {bgnde_str} ~ {endde_str}) ---")
+                upkind_frames = []
+                mark = watermarks.get(animal_code)
+                try:
+                    for batch in stream_abandoned_animals(API_KEY, bgnde_str, endde_str, upkind=animal_code,
+                                                          client=client, response_format=args.response_format,
+                                                          checkpoint=checkpoint.stream(f"animals_{animal_code}")):
+                        mark = compute_watermark(batch.columns.get('noticeSdt', []), mark)
+                        upkind_frames.append(transform_animals(batch.to_frame()))
+                except (requests.exceptions.RequestException, ET.ParseError, ValueError) as e:
+                    # 받은 페이지는 체크포인트에 남아 있으므로 --resume으로 실패한 페이지부터 이어서 수집할 수 있습니다.
+                    print(f"경고: {animal_name} 데이터를 가져오지 못했습니다. ({e})")
+                    crawl_failures.append(f"{animal_name} 유기동물")
+                    continue
+                animal_frames.extend(upkind_frames)
+                new_watermarks[animal_code] = mark
+                print(f"성공: {animal_name} 데이터 {sum(len(frame) for frame in upkind_frames)}건 수집")
 
-            # 🟢 중복 제거 (desertionNo 기준)
+            # 🟢 중복 제거 (desertion_no 기준)
             print("중복 제거 중...")
-            unique_animals = {
-                item.get('desertionNo'): item for item in all_animals_data
-            }
-            all_animals_data = list(unique_animals.values())
-            print(f"중복 제거 후 총 {len(all_animals_data)}건 남음")
+            animals_df = pd.concat(animal_frames, ignore_index=True) if animal_frames else pd.DataFrame()
+            del animal_frames
+            if not animals_df.empty:
+                animals_df = animals_df.drop_duplicates(subset=['desertion_no'], keep='last')
+            print(f"중복 제거 후 총 {len(animals_df)}건 남음")
 
             # 보호소 데이터 수집
-            print("--- 보호소 데이터 수집 시작 ---")
-            all_shelters_data = fetch_shelters(API_KEY)
+            print(f"--- 보호소 데이터 수집 시작 (전략: {args.shelter_strategy}) ---")
+            shelter_started = time.perf_counter()
+            all_shelters_data = fetch_shelters(API_KEY, client, strategy=args.shelter_strategy,
+                                               checkpoint=checkpoint.stream('shelters'), failures=crawl_failures)
+            print(f"[TIMING] 보호소 수집 소요 시간: {time.perf_counter() - shelter_started:.1f}초")
             if not isinstance(all_shelters_data, list):
                 print("경고: 보호소 데이터를 가져오지 못했습니다.")
                 all_shelters_data = []
+            regions = fetch_region_table(API_KEY, client, checkpoint=checkpoint.stream('shelters'), failures=crawl_failures)
+
+            crawl_elapsed = time.perf_counter() - crawl_started
+            http_stats = client.stats()
+            print(f"[TIMING] 전체 수집 소요 시간: {crawl_elapsed:.1f}초 "
+                  f"(요청 {http_stats['requests']}건, 수신 {http_stats['bytes'] / 1024 / 1024:.1f}MB, "
+                  f"동시 요청 {client.max_workers}개, 속도 제한 {client.rate_limiter.rate_per_sec or '없음'}회/초, "
+                  f"재시도 {http_stats['retries']}건, 최대 메모리 {_peak_memory_mb()})")
+            if archive is not None:
+                print(f"[TIMING] 응답 아카이브({archive.mode}): 기록 {http_stats['recorded']}건, "
+                      f"재생 {http_stats['replayed']}건, 없음 {http_stats['missed']}건")
 
             # 전처리 및 DB 업데이트
-            if all_animals_data or all_shelters_data:
-                raw_animal_df = pd.DataFrame(all_animals_data)
+            if crawl_failures:
+                print(f"경고: 수집에 실패한 항목이 {len(crawl_failures)}건 있습니다: {', '.join(crawl_failures)}")
+            if crawl_failures and not args.allow_partial:
+                # 일부만 수집된 데이터로 적재하면 누락된 행이 DB에서 삭제되므로 적재하지 않습니다.
+                print("DB 업데이트를 건너뜁니다. `--resume` 옵션으로 다시 실행하면 체크포인트에서 이어서 수집합니다. "
+                      "(수집된 데이터만으로 갱신하려면 `--allow-partial`)")
+            elif not animals_df.empty or all_shelters_data:
                 raw_shelter_api_df = pd.DataFrame(all_shelters_data)
 
-                if not raw_animal_df.empty or not raw_shelter_api_df.empty:
+                if not animals_df.empty or not raw_shelter_api_df.empty:
+                    load_strategy = args.load_strategy
+                    if args.mode == 'delta':
+                        # 기존 행은 읽지 않고 받은 행만 upsert합니다. (보호소 집계는 적재 트랜잭션에서 SQL로 재계산)
+                        load_strategy = UPSERT_STRATEGY
+                        print(f"델타 동기화: 신규/변경 {len(animals_df)}건만 적재합니다.")
+
                     print("데이터 전처리를 시작합니다...")
-                    shelters, animals = preprocess_data(raw_animal_df, raw_shelter_api_df)
+                    shelters, animals = preprocess_data(animals_df, raw_shelter_api_df,
+                                                        animals_transformed=True, regions=regions)
 
                     print("데이터베이스 업데이트를 시작합니다...")
-                    update_database(shelters, animals)
+                    if update_database(shelters, animals, strategy=load_strategy):
+                        # 적재가 성공한 경우에만 워터마크를 전진시킵니다.
+                        save_watermarks(engine, new_watermarks)
+                        print(f"워터마크 갱신: {new_watermarks}")
+                        checkpoint.clear()
+                    print(f"[DB 연결 풀] {pool_stats()}")
                 else:
                     print("API에서 수집된 동물 및 보호소 데이터가 없어 업데이트를 건너뜁니다.")
 
@@ -1,8 +1,12 @@
 import pandas as pd
 import json
 import os
-from sqlalchemy import create_engine
-from utils import get_db_config  # 기존 utils.py에 있는 DB 설정 함수 재사용
+from db_engine import get_engine  # 앱/ETL 공용 DB 엔진 (연결 풀)
+from db_loader import create_indexes
+from data_version import ensure_version_table, publish_version
+from schema import column_types
+
+WEB_TABLE_KEY = '사이트링크'
 
 # --- JSON -> DataFrame 로딩 함수 ---
 def load_json_to_df():
@@ -37,19 +41,25 @@ def update_web_database(cat_df, dog_df):
         return
 
     try:
-        db_config = get_db_config()
-        engine = create_engine(
-            f"mysql+mysqlconnector://{db_config['user']}:{db_config['password']}@"
-            f"{db_config['host']}:{db_config['port']}/{db_config['database']}?charset=utf8mb4"
-        )
-
-        with engine.connect() as conn:
-            if not cat_df.empty:
-                cat_df.to_sql('web_cats', conn, if_exists='replace', index=False)
-                print(f"web_cats 테이블에 {len(cat_df)}개 데이터 저장 완료!")
-            if not dog_df.empty:
-                dog_df.to_sql('web_dogs', conn, if_exists='replace', index=False)
-                print(f"web_dogs 테이블에 {len(dog_df)}개 데이터 저장 완료!")
+        engine = get_engine()
+
+        with engine.begin() as conn:
+            ensure_version_table(conn)
+        with engine.begin() as conn:
+            loaded_tables = []
+            for table_name, df in [('web_cats', cat_df), ('web_dogs', dog_df)]:
+                if df.empty:
+                    continue
+                # 기본 키(사이트 링크)가 중복되거나 비어 있는 행은 제외하고 저장합니다.
+                df = df[df[WEB_TABLE_KEY].notna()].drop_duplicates(subset=[WEB_TABLE_KEY], keep='last')
+                df.to_sql(table_name, conn, if_exists='replace', index=False,
+                          dtype=column_types(table_name, df.columns))
+                # replace는 테이블을 새로 만들므로 기본 키를 매번 다시 만듭니다.
+                create_indexes(conn, table_name)
+                loaded_tables.append(table_name)
+                print(f"{table_name} 테이블에 {len(df)}개 데이터 저장 완료!")
+            # 앱이 재시작 없이 새 데이터를 읽도록 데이터 버전을 올립니다. (data_version.py 참고)
+            publish_version(conn, loaded_tables)
 
         print("웹 데이터베이스 업데이트 성공!")
     except Exception as e:
@@ -0,0 +1,78 @@
+# ==============================================================================
+# watermarks.py - 증분(델타) 동기화용 축종별 워터마크 관리
+# ==============================================================================
+# `update_data.py --mode delta` 실행 시, 축종(upkind)별로 지금까지 수집한
+# 가장 최근 공고 시작일(noticeSdt)을 DB의 `etl_watermarks` 테이블에 기록해 두고,
+# 다음 실행에서는 그 이후 구간만 다시 조회합니다.
+# (유기동물 API는 공고일 구간으로만 조회할 수 있어 수정 시각(updTm)으로는 구간을
+# 좁힐 수 없으므로 기록하지 않습니다. 이전 버전이 만든 `upd_tm` 컬럼은 쓰지 않습니다.)
+#
+# [동기화 구간]
+# - 시작일: 워터마크(noticeSdt) - overlap_days
+#   (이미 받은 공고의 상태(processState) 변경을 반영하기 위한 겹침 구간)
+# - 종료일: 실행일(오늘)
+# - 워터마크가 없는 축종은 전체 수집 구간의 시작일부터 조회합니다.
+#
+# 워터마크는 DB 적재가 성공한 뒤에만 갱신해야 합니다.
+# ==============================================================================
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+WATERMARK_TABLE = 'etl_watermarks'
+
+
+def ensure_watermark_table(conn):
+    """워터마크 테이블이 없으면 생성합니다."""
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (
+            upkind VARCHAR(10) NOT NULL PRIMARY KEY,
+            notice_sdt CHAR(8) NULL,
+            synced_at DATETIME NOT NULL
+        )
+    """))
+
+
+def load_watermarks(engine) -> dict:
+    """축종 코드별 워터마크({'notice_sdt'})를 읽어옵니다."""
+    with engine.begin() as conn:
+        ensure_watermark_table(conn)
+        rows = conn.execute(text(f"SELECT upkind, notice_sdt FROM {WATERMARK_TABLE}")).fetchall()
+    return {row.upkind: {'notice_sdt': row.notice_sdt} for row in rows}
+
+
+def save_watermarks(engine, watermarks: dict):
+    """축종 코드별 워터마크를 저장(upsert)합니다."""
+    if not watermarks:
+        return
+    now = datetime.now()
+    with engine.begin() as conn:
+        ensure_watermark_table(conn)
+        for upkind, mark in watermarks.items():
+            conn.execute(
+                text(f"""
+                    INSERT INTO {WATERMARK_TABLE} (upkind, notice_sdt, synced_at)
+                    VALUES (:upkind, :notice_sdt, :synced_at)
+                    ON DUPLICATE KEY UPDATE
+                        notice_sdt = VALUES(notice_sdt),
+                        synced_at = VALUES(synced_at)
+                """),
+                {'upkind': upkind, 'notice_sdt': mark.get('notice_sdt'), 'synced_at': now},
+            )
+
+
+def compute_watermark(notice_dates, previous: dict | None = None) -> dict:
+    """수집한 noticeSdt 값들 중 가장 최근 값을 구해 이전 워터마크와 합칩니다."""
+    previous = previous or {}
+    candidates_sdt = [v for v in notice_dates if v] + ([previous['notice_sdt']] if previous.get('notice_sdt') else [])
+    return {'notice_sdt': max(candidates_sdt) if candidates_sdt else None}
+
+
+def delta_window(watermark: dict | None, overlap_days: int, default_bgnde: str, today: date | None = None) -> tuple[str, str]:
+    """워터마크를 기준으로 조회할 (bgnde, endde) 구간을 YYYYMMDD 문자열로 반환합니다."""
+    endde = (today or date.today()).strftime('%Y%m%d')
+    if not watermark or not watermark.get('notice_sdt'):
+        return default_bgnde, endde
+    start = datetime.strptime(watermark['notice_sdt'], '%Y%m%d') - timedelta(days=overlap_days)
+    return start.strftime('%Y%m%d'), endde